@@ -1,9 +1,11 @@
-from config import DatabaseConfig, AppConfig
+from config import DatabaseConfig, AppConfig, LikeBufferConfig, IdentityCacheConfig
 from flask import Flask, redirect, url_for
-from datamanager import init_database
-from routes import user_bp, movie_bp, review_bp, api_bp, trivia_bp, homepage_bp
+from datamanager import init_database, register_identity_cache
+from services.like_buffer import like_buffer
+from routes import user_bp, movie_bp, review_bp, api_bp, trivia_bp, homepage_bp, search_bp
 from utils.template_helpers import register_template_helpers
 from utils.app_helpers import register_error_handlers, print_startup_info
+from utils.cli_commands import register_cli_commands
 import os
 
 
@@ -19,12 +21,17 @@ def create_app():
     _configure_app_settings(app)
 
     init_database(app)
+    register_identity_cache(app)
     register_template_helpers(app)
 
     _register_blueprints(app)
     register_error_handlers(app)
+    register_cli_commands(app)
     _register_routes(app)
 
+    if LikeBufferConfig.ENABLED:
+        like_buffer.start(app)
+
     return app
 
 
@@ -43,6 +50,12 @@ def _configure_database(app):
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = (
         DatabaseConfig.TRACK_MODIFICATIONS
     )
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': DatabaseConfig.POOL_SIZE,
+        'max_overflow': DatabaseConfig.POOL_MAX_OVERFLOW,
+        'pool_timeout': DatabaseConfig.POOL_TIMEOUT,
+    }
+    app.config['SQLITE_PRAGMAS'] = DatabaseConfig.SQLITE_PRAGMAS
 
 
 def _configure_app_settings(app):
@@ -52,6 +65,7 @@ def _configure_app_settings(app):
     :param app: Flask application instance
     """
     app.config['SECRET_KEY'] = AppConfig.SECRET_KEY
+    app.config['IDENTITY_CACHE_HEADER'] = IdentityCacheConfig.DEBUG_HEADER
 
 
 def _register_blueprints(app):
@@ -66,6 +80,7 @@ def _register_blueprints(app):
     app.register_blueprint(api_bp)
     app.register_blueprint(trivia_bp)
     app.register_blueprint(homepage_bp)
+    app.register_blueprint(search_bp)
 
 
 def _register_routes(app):
@@ -0,0 +1,131 @@
+"""
+Benchmark - Review list reads through ORM objects versus column projections.
+
+Seeds a temporary database with one movie and --rows reviews, then reads
+them all back twice: once by loading Review instances and calling to_dict(),
+once through datamanager.projections.REVIEW. Reports rows per second and the
+peak Python memory allocated during each read (tracemalloc).
+
+Usage (from the project root):
+    python -m benchmarks.projection_reads [--rows 100000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from flask import Flask
+from sqlalchemy import insert, select
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datamanager import db, init_database, Movie, Review, User
+from datamanager import projections
+
+
+def build_app(db_path):
+    """
+    Build a minimal Flask app bound to the given database file.
+
+    :param db_path: Path of the SQLite database file
+    :return: Configured Flask application
+    """
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    init_database(app)
+    return app
+
+
+def seed(rows):
+    """
+    Insert one user, one movie and the given number of reviews.
+
+    :param rows: Number of reviews to insert
+    :return: ID of the movie holding the reviews
+    """
+    user = User(name='Bench User', email='bench@example.com')
+    db.session.add(user)
+    db.session.flush()
+    movie = Movie(title='Bench Movie', year=2000, user_id=user.id)
+    db.session.add(movie)
+    db.session.flush()
+
+    now = datetime.now()
+    db.session.execute(insert(Review), [
+        {'content': f'Benchmark review {i}', 'reviewer_rating': i % 10 + 1,
+         'likes': i % 7, 'created_at': now, 'updated_at': now, 'movie_id': movie.id}
+        for i in range(rows)
+    ])
+    db.session.commit()
+    return movie.id
+
+
+def read_orm(movie_id):
+    """Read reviews as ORM instances serialized with to_dict()"""
+    reviews = db.session.scalars(
+        select(Review).where(Review.movie_id == movie_id).order_by(Review.id)
+    )
+    return [review.to_dict() for review in reviews]
+
+
+def read_projection(movie_id):
+    """Read reviews through the column projection"""
+    statement = (projections.REVIEW.select()
+                 .where(Review.movie_id == movie_id).order_by(Review.id))
+    return projections.REVIEW.to_dicts(db.session.execute(statement))
+
+
+def measure(read, movie_id, repeat):
+    """
+    Time a read function and record its peak memory.
+
+    :param read: Callable taking the movie ID and returning review dicts
+    :param movie_id: ID of the seeded movie
+    :param repeat: Number of timed runs; the fastest is reported
+    :return: Tuple of (rows, best seconds, peak bytes)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        rows = len(read(movie_id))
+        best = min(best, time.perf_counter() - start)
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    read(movie_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, best, peak
+
+
+def main():
+    """Parse arguments, seed the database and compare both read paths"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp(suffix='.sqlite')
+    os.close(db_fd)
+    try:
+        app = build_app(db_path)
+        with app.app_context():
+            movie_id = seed(args.rows)
+            print(f"🏁 {args.rows} reviews, best of {args.repeat}")
+            for label, read in (('orm', read_orm), ('projection', read_projection)):
+                rows, seconds, peak = measure(read, movie_id, args.repeat)
+                print(f"{label:<11} {rows / seconds:>10.0f} rows/s  "
+                      f"peak={peak / 2 ** 20:.1f} MiB")
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark - Mixed read/write throughput with and without the SQLite profile.
+
+Runs the same workload twice against a fresh temporary database: once with
+SQLite defaults (rollback journal, no busy timeout, default pool) and once
+with DatabaseConfig.SQLITE_PRAGMAS and the pool settings. Worker threads mix
+leaderboard/collection reads with trivia score saves and review likes.
+
+Usage (from the project root):
+    python -m benchmarks.sqlite_profile [--threads 8] [--seconds 5] [--write-ratio 0.3]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DatabaseConfig
+from datamanager import db, init_database, SQLiteDataManager
+
+SEED_USERS = 20
+SEED_MOVIES_PER_USER = 10
+
+
+def build_app(db_path, tuned):
+    """
+    Build a minimal Flask app bound to the given database file.
+
+    :param db_path: Path of the SQLite database file
+    :param tuned: Whether to apply the pragma profile and pool settings
+    :return: Configured Flask application
+    """
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if tuned:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': DatabaseConfig.POOL_SIZE,
+            'max_overflow': DatabaseConfig.POOL_MAX_OVERFLOW,
+            'pool_timeout': DatabaseConfig.POOL_TIMEOUT,
+        }
+        app.config['SQLITE_PRAGMAS'] = DatabaseConfig.SQLITE_PRAGMAS
+    else:
+        # Fail fast on lock contention, like SQLite without busy_timeout
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 0}}
+    init_database(app)
+    return app
+
+
+def seed(app):
+    """
+    Seed users, movies and reviews for the workload.
+
+    :param app: Flask application bound to the benchmark database
+    :return: Tuple of (user_ids, movie_ids, review_ids)
+    """
+    data_manager = SQLiteDataManager()
+    user_ids, movie_ids, review_ids = [], [], []
+    with app.app_context():
+        for u in range(SEED_USERS):
+            user = data_manager.add_user({'name': f'Bench User {u}',
+                                          'email': f'bench{u}@example.com'})
+            user_ids.append(user['id'])
+            for m in range(SEED_MOVIES_PER_USER):
+                movie = data_manager.add_user_movie(user['id'], {
+                    'title': f'Bench Movie {u}-{m}', 'year': 2000 + m
+                })
+                movie_ids.append(movie['id'])
+                review = data_manager.add_review(movie['id'], {'content': 'Benchmark review',
+                                                               'reviewer_rating': 7})
+                review_ids.append(review['id'])
+    return user_ids, movie_ids, review_ids
+
+
+def run_workload(app, ids, threads, seconds, write_ratio):
+    """
+    Run the mixed workload and count completed and failed operations.
+
+    :param app: Flask application bound to the benchmark database
+    :param ids: Tuple of (user_ids, movie_ids, review_ids) to operate on
+    :param threads: Number of concurrent worker threads
+    :param seconds: Duration of the run
+    :param write_ratio: Fraction of operations that write
+    :return: Dictionary with reads, writes and locked error counts
+    """
+    user_ids, movie_ids, review_ids = ids
+    totals = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed_value):
+        rng = random.Random(seed_value)
+        counts = {'reads': 0, 'writes': 0, 'locked': 0}
+        data_manager = SQLiteDataManager()
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                try:
+                    if rng.random() < write_ratio:
+                        if rng.random() < 0.5:
+                            data_manager.like_review(rng.choice(review_ids))
+                        else:
+                            data_manager.save_trivia_score({
+                                'user_id': rng.choice(user_ids),
+                                'trivia_type': 'movie',
+                                'movie_id': rng.choice(movie_ids),
+                                'score': rng.randint(0, 7),
+                                'total_questions': 7,
+                                'percentage': rng.randint(0, 100)
+                            })
+                        counts['writes'] += 1
+                    else:
+                        if rng.random() < 0.5:
+                            data_manager.get_global_leaderboard(20)
+                        else:
+                            data_manager.get_user_movies(rng.choice(user_ids))
+                        counts['reads'] += 1
+                except OperationalError:
+                    db.session.rollback()
+                    counts['locked'] += 1
+            db.session.remove()
+        with lock:
+            for key, value in counts.items():
+                totals[key] += value
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    return totals
+
+
+def benchmark(label, tuned, args):
+    """
+    Run one benchmark configuration on a fresh database and print the result.
+
+    :param label: Name printed for this configuration
+    :param tuned: Whether to apply the pragma profile and pool settings
+    :param args: Parsed command line arguments
+    """
+    db_fd, db_path = tempfile.mkstemp(suffix='.sqlite')
+    os.close(db_fd)
+    try:
+        app = build_app(db_path, tuned)
+        ids = seed(app)
+        totals = run_workload(app, ids, args.threads, args.seconds, args.write_ratio)
+        operations = totals['reads'] + totals['writes']
+        print(f"{label:<9} {operations / args.seconds:>10.0f} ops/s  "
+              f"reads={totals['reads']:<7} writes={totals['writes']:<7} "
+              f"locked={totals['locked']}")
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+def main():
+    """Parse arguments and run the baseline and tuned configurations"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--write-ratio', type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(f"🏁 {args.threads} threads, {args.seconds:g}s, "
+          f"{args.write_ratio:.0%} writes")
+    benchmark('baseline', False, args)
+    benchmark('tuned', True, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,6 +21,34 @@ class TriviaConfig:
     LEARNING_THRESHOLD = 40
 
 
+class TriviaBankConfig:
+    """Configuration for the trivia question bank"""
+
+    # Reuse generated movie trivia questions across users
+    ENABLED = True
+
+    # Questions a movie's bank needs before games are drawn from it instead of
+    # generating new questions (each generation adds up to MOVIE_QUESTIONS)
+    MIN_QUESTIONS = 14
+
+
+class TriviaPrefetchConfig:
+    """Configuration for background pre-generation of movie trivia"""
+
+    # Queue question generation for added movies the question bank does not cover
+    ENABLED = True
+
+    # Concurrent generations of the prefetch worker pool
+    WORKERS = 2
+
+    # RapidAPI calls left this month that prefetching never spends, so
+    # interactive games keep working until the monthly reset
+    QUOTA_RESERVE = 20
+
+    # Generations attempted per movie before giving up on filling its bank
+    MAX_GENERATIONS = 3
+
+
 class LeaderboardConfig:
     """Configuration for leaderboard functionality"""
 
@@ -30,6 +58,98 @@ class LeaderboardConfig:
     MOVIE_LIMIT = 15
     USER_STATS_RECENT_LIMIT = 5
 
+    # Rows kept per materialized leaderboard (reads are capped at this size)
+    MATERIALIZED_SIZE = 20
+
+
+class TriviaHistoryConfig:
+    """Configuration for compacting old trivia scores into monthly rollups"""
+
+    # Raw scores are kept for at least this many days; compaction works in
+    # whole calendar months before the month this window starts in
+    HOT_WINDOW_DAYS = 90
+
+
+class PaginationConfig:
+    """Configuration for keyset pagination of list views"""
+
+    # API page sizes
+    API_DEFAULT_LIMIT = 50
+    API_MAX_LIMIT = 200
+
+    # HTML page sizes
+    USERS_PAGE_SIZE = 24
+    MOVIES_PAGE_SIZE = 24
+
+
+class BulkImportConfig:
+    """Configuration for bulk movie imports"""
+
+    # Maximum movies accepted in one bulk request
+    MAX_ITEMS = 500
+
+    # Concurrent OMDb lookups while enriching a bulk import
+    ENRICHMENT_WORKERS = 8
+
+
+class EnrichmentConfig:
+    """Configuration for background OMDb enrichment of added movies"""
+
+    # Insert movies immediately and enrich them on worker threads; when False
+    # (or without an OMDb API key) movie adds enrich inline as before
+    BACKGROUND = True
+
+    # Concurrent OMDb lookups of the enrichment worker pool
+    WORKERS = 4
+
+    # Seconds between enrichment status polls from the movie page, and polls
+    # made before the page stops waiting (e.g. for a movie whose lookup was
+    # lost in a restart; `flask enrich-pending-movies` re-queues those)
+    POLL_INTERVAL = 2
+    MAX_POLLS = 30
+
+
+class LikeBufferConfig:
+    """Configuration for in-process coalescing of review likes"""
+
+    # Buffer likes in memory instead of writing one UPDATE per like. Review
+    # likes include buffered likes, but a movie's total_likes only counts
+    # them once flushed, so it can lag by up to FLUSH_SIZE likes or
+    # FLUSH_INTERVAL seconds.
+    ENABLED = False
+
+    # Flush when this many likes are pending, or every FLUSH_INTERVAL seconds
+    FLUSH_SIZE = 50
+    FLUSH_INTERVAL = 2.0
+
+
+class IdentityCacheConfig:
+    """Configuration for request-scoped caching of user and movie lookups"""
+
+    # Memoize primary-key lookups for the rest of a request
+    ENABLED = True
+
+    # Report hits and misses in an X-Identity-Cache response header (always
+    # on when the app runs in debug mode)
+    DEBUG_HEADER = False
+
+
+class SearchConfig:
+    """Configuration for full-text search over movies and reviews"""
+
+    # Longest accepted search query
+    QUERY_MAX_LENGTH = 100
+
+    # bm25() weights of the movie title, director and genre columns;
+    # review content has weight 1
+    MOVIE_COLUMN_WEIGHTS = (10.0, 3.0, 2.0)
+
+    # Words of context around matches in result snippets
+    SNIPPET_TOKENS = 12
+
+    # HTML page size
+    PAGE_SIZE = 20
+
 
 class ValidationConfig:
     """Configuration for validation rules"""
@@ -61,19 +181,117 @@ class DatabaseConfig:
     # Connection settings
     TRACK_MODIFICATIONS = False
 
+    # PRAGMAs applied to every new SQLite connection. WAL lets readers run
+    # alongside a writer; busy_timeout makes writers wait instead of failing
+    # with "database is locked".
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',      # Durable across app crashes in WAL mode
+        'busy_timeout': 5000,         # Milliseconds
+        'cache_size': -20000,         # Negative values are KiB (~20 MB)
+        'mmap_size': 134217728,       # 128 MB
+        'temp_store': 'MEMORY',
+    }
+
+    # Connection pool settings (one connection per concurrent request thread)
+    POOL_SIZE = 10
+    POOL_MAX_OVERFLOW = 20
+    POOL_TIMEOUT = 30
+
 
 class APIConfig:
     """Configuration for external API services"""
 
-    # Timeouts (seconds)
+    # Read timeouts (seconds)
     OMDB_TIMEOUT = 5
     RAPIDAPI_TIMEOUT = 30
+    OPENAI_TIMEOUT = 30
+    OPENAI_TEST_TIMEOUT = 10
+
+    # Retries after the first attempt (see HTTPClientConfig for the policy)
+    OMDB_RETRIES = 3
+    RAPIDAPI_RETRIES = 2
+    OPENAI_RETRIES = 2
 
     # API endpoints
     OMDB_BASE_URL = "http://www.omdbapi.com/"
     RAPIDAPI_BASE_URL = "https://chatgpt-ai-chat-bot.p.rapidapi.com/ask"
 
 
+class HTTPClientConfig:
+    """Configuration for the shared, pooled HTTP clients of external services"""
+
+    # Seconds to establish a connection (read timeouts are per service)
+    CONNECT_TIMEOUT = 3.05
+
+    # Default retries, and the responses that are retried
+    RETRIES = 2
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    # Backoff before retry n: BACKOFF_FACTOR * 2 ** (n - 1) seconds plus up to
+    # BACKOFF_JITTER seconds of random jitter, capped at BACKOFF_MAX. A
+    # Retry-After header takes precedence.
+    BACKOFF_FACTOR = 0.5
+    BACKOFF_JITTER = 0.5
+    BACKOFF_MAX = 10
+
+    # Hosts with a connection pool, and connections kept alive per host
+    # (at least BulkImportConfig.ENRICHMENT_WORKERS for parallel OMDb lookups)
+    POOL_HOSTS = 4
+    POOL_SIZE = 10
+
+
+class OMDbCacheConfig:
+    """Configuration for the persistent OMDb lookup cache"""
+
+    # Serve repeated OMDb lookups from the cache
+    ENABLED = True
+
+    # Cache database file, inside DatabaseConfig.INSTANCE_FOLDER
+    FILENAME = "omdb_cache.sqlite"
+
+    # Seconds found movies and "Movie not found" answers stay cached
+    TTL_SECONDS = 30 * 24 * 3600
+    NEGATIVE_TTL_SECONDS = 24 * 3600
+
+    # Entries kept before the least recently used are evicted
+    MAX_ENTRIES = 10000
+
+    # Seconds to wait for another writer's lock on the cache file
+    BUSY_TIMEOUT = 5
+
+
+class MetadataIndexConfig:
+    """Configuration for the offline movie metadata index"""
+
+    # Look movies up in the local index before calling OMDb
+    ENABLED = True
+
+    # Index database file, inside DatabaseConfig.INSTANCE_FOLDER
+    FILENAME = "movie_metadata.sqlite"
+
+    # Rows inserted per batch while loading a dump
+    LOAD_BATCH_SIZE = 5000
+
+    # Seconds to wait for another writer's lock on the index file
+    BUSY_TIMEOUT = 5
+
+    # The index has no posters: with background enrichment and an OMDb key,
+    # indexed movies are stored enriched and OMDb still fills in the poster on
+    # a worker thread. When False (and for inline adds) indexed movies skip
+    # OMDb entirely and stay without a poster.
+    FETCH_POSTERS = True
+
+
+class SingleFlightConfig:
+    """Configuration for coalescing concurrent identical external lookups"""
+
+    # Seconds a caller waits for an identical in-flight lookup before giving up;
+    # longer than one lookup can take including its retries
+    OMDB_WAIT_TIMEOUT = 60
+    TRIVIA_WAIT_TIMEOUT = 150
+
+
 class AppConfig:
     """Main application configuration"""
 
@@ -1,7 +1,15 @@
 from .database import db, init_database
-from .data_models import User, Movie, Review, TriviaScore
+from .data_models import (
+    User, Movie, Review, TriviaScore, TriviaScoreRollup, TriviaQuestion, LeaderboardEntry,
+    normalize_title
+)
 from .data_manager_interface import DataManagerInterface
 from .sqlite_data_manager import SQLiteDataManager
+from .async_data_manager_interface import AsyncDataManagerInterface
+from .async_sqlite_data_manager import AsyncSQLiteDataManager
+from .identity_cache import register_identity_cache
 
 __all__ = ['db', 'init_database', 'User', 'Movie', 'Review', 'TriviaScore',
-           'DataManagerInterface', 'SQLiteDataManager']
\ No newline at end of file
+           'TriviaScoreRollup', 'TriviaQuestion', 'LeaderboardEntry', 'normalize_title',
+           'DataManagerInterface', 'SQLiteDataManager',
+           'AsyncDataManagerInterface', 'AsyncSQLiteDataManager', 'register_identity_cache']
\ No newline at end of file
@@ -0,0 +1,180 @@
+from abc import ABC, abstractmethod
+
+class AsyncDataManagerInterface(ABC):
+    """Abstract base class defining the asyncio interface for any data manager.
+    Mirrors DataManagerInterface method for method, with coroutines."""
+
+    @abstractmethod
+    async def get_all_users(self, after_id=None, limit=None):
+        """Return users ordered by ID, optionally paged after an ID"""
+        pass
+
+    @abstractmethod
+    async def get_user_by_id(self, user_id):
+        """Return a specific user by ID"""
+        pass
+
+    @abstractmethod
+    async def update_user(self, user_id, updated_data):
+        """Update a user by ID with new data"""
+        pass
+
+    @abstractmethod
+    async def delete_user(self, user_id):
+        """Delete a user by ID with their movies, reviews and trivia scores"""
+        pass
+
+    @abstractmethod
+    async def get_user_movies(self, user_id, after_id=None, limit=None):
+        """Return movies for a specific user ordered by ID, optionally paged after an ID"""
+        pass
+
+    @abstractmethod
+    async def add_user(self, user_data):
+        """Add a new user to the database"""
+        pass
+
+    @abstractmethod
+    async def add_user_movie(self, user_id, movie_data):
+        """Add a new movie to a user's movie list"""
+        pass
+
+    @abstractmethod
+    async def add_user_movies(self, user_id, movies_data):
+        """Add several movies to a user's movie list in one transaction, skipping duplicates"""
+        pass
+
+    @abstractmethod
+    async def add_movie(self, movie_data):
+        """Add a new movie to the database"""
+        pass
+
+    @abstractmethod
+    async def movie_exists(self, user_id, title, year=None, exclude_movie_id=None):
+        """Check whether a user already has a movie with this normalized title and year"""
+        pass
+
+    @abstractmethod
+    async def get_movie_with_owner(self, movie_id):
+        """Return a movie and its owning user by movie ID"""
+        pass
+
+    @abstractmethod
+    async def update_movie(self, movie_id, updated_data):
+        """Update a movie by ID with new data"""
+        pass
+
+    @abstractmethod
+    async def apply_movie_enrichment(self, movie_id, enrichment, status):
+        """Fill blank movie fields from background enrichment and set its status"""
+        pass
+
+    @abstractmethod
+    async def get_pending_enrichment_movies(self, limit=None):
+        """Get movies still waiting for background enrichment"""
+        pass
+
+    @abstractmethod
+    async def delete_movie(self, movie_id):
+        """Delete a movie by ID"""
+        pass
+
+    @abstractmethod
+    async def add_review(self, movie_id, review_data):
+        """Add a review to a movie"""
+        pass
+
+    @abstractmethod
+    async def get_movie_reviews(self, movie_id, after_id=None, limit=None):
+        """Get reviews for a specific movie ordered by ID, optionally paged after an ID"""
+        pass
+
+    @abstractmethod
+    async def update_review(self, review_id, updated_data):
+        """Update a review by ID"""
+        pass
+
+    @abstractmethod
+    async def delete_review(self, review_id):
+        """Delete a review by ID"""
+        pass
+
+    @abstractmethod
+    async def reconcile_review_aggregates(self):
+        """Recompute every movie's review aggregates, returning how many were corrected"""
+        pass
+
+    @abstractmethod
+    async def search(self, query, user_id=None, offset=0, limit=None):
+        """Full-text search over movies and reviews, best matches first"""
+        pass
+
+    @abstractmethod
+    async def get_review_by_id(self, review_id):
+        """Return a specific review by ID"""
+        pass
+
+    @abstractmethod
+    async def like_review(self, review_id):
+        """Atomically increment likes for a review"""
+        pass
+
+    @abstractmethod
+    async def add_review_likes(self, deltas):
+        """Atomically add likes to many reviews, given a review ID to delta mapping"""
+        pass
+
+    @abstractmethod
+    async def save_trivia_score(self, score_data):
+        """Save a trivia score to the database"""
+        pass
+
+    @abstractmethod
+    async def get_global_leaderboard(self, limit=10):
+        """Get global trivia leaderboard (all users, all attempts)"""
+        pass
+
+    @abstractmethod
+    async def get_movie_leaderboard(self, movie_id, limit=10):
+        """Get leaderboard for specific movie"""
+        pass
+
+    @abstractmethod
+    async def get_collection_leaderboard(self, limit=10):
+        """Get leaderboard for collection trivia"""
+        pass
+
+    @abstractmethod
+    async def rebuild_leaderboards(self):
+        """Regenerate materialized leaderboards from trivia score history"""
+        pass
+
+    @abstractmethod
+    async def compact_trivia_scores(self, hot_window_days=None):
+        """Fold trivia scores older than the hot window into monthly rollups"""
+        pass
+
+    @abstractmethod
+    async def draw_trivia_questions(self, title, year, count):
+        """Draw a random set of banked trivia questions for a movie"""
+        pass
+
+    @abstractmethod
+    async def add_trivia_questions(self, title, year, questions, source):
+        """Add generated trivia questions to a movie's question bank"""
+        pass
+
+    @abstractmethod
+    async def count_trivia_questions(self, title, year):
+        """Count the trivia questions banked for a movie"""
+        pass
+
+    @abstractmethod
+    async def get_movies_needing_trivia(self, min_questions, limit=None):
+        """Find movies whose question bank is thin, most collected first"""
+        pass
+
+    @abstractmethod
+    async def get_user_trivia_stats(self, user_id):
+        """Get trivia statistics for a specific user"""
+        pass
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Async SQLite Data Manager - asyncio implementation of the data manager.
+Runs every SQLiteDataManager operation on an aiosqlite connection through
+AsyncSession.run_sync, so both implementations share one set of queries and
+coroutines can await database work alongside other I/O instead of blocking
+a thread on it.
+
+Requires the aiosqlite and greenlet packages (pinned in requirements.txt).
+"""
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from .async_data_manager_interface import AsyncDataManagerInterface
+from .database import db, _configure_sqlite_connections
+from .sqlite_data_manager import SQLiteDataManager
+
+
+class AsyncSQLiteDataManager(AsyncDataManagerInterface):
+    """SQLite implementation of the AsyncDataManagerInterface using aiosqlite"""
+
+    def __init__(self, database_uri, pragmas=None, engine_options=None):
+        """
+        Initialize async data manager with its own engine.
+
+        :param database_uri: SQLite database URI (sqlite:/// or sqlite+aiosqlite:///)
+        :param pragmas: Mapping of PRAGMA name to value applied per connection
+        :param engine_options: Extra keyword arguments for create_async_engine
+        """
+        url = make_url(database_uri).set(drivername='sqlite+aiosqlite')
+        self.engine = create_async_engine(url, **(engine_options or {}))
+        _configure_sqlite_connections(self.engine.sync_engine, pragmas or {})
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    @classmethod
+    def from_app(cls, app):
+        """
+        Create an async data manager for the database a Flask app is bound to.
+
+        :param app: Flask application initialized with init_database
+        :return: AsyncSQLiteDataManager instance
+        """
+        with app.app_context():
+            url = db.engine.url
+        return cls(url, pragmas=app.config.get('SQLITE_PRAGMAS'))
+
+    async def dispose(self):
+        """
+        Close all pooled connections.
+
+        :return: None
+        """
+        await self.engine.dispose()
+
+    async def _run(self, method_name, *args, **kwargs):
+        """
+        Run a SQLiteDataManager method in a fresh async session.
+
+        :param method_name: Name of the SQLiteDataManager method
+        :return: The method's result
+        """
+        def call(sync_session):
+            method = getattr(SQLiteDataManager(sync_session), method_name)
+            return method(*args, **kwargs)
+
+        async with self.session_factory() as session:
+            return await session.run_sync(call)
+
+    async def get_all_users(self, after_id=None, limit=None):
+        """Return users ordered by ID, optionally paged after an ID"""
+        return await self._run('get_all_users', after_id=after_id, limit=limit)
+
+    async def get_user_by_id(self, user_id):
+        """Return a specific user by ID"""
+        return await self._run('get_user_by_id', user_id)
+
+    async def update_user(self, user_id, updated_data):
+        """Update a user by ID with new data"""
+        return await self._run('update_user', user_id, updated_data)
+
+    async def delete_user(self, user_id):
+        """Delete a user by ID with their movies, reviews and trivia scores"""
+        return await self._run('delete_user', user_id)
+
+    async def get_user_movies(self, user_id, after_id=None, limit=None):
+        """Return movies for a specific user ordered by ID, optionally paged after an ID"""
+        return await self._run('get_user_movies', user_id, after_id=after_id, limit=limit)
+
+    async def add_user(self, user_data):
+        """Add a new user to the database"""
+        return await self._run('add_user', user_data)
+
+    async def add_user_movie(self, user_id, movie_data):
+        """Add a new movie to a user's movie list"""
+        return await self._run('add_user_movie', user_id, movie_data)
+
+    async def add_user_movies(self, user_id, movies_data):
+        """Add several movies to a user's movie list in one transaction, skipping duplicates"""
+        return await self._run('add_user_movies', user_id, movies_data)
+
+    async def add_movie(self, movie_data):
+        """Add a new movie to the database"""
+        return await self._run('add_movie', movie_data)
+
+    async def movie_exists(self, user_id, title, year=None, exclude_movie_id=None):
+        """Check whether a user already has a movie with this normalized title and year"""
+        return await self._run('movie_exists', user_id, title, year=year, exclude_movie_id=exclude_movie_id)
+
+    async def get_movie_with_owner(self, movie_id):
+        """Return a movie and its owning user by movie ID"""
+        return await self._run('get_movie_with_owner', movie_id)
+
+    async def update_movie(self, movie_id, updated_data):
+        """Update a movie by ID with new data"""
+        return await self._run('update_movie', movie_id, updated_data)
+
+    async def apply_movie_enrichment(self, movie_id, enrichment, status):
+        """Fill blank movie fields from background enrichment and set its status"""
+        return await self._run('apply_movie_enrichment', movie_id, enrichment, status)
+
+    async def get_pending_enrichment_movies(self, limit=None):
+        """Get movies still waiting for background enrichment"""
+        return await self._run('get_pending_enrichment_movies', limit=limit)
+
+    async def delete_movie(self, movie_id):
+        """Delete a movie by ID"""
+        return await self._run('delete_movie', movie_id)
+
+    async def add_review(self, movie_id, review_data):
+        """Add a review to a movie"""
+        return await self._run('add_review', movie_id, review_data)
+
+    async def get_movie_reviews(self, movie_id, after_id=None, limit=None):
+        """Get reviews for a specific movie ordered by ID, optionally paged after an ID"""
+        return await self._run('get_movie_reviews', movie_id, after_id=after_id, limit=limit)
+
+    async def update_review(self, review_id, updated_data):
+        """Update a review by ID"""
+        return await self._run('update_review', review_id, updated_data)
+
+    async def delete_review(self, review_id):
+        """Delete a review by ID"""
+        return await self._run('delete_review', review_id)
+
+    async def reconcile_review_aggregates(self):
+        """Recompute every movie's review aggregates, returning how many were corrected"""
+        return await self._run('reconcile_review_aggregates')
+
+    async def search(self, query, user_id=None, offset=0, limit=None):
+        """Full-text search over movies and reviews, best matches first"""
+        return await self._run('search', query, user_id=user_id, offset=offset, limit=limit)
+
+    async def get_review_by_id(self, review_id):
+        """Return a specific review by ID"""
+        return await self._run('get_review_by_id', review_id)
+
+    async def like_review(self, review_id):
+        """Atomically increment likes for a review"""
+        return await self._run('like_review', review_id)
+
+    async def add_review_likes(self, deltas):
+        """Atomically add likes to many reviews, given a review ID to delta mapping"""
+        return await self._run('add_review_likes', deltas)
+
+    async def save_trivia_score(self, score_data):
+        """Save a trivia score to the database"""
+        return await self._run('save_trivia_score', score_data)
+
+    async def get_global_leaderboard(self, limit=10):
+        """Get global trivia leaderboard (all users, all attempts)"""
+        return await self._run('get_global_leaderboard', limit=limit)
+
+    async def get_movie_leaderboard(self, movie_id, limit=10):
+        """Get leaderboard for specific movie"""
+        return await self._run('get_movie_leaderboard', movie_id, limit=limit)
+
+    async def get_collection_leaderboard(self, limit=10):
+        """Get leaderboard for collection trivia"""
+        return await self._run('get_collection_leaderboard', limit=limit)
+
+    async def rebuild_leaderboards(self):
+        """Regenerate materialized leaderboards from trivia score history"""
+        return await self._run('rebuild_leaderboards')
+
+    async def compact_trivia_scores(self, hot_window_days=None):
+        """Fold trivia scores older than the hot window into monthly rollups"""
+        return await self._run('compact_trivia_scores', hot_window_days=hot_window_days)
+
+    async def draw_trivia_questions(self, title, year, count):
+        """Draw a random set of banked trivia questions for a movie"""
+        return await self._run('draw_trivia_questions', title, year, count)
+
+    async def add_trivia_questions(self, title, year, questions, source):
+        """Add generated trivia questions to a movie's question bank"""
+        return await self._run('add_trivia_questions', title, year, questions, source)
+
+    async def count_trivia_questions(self, title, year):
+        """Count the trivia questions banked for a movie"""
+        return await self._run('count_trivia_questions', title, year)
+
+    async def get_movies_needing_trivia(self, min_questions, limit=None):
+        """Find movies whose question bank is thin, most collected first"""
+        return await self._run('get_movies_needing_trivia', min_questions, limit=limit)
+
+    async def get_user_trivia_stats(self, user_id):
+        """Get trivia statistics for a specific user"""
+        return await self._run('get_user_trivia_stats', user_id)
@@ -4,8 +4,8 @@ class DataManagerInterface(ABC):
     """Abstract base class defining the interface for any data manager"""
 
     @abstractmethod
-    def get_all_users(self):
-        """Return a list of all users"""
+    def get_all_users(self, after_id=None, limit=None):
+        """Return users ordered by ID, optionally paged after an ID"""
         pass
 
     @abstractmethod
@@ -20,12 +20,12 @@ class DataManagerInterface(ABC):
 
     @abstractmethod
     def delete_user(self, user_id):
-        """Delete a user by ID"""
+        """Delete a user by ID with their movies, reviews and trivia scores"""
         pass
 
     @abstractmethod
-    def get_user_movies(self, user_id):
-        """Return a list of movies for a specific user"""
+    def get_user_movies(self, user_id, after_id=None, limit=None):
+        """Return movies for a specific user ordered by ID, optionally paged after an ID"""
         pass
 
     @abstractmethod
@@ -38,16 +38,41 @@ class DataManagerInterface(ABC):
         """Add a new movie to a user's movie list"""
         pass
 
+    @abstractmethod
+    def add_user_movies(self, user_id, movies_data):
+        """Add several movies to a user's movie list in one transaction, skipping duplicates"""
+        pass
+
     @abstractmethod
     def add_movie(self, movie_data):
         """Add a new movie to the database"""
         pass
 
+    @abstractmethod
+    def movie_exists(self, user_id, title, year=None, exclude_movie_id=None):
+        """Check whether a user already has a movie with this normalized title and year"""
+        pass
+
+    @abstractmethod
+    def get_movie_with_owner(self, movie_id):
+        """Return a movie and its owning user by movie ID"""
+        pass
+
     @abstractmethod
     def update_movie(self, movie_id, updated_data):
         """Update a movie by ID with new data"""
         pass
 
+    @abstractmethod
+    def apply_movie_enrichment(self, movie_id, enrichment, status):
+        """Fill blank movie fields from background enrichment and set its status"""
+        pass
+
+    @abstractmethod
+    def get_pending_enrichment_movies(self, limit=None):
+        """Get movies still waiting for background enrichment"""
+        pass
+
     @abstractmethod
     def delete_movie(self, movie_id):
         """Delete a movie by ID"""
@@ -59,8 +84,8 @@ class DataManagerInterface(ABC):
         pass
 
     @abstractmethod
-    def get_movie_reviews(self, movie_id):
-        """Get all reviews for a specific movie"""
+    def get_movie_reviews(self, movie_id, after_id=None, limit=None):
+        """Get reviews for a specific movie ordered by ID, optionally paged after an ID"""
         pass
 
     @abstractmethod
@@ -73,9 +98,29 @@ class DataManagerInterface(ABC):
         """Delete a review by ID"""
         pass
 
+    @abstractmethod
+    def reconcile_review_aggregates(self):
+        """Recompute every movie's review aggregates, returning how many were corrected"""
+        pass
+
+    @abstractmethod
+    def search(self, query, user_id=None, offset=0, limit=None):
+        """Full-text search over movies and reviews, best matches first"""
+        pass
+
+    @abstractmethod
+    def get_review_by_id(self, review_id):
+        """Return a specific review by ID"""
+        pass
+
     @abstractmethod
     def like_review(self, review_id):
-        """Increment likes for a review"""
+        """Atomically increment likes for a review"""
+        pass
+
+    @abstractmethod
+    def add_review_likes(self, deltas):
+        """Atomically add likes to many reviews, given a review ID to delta mapping"""
         pass
 
     @abstractmethod
@@ -98,6 +143,36 @@ class DataManagerInterface(ABC):
         """Get leaderboard for collection trivia"""
         pass
 
+    @abstractmethod
+    def rebuild_leaderboards(self):
+        """Regenerate materialized leaderboards from trivia score history"""
+        pass
+
+    @abstractmethod
+    def compact_trivia_scores(self, hot_window_days=None):
+        """Fold trivia scores older than the hot window into monthly rollups"""
+        pass
+
+    @abstractmethod
+    def draw_trivia_questions(self, title, year, count):
+        """Draw a random set of banked trivia questions for a movie"""
+        pass
+
+    @abstractmethod
+    def add_trivia_questions(self, title, year, questions, source):
+        """Add generated trivia questions to a movie's question bank"""
+        pass
+
+    @abstractmethod
+    def count_trivia_questions(self, title, year):
+        """Count the trivia questions banked for a movie"""
+        pass
+
+    @abstractmethod
+    def get_movies_needing_trivia(self, min_questions, limit=None):
+        """Find movies whose question bank is thin, most collected first"""
+        pass
+
     @abstractmethod
     def get_user_trivia_stats(self, user_id):
         """Get trivia statistics for a specific user"""
@@ -1,5 +1,18 @@
+import json
 from .database import db
 from datetime import datetime
+from sqlalchemy.orm import validates
+
+
+def normalize_title(title):
+    """
+    Normalize a movie title for duplicate detection (case and whitespace insensitive).
+
+    :param title: Movie title
+    :return: Normalized title string
+    """
+    return ' '.join((title or '').split()).casefold()
+
 
 class User(db.Model):
     """User model for the database"""
@@ -35,15 +48,35 @@ class Movie(db.Model):
     rating = db.Column(db.Float, nullable=True)
     genre = db.Column(db.String(100), nullable=True)
     poster = db.Column(db.String(500), nullable=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    normalized_title = db.Column(db.String(200), nullable=False)  # Maintained from title
 
+    # Review aggregates, maintained by the data manager on every review write
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    avg_reviewer_rating = db.Column(db.Float, nullable=True)  # None until a review is rated
+    total_likes = db.Column(db.Integer, nullable=False, default=0)
+
+    # Background OMDb enrichment: 'pending', 'enriched', 'unmatched' or 'failed';
+    # None when the movie was never queued for enrichment
+    enrichment_status = db.Column(db.String(20), nullable=True)
+
+    # A collection may hold a title once per year, ignoring case and spacing;
+    # coalesce() makes a missing year count as one value instead of distinct NULLs
     __table_args__ = (
         db.UniqueConstraint('user_id', 'title', 'year', name='unique_user_movie'),
+        db.Index('ux_movies_user_title_year', user_id, normalized_title,
+                 db.func.coalesce(year, 0), unique=True),
     )
 
     trivia_scores = db.relationship('TriviaScore', back_populates='movie', lazy=True)
     reviews = db.relationship('Review', backref='movie', lazy=True, cascade='all, delete-orphan')
 
+    @validates('title')
+    def _set_normalized_title(self, key, title):
+        """Keep normalized_title in step with every title assignment"""
+        self.normalized_title = normalize_title(title)
+        return title
+
     def to_dict(self):
         """Convert movie object to dictionary"""
         return {
@@ -54,7 +87,11 @@ class Movie(db.Model):
             'rating': self.rating,
             'genre': self.genre,
             'poster': self.poster,
-            'user_id': self.user_id
+            'user_id': self.user_id,
+            'review_count': self.review_count,
+            'avg_reviewer_rating': self.avg_reviewer_rating,
+            'total_likes': self.total_likes,
+            'enrichment_status': self.enrichment_status
         }
 
     def __repr__(self):
@@ -72,7 +109,10 @@ class Review(db.Model):
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
-    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=False)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=False, index=True)
+
+    # Fetch the SQL-generated timestamps with RETURNING on INSERT and UPDATE
+    __mapper_args__ = {'eager_defaults': True}
 
     def to_dict(self):
         """Convert review object to dictionary"""
@@ -104,6 +144,20 @@ class TriviaScore(db.Model):
     completion_time = db.Column(db.Integer, nullable=True)  # Time in seconds
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
+    # Leaderboard indexes match the ORDER BY of each leaderboard query
+    # (percentage DESC, score DESC, created_at ASC) behind its equality filters,
+    # so a top-N read walks the index instead of sorting the table. The user
+    # index carries created_at so "most recent attempts" is a backwards scan.
+    __table_args__ = (
+        db.Index('ix_trivia_scores_global_rank',
+                 percentage.desc(), score.desc(), created_at),
+        db.Index('ix_trivia_scores_type_rank',
+                 trivia_type, percentage.desc(), score.desc(), created_at),
+        db.Index('ix_trivia_scores_movie_rank',
+                 movie_id, trivia_type, percentage.desc(), score.desc(), created_at),
+        db.Index('ix_trivia_scores_user_recent', user_id, created_at),
+    )
+
     user = db.relationship('User', back_populates='trivia_scores')
     movie = db.relationship('Movie', back_populates='trivia_scores')
 
@@ -122,4 +176,143 @@ class TriviaScore(db.Model):
         }
 
     def __repr__(self):
-        return f'<TriviaScore {self.user_id}: {self.score}/{self.total_questions} ({self.percentage}%)>'
\ No newline at end of file
+        return f'<TriviaScore {self.user_id}: {self.score}/{self.total_questions} ({self.percentage}%)>'
+
+
+class TriviaScoreRollup(db.Model):
+    """Monthly summary of compacted trivia scores for one user, trivia type and movie"""
+    __tablename__ = 'trivia_score_rollups'
+
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), nullable=False)  # 'YYYY-MM' of the summarized scores
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    trivia_type = db.Column(db.String(20), nullable=False)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.id'), nullable=True)
+    attempts = db.Column(db.Integer, nullable=False)
+    percentage_sum = db.Column(db.Integer, nullable=False)
+    best_percentage = db.Column(db.Integer, nullable=False)
+    histogram = db.Column(db.Text, nullable=False)  # JSON list of attempts per 10% band
+
+    # The best attempt is kept whole so leaderboards can be rebuilt after compaction
+    best_score_id = db.Column(db.Integer, nullable=False)
+    best_score = db.Column(db.Integer, nullable=False)
+    best_total_questions = db.Column(db.Integer, nullable=False)
+    best_completion_time = db.Column(db.Integer, nullable=True)
+    best_created_at = db.Column(db.DateTime, nullable=True)
+
+    # Rank indexes mirror TriviaScore's over the best attempt of each rollup;
+    # best_score_id stands in for the rowid tiebreak of the trivia_scores indexes
+    __table_args__ = (
+        db.Index('ix_trivia_score_rollups_global_rank',
+                 best_percentage.desc(), best_score.desc(), best_created_at, best_score_id),
+        db.Index('ix_trivia_score_rollups_type_rank',
+                 trivia_type, best_percentage.desc(), best_score.desc(), best_created_at,
+                 best_score_id),
+        db.Index('ix_trivia_score_rollups_movie_rank',
+                 movie_id, trivia_type, best_percentage.desc(), best_score.desc(),
+                 best_created_at, best_score_id),
+        db.Index('ix_trivia_score_rollups_user_month', user_id, month),
+    )
+
+    def __repr__(self):
+        return f'<TriviaScoreRollup {self.month} user {self.user_id}: {self.attempts} attempts>'
+
+
+class TriviaQuestion(db.Model):
+    """Generated movie trivia question kept in the question bank for reuse"""
+    __tablename__ = 'trivia_questions'
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Canonical movie: normalized title and year (0 when the year is unknown),
+    # so every user's copy of a movie draws from the same bank
+    title_key = db.Column(db.String(200), nullable=False)
+    year = db.Column(db.Integer, nullable=False, default=0)
+
+    question = db.Column(db.Text, nullable=False)
+    question_key = db.Column(db.Text, nullable=False)  # Normalized question, for deduplication
+    options = db.Column(db.Text, nullable=False)  # JSON list of answer options
+    correct = db.Column(db.Integer, nullable=False)  # Index of the correct option
+    difficulty = db.Column(db.String(20), nullable=True)
+    source = db.Column(db.String(20), nullable=False)  # API that generated the question
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('ux_trivia_questions_movie_question', title_key, year, question_key,
+                 unique=True),
+    )
+
+    def to_dict(self):
+        """Convert question to the dictionary shape trivia APIs return"""
+        return {
+            'question': self.question,
+            'options': json.loads(self.options),
+            'correct': self.correct,
+            'difficulty': self.difficulty
+        }
+
+    def __repr__(self):
+        return f'<TriviaQuestion {self.title_key} ({self.year}): {self.question[:40]}>'
+
+
+class LeaderboardEntry(db.Model):
+    """Materialized top-N row of a trivia leaderboard, copied from a TriviaScore"""
+    __tablename__ = 'leaderboard_entries'
+
+    id = db.Column(db.Integer, primary_key=True)
+    board = db.Column(db.String(20), nullable=False)  # 'global', 'collection' or 'movie'
+    board_movie_id = db.Column(db.Integer, nullable=False, default=0)  # Movie for 'movie' boards, else 0
+    score_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    trivia_type = db.Column(db.String(20), nullable=False)
+    movie_id = db.Column(db.Integer, nullable=True)
+    score = db.Column(db.Integer, nullable=False)
+    total_questions = db.Column(db.Integer, nullable=False)
+    percentage = db.Column(db.Integer, nullable=False)
+    completion_time = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_leaderboard_entries_rank',
+                 board, board_movie_id, percentage.desc(), score.desc(),
+                 created_at, score_id),
+        db.Index('ix_leaderboard_entries_user_id', user_id),
+    )
+
+    @classmethod
+    def from_score(cls, board, trivia_score, board_movie_id=0):
+        """Build a leaderboard entry for the given board from a trivia score"""
+        return cls(
+            board=board,
+            board_movie_id=board_movie_id,
+            score_id=trivia_score.id,
+            user_id=trivia_score.user_id,
+            trivia_type=trivia_score.trivia_type,
+            movie_id=trivia_score.movie_id,
+            score=trivia_score.score,
+            total_questions=trivia_score.total_questions,
+            percentage=trivia_score.percentage,
+            completion_time=trivia_score.completion_time,
+            created_at=trivia_score.created_at
+        )
+
+    def rank_key(self):
+        """Sort key matching leaderboard order (lower ranks higher)"""
+        return (-self.percentage, -self.score, self.created_at, self.score_id)
+
+    def to_dict(self):
+        """Convert leaderboard entry to the trivia score dictionary it mirrors"""
+        return {
+            'id': self.score_id,
+            'user_id': self.user_id,
+            'trivia_type': self.trivia_type,
+            'movie_id': self.movie_id,
+            'score': self.score,
+            'total_questions': self.total_questions,
+            'percentage': self.percentage,
+            'completion_time': self.completion_time,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+    def __repr__(self):
+        return f'<LeaderboardEntry {self.board}:{self.board_movie_id} score {self.score_id}>'
@@ -1,6 +1,22 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
+from sqlalchemy.schema import CreateIndex
 
-db = SQLAlchemy()
+# Write paths serialize the instances they just committed; keeping their
+# loaded state avoids a SELECT per write to refresh what was just written.
+# Server-generated values are fetched with RETURNING (see eager_defaults).
+db = SQLAlchemy(session_options={'expire_on_commit': False})
+
+# Indexes replaced by wider ones on the models; dropped from existing databases
+_RETIRED_INDEXES = ('ix_trivia_scores_user_id',)
+
+# FTS5 indexes over searchable text. They are external-content tables, so the
+# text lives only in movies/reviews; triggers mirror every INSERT, UPDATE and
+# DELETE (including set-based ones) into the index in the writer's transaction.
+_SEARCH_INDEXES = {
+    'movies_fts': ('movies', ('title', 'director', 'genre')),
+    'reviews_fts': ('reviews', ('content',)),
+}
 
 def init_database(app):
     """
@@ -10,5 +26,178 @@ def init_database(app):
     db.init_app(app)
 
     with app.app_context():
+        _configure_sqlite_connections(db.engine, app.config.get('SQLITE_PRAGMAS', {}))
         db.create_all()
-        print("Database tables created successfully.")
\ No newline at end of file
+        _migrate_normalized_titles()
+        _migrate_review_aggregates()
+        _add_column('movies', 'enrichment_status', 'VARCHAR(20)')
+        _ensure_indexes()
+        _ensure_search_indexes()
+        _backfill_leaderboards()
+        print("Database tables created successfully.")
+
+
+def _configure_sqlite_connections(engine, pragmas):
+    """
+    Apply the configured PRAGMAs to every new connection of an engine.
+
+    :param engine: Synchronous SQLAlchemy engine (an async engine's sync_engine)
+    :param pragmas: Mapping of PRAGMA name to value
+    """
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    event.listen(engine, 'connect', apply_pragmas)
+
+
+def _add_column(table, column, ddl):
+    """
+    Add a column to an existing table if it is missing.
+
+    :param table: Table name
+    :param column: Column name
+    :param ddl: Column definition used in ALTER TABLE ... ADD COLUMN
+    :return: True if the column was added, False if it already existed
+    """
+    existing = {c['name'] for c in inspect(db.engine).get_columns(table)}
+    if column in existing:
+        return False
+
+    with db.engine.begin() as connection:
+        connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+    return True
+
+
+def _migrate_normalized_titles():
+    """
+    Add and backfill movies.normalized_title on databases created before it existed.
+
+    Titles that already collide once normalized get the movie ID appended so
+    the unique index can be built; the duplicates stay visible to their owner.
+    """
+    from .data_models import normalize_title
+
+    if not _add_column('movies', 'normalized_title', "VARCHAR(200) NOT NULL DEFAULT ''"):
+        return
+
+    with db.engine.begin() as connection:
+        rows = connection.execute(
+            text('SELECT id, user_id, title, year FROM movies ORDER BY id')
+        ).fetchall()
+
+        seen = set()
+        updates = []
+        for movie_id, user_id, title, year in rows:
+            normalized = normalize_title(title)
+            if (user_id, normalized, year or 0) in seen:
+                print(f"⚠️ Movie {movie_id} duplicates an earlier title in its collection")
+                normalized = f'{normalized} #{movie_id}'
+            seen.add((user_id, normalized, year or 0))
+            updates.append({'id': movie_id, 'normalized_title': normalized})
+
+        if updates:
+            connection.execute(
+                text('UPDATE movies SET normalized_title = :normalized_title WHERE id = :id'),
+                updates
+            )
+    print(f"✅ Backfilled normalized titles for {len(updates)} movies")
+
+
+def _migrate_review_aggregates():
+    """
+    Add the per-movie review aggregate columns on databases created before
+    they existed, and compute them from the existing reviews.
+    """
+    from .sqlite_data_manager import SQLiteDataManager
+
+    added = [
+        _add_column('movies', 'review_count', 'INTEGER NOT NULL DEFAULT 0'),
+        _add_column('movies', 'avg_reviewer_rating', 'FLOAT'),
+        _add_column('movies', 'total_likes', 'INTEGER NOT NULL DEFAULT 0'),
+    ]
+    if any(added):
+        corrected = SQLiteDataManager().reconcile_review_aggregates()
+        print(f"✅ Computed review aggregates for {corrected} movies")
+
+
+def _ensure_indexes():
+    """
+    Create indexes declared on the models that are missing from existing tables.
+
+    create_all() only emits CREATE INDEX for tables it creates, so databases
+    created before an index was declared would otherwise never receive it.
+    """
+    with db.engine.begin() as connection:
+        for name in _RETIRED_INDEXES:
+            connection.execute(text(f'DROP INDEX IF EXISTS {name}'))
+
+        # IF NOT EXISTS rather than checkfirst: reflection skips expression indexes
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _ensure_search_indexes():
+    """
+    Create the FTS5 search indexes and their sync triggers if missing.
+
+    An index is rebuilt from its content table whenever its triggers had to
+    be (re)created, which covers new indexes, databases that predate search
+    and content tables recreated since the index was last maintained.
+    """
+    with db.engine.begin() as connection:
+        for fts_table, (table, columns) in _SEARCH_INDEXES.items():
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f'new.{column}' for column in columns)
+            old_values = ', '.join(f'old.{column}' for column in columns)
+            insert_new = (f"INSERT INTO {fts_table}(rowid, {column_list}) "
+                          f"VALUES (new.id, {new_values});")
+            delete_old = (f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+                          f"VALUES ('delete', old.id, {old_values});")
+
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+                f"{column_list}, content='{table}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            ))
+
+            triggers = {
+                f'{fts_table}_ai': f'AFTER INSERT ON {table} BEGIN {insert_new} END',
+                f'{fts_table}_ad': f'AFTER DELETE ON {table} BEGIN {delete_old} END',
+                f'{fts_table}_au': (f'AFTER UPDATE OF {column_list} ON {table} '
+                                    f'BEGIN {delete_old} {insert_new} END'),
+            }
+            existing = set(connection.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"),
+                {'table': table}
+            ).scalars())
+            if existing >= set(triggers):
+                continue
+
+            for name, body in triggers.items():
+                connection.execute(text(f'DROP TRIGGER IF EXISTS {name}'))
+                connection.execute(text(f'CREATE TRIGGER {name} {body}'))
+            connection.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+            print(f"✅ Built search index {fts_table}")
+
+
+def _backfill_leaderboards():
+    """
+    Populate the materialized leaderboards when they are empty but trivia
+    history exists (e.g. the first start after leaderboard_entries was added).
+    """
+    from .data_models import LeaderboardEntry, TriviaScore, TriviaScoreRollup
+    from .sqlite_data_manager import SQLiteDataManager
+
+    has_history = (TriviaScore.query.first() is not None or
+                   TriviaScoreRollup.query.first() is not None)
+    if LeaderboardEntry.query.first() is None and has_history:
+        SQLiteDataManager().rebuild_leaderboards()
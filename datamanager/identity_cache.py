@@ -0,0 +1,87 @@
+"""
+Identity Cache - Request-scoped memoization of user and movie lookups.
+A request resolves the same user and movie in its route decorator and again
+in the services it calls. Primary-key lookups are kept on flask.g for the rest
+of the request; every commit in the request clears them, so reads after a
+write see the new state.
+"""
+import copy
+
+from flask import g, has_request_context
+from sqlalchemy import event
+
+from config import IdentityCacheConfig
+from .database import db
+
+HEADER_NAME = 'X-Identity-Cache'
+
+
+class IdentityCache:
+    """Lookups memoized for one request, with hit and miss counters"""
+
+    __slots__ = ('entries', 'hits', 'misses')
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key, load):
+        """
+        Return a cached lookup result, loading and caching it on a miss.
+        Results (including None for missing rows) are returned as copies so
+        callers cannot change what later lookups see.
+
+        :param key: Hashable cache key, e.g. ('user', 3)
+        :param load: Callable performing the lookup
+        :return: Lookup result
+        """
+        if key in self.entries:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.entries[key] = load()
+        return copy.deepcopy(self.entries[key])
+
+    def clear(self):
+        """Forget every cached lookup, keeping the counters."""
+        self.entries.clear()
+
+
+def current_identity_cache():
+    """
+    Get the identity cache of the current request.
+
+    :return: IdentityCache, or None outside a request or when disabled
+    """
+    if not IdentityCacheConfig.ENABLED or not has_request_context():
+        return None
+    if 'identity_cache' not in g:
+        g.identity_cache = IdentityCache()
+    return g.identity_cache
+
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_after_commit(session):
+    """Clear the request's cached lookups once a write is committed"""
+    if has_request_context() and 'identity_cache' in g:
+        g.identity_cache.clear()
+
+
+def register_identity_cache(app):
+    """
+    Report identity cache hits and misses in a response header when the app
+    runs in debug mode or IDENTITY_CACHE_HEADER is set.
+
+    :param app: Flask application instance
+    """
+    @app.after_request
+    def add_identity_cache_header(response):
+        if not (app.debug or app.config.get('IDENTITY_CACHE_HEADER')):
+            return response
+
+        cache = g.get('identity_cache')
+        if cache is not None:
+            response.headers[HEADER_NAME] = f'hits={cache.hits}; misses={cache.misses}'
+        return response
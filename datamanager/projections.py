@@ -0,0 +1,112 @@
+"""
+Projections - Read-only column projections for list reads.
+Selects only the columns a model's to_dict() exposes and maps result tuples
+straight into dictionaries of the same shape, skipping ORM instance
+hydration, the identity map and datetime parsing/formatting.
+"""
+from sqlalchemy import String, select, type_coerce
+
+from .data_models import User, Movie, Review, TriviaScore, LeaderboardEntry
+
+
+def sqlite_timestamp_to_iso(value):
+    """
+    Convert a timestamp as stored by SQLite into datetime.isoformat() form.
+
+    SQLAlchemy stores DateTime as 'YYYY-MM-DD HH:MM:SS[.ffffff]'; isoformat()
+    uses a 'T' separator and omits an all-zero fraction.
+
+    :param value: Stored timestamp text (or None)
+    :return: ISO 8601 string or None
+    """
+    if not value:
+        return None
+    if value.endswith('.000000'):
+        value = value[:-7]
+    return f'{value[:10]}T{value[11:]}'
+
+
+def raw_timestamp(column):
+    """
+    Select a DateTime column as its stored text instead of a parsed datetime.
+
+    :param column: DateTime column
+    :return: Column expression labelled with the column's key
+    """
+    return type_coerce(column, String).label(column.key)
+
+
+class Projection:
+    """A fixed list of columns and how to turn result rows into dictionaries"""
+
+    __slots__ = ('columns', 'keys', 'converters')
+
+    def __init__(self, columns, converters=None):
+        """
+        Initialize projection.
+
+        :param columns: Column expressions to select, in output key order
+        :param converters: Optional mapping of output key to value converter
+        """
+        self.columns = tuple(columns)
+        self.keys = tuple(column.key for column in self.columns)
+        converters = converters or {}
+        self.converters = tuple((index, converters[key])
+                                for index, key in enumerate(self.keys) if key in converters)
+
+    def select(self):
+        """
+        Build a SELECT of the projected columns.
+
+        :return: SQLAlchemy Select statement
+        """
+        return select(*self.columns)
+
+    def to_dicts(self, rows):
+        """
+        Map result tuples to dictionaries.
+
+        :param rows: Iterable of result rows in projection column order
+        :return: List of dictionaries
+        """
+        keys, converters = self.keys, self.converters
+        if not converters:
+            return [dict(zip(keys, row)) for row in rows]
+
+        result = []
+        for row in rows:
+            values = list(row)
+            for index, convert in converters:
+                values[index] = convert(values[index])
+            result.append(dict(zip(keys, values)))
+        return result
+
+
+_TIMESTAMP = {'created_at': sqlite_timestamp_to_iso, 'updated_at': sqlite_timestamp_to_iso}
+
+USER = Projection((User.id, User.name, User.email))
+
+MOVIE = Projection((
+    Movie.id, Movie.title, Movie.director, Movie.year, Movie.rating,
+    Movie.genre, Movie.poster, Movie.user_id, Movie.review_count,
+    Movie.avg_reviewer_rating, Movie.total_likes, Movie.enrichment_status
+))
+
+REVIEW = Projection((
+    Review.id, Review.content, Review.reviewer_rating, Review.likes,
+    raw_timestamp(Review.created_at), raw_timestamp(Review.updated_at), Review.movie_id
+), _TIMESTAMP)
+
+TRIVIA_SCORE = Projection((
+    TriviaScore.id, TriviaScore.user_id, TriviaScore.trivia_type, TriviaScore.movie_id,
+    TriviaScore.score, TriviaScore.total_questions, TriviaScore.percentage,
+    TriviaScore.completion_time, raw_timestamp(TriviaScore.created_at)
+), _TIMESTAMP)
+
+LEADERBOARD = Projection((
+    LeaderboardEntry.score_id.label('id'), LeaderboardEntry.user_id,
+    LeaderboardEntry.trivia_type, LeaderboardEntry.movie_id, LeaderboardEntry.score,
+    LeaderboardEntry.total_questions, LeaderboardEntry.percentage,
+    LeaderboardEntry.completion_time, raw_timestamp(LeaderboardEntry.created_at),
+    User.name.label('user_name')
+), _TIMESTAMP)
@@ -1,35 +1,153 @@
-from config import LeaderboardConfig
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import (
+    bindparam, case, delete, func, insert, literal, select, text, union_all, update
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from config import LeaderboardConfig, SearchConfig, TriviaHistoryConfig
 from .data_manager_interface import DataManagerInterface
-from .data_models import User, Movie, Review, TriviaScore
+from .data_models import (
+    User, Movie, Review, TriviaScore, TriviaScoreRollup, TriviaQuestion, LeaderboardEntry,
+    normalize_title
+)
 from .database import db
+from .identity_cache import current_identity_cache
+from . import projections
+
+_ENTRY_COLUMNS = [
+    'board', 'board_movie_id', 'score_id', 'user_id', 'trivia_type', 'movie_id',
+    'score', 'total_questions', 'percentage', 'completion_time', 'created_at'
+]
+
+
+def _after(statement, id_column, after_id):
+    """Restrict a select statement to rows after a keyset cursor position"""
+    if after_id is None:
+        return statement
+    return statement.where(id_column > after_id)
+
+
+def _match_expression(query):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted phrase, so punctuation and FTS5 operators in
+    user input are matched literally; the last word also matches as a prefix
+    so partially typed words find results.
+
+    :param query: Search text as typed by the user
+    :return: MATCH expression, or None if the text has no words
+    """
+    words = query.split()
+    if not words:
+        return None
+    phrases = ['"{}"'.format(word.replace('"', '""')) for word in words]
+    phrases[-1] += '*'
+    return ' '.join(phrases)
+
+
+def _review_aggregates():
+    """
+    Correlated subqueries computing a movie's review aggregates from its reviews.
+
+    :return: Dictionary of Movie column name to scalar subquery
+    """
+    def aggregate(expression):
+        return select(expression).where(Review.movie_id == Movie.id).scalar_subquery()
+
+    return {
+        'review_count': aggregate(func.count(Review.id)),
+        'avg_reviewer_rating': aggregate(func.avg(Review.reviewer_rating)),
+        'total_likes': aggregate(func.coalesce(func.sum(Review.likes), 0)),
+    }
+
+
+def _leaderboard_order(model):
+    """Leaderboard ordering: best percentage, then score, then earliest attempt"""
+    tiebreak = model.score_id if model is LeaderboardEntry else model.id
+    return (model.percentage.desc(), model.score.desc(),
+            model.created_at.asc(), tiebreak.asc())
+
+
+def _score_columns():
+    """TriviaScore columns copied into a leaderboard entry, in _ENTRY_COLUMNS order"""
+    return (TriviaScore.id, TriviaScore.user_id, TriviaScore.trivia_type,
+            TriviaScore.movie_id, TriviaScore.score, TriviaScore.total_questions,
+            TriviaScore.percentage, TriviaScore.completion_time,
+            TriviaScore.created_at)
+
+
+def _rollup_columns():
+    """TriviaScoreRollup best-attempt columns labelled like _score_columns()"""
+    return (TriviaScoreRollup.best_score_id.label('id'), TriviaScoreRollup.user_id,
+            TriviaScoreRollup.trivia_type, TriviaScoreRollup.movie_id,
+            TriviaScoreRollup.best_score.label('score'),
+            TriviaScoreRollup.best_total_questions.label('total_questions'),
+            TriviaScoreRollup.best_percentage.label('percentage'),
+            TriviaScoreRollup.best_completion_time.label('completion_time'),
+            TriviaScoreRollup.best_created_at.label('created_at'))
+
+
+def _history_order(columns):
+    """Leaderboard ordering over the columns of a combined score history"""
+    return (columns.percentage.desc(), columns.score.desc(),
+            columns.created_at.asc(), columns.id.asc())
+
+
+def _hot_window_start(hot_window_days):
+    """
+    First moment of the month in which the hot window starts.
+
+    :param hot_window_days: Minimum age in days of scores that may be compacted
+    :return: Naive UTC datetime, matching how SQLite stores CURRENT_TIMESTAMP
+    """
+    start = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=hot_window_days)
+    return start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
 
 class SQLiteDataManager(DataManagerInterface):
     """SQLite implementation of the DataManagerInterface using SQLAlchemy ORM"""
 
-    def __init__(self):
-        pass
+    def __init__(self, session=None):
+        """
+        Initialize data manager.
+
+        :param session: SQLAlchemy session to use (defaults to the Flask app's
+                        scoped session)
+        """
+        self._session = session
+
+    @property
+    def session(self):
+        """Session used for all queries and writes"""
+        return self._session if self._session is not None else db.session
 
-    def get_all_users(self):
+    def get_all_users(self, after_id=None, limit=None):
         """
-        Return a list of all users.
+        Return users ordered by ID, optionally one keyset page at a time.
 
+        :param after_id: Only return users with an ID greater than this
+        :param limit: Maximum number of users to return (None for all)
         :return: List of user dictionaries
         """
-        users = User.query.all()
-        return [user.to_dict() for user in users]
+        statement = _after(projections.USER.select(), User.id, after_id)
+        rows = self.session.execute(statement.order_by(User.id).limit(limit))
+        return projections.USER.to_dicts(rows)
 
     def get_user_by_id(self, user_id):
         """
-        Return a specific user by ID.
+        Return a specific user by ID, memoized for the rest of the request.
 
         :param user_id: The ID of the user
         :return: User dictionary or None if not found
         """
-        user = User.query.get(user_id)
-        if user:
-            return user.to_dict()
-        return None
+        def load():
+            user = self.session.get(User, user_id)
+            return user.to_dict() if user else None
+
+        return self._cached_lookup(('user', user_id), load)
 
     def update_user(self, user_id, updated_data):
         """
@@ -39,46 +157,65 @@ class SQLiteDataManager(DataManagerInterface):
         :param updated_data: Dictionary containing updated user data
         :return: Dictionary representation of the updated user or None if not found
         """
-        user = User.query.get(user_id)
-        if not user:
-            return None
+        values = {field: value for field, value in updated_data.items()
+                  if field in {'name', 'email'}}
 
-        allowed_fields = {'name', 'email'}
-
-        for field, value in updated_data.items():
-            if field in allowed_fields:
-                setattr(user, field, value)
-
-        db.session.commit()
-        return user.to_dict()
+        user = self._update_returning(User, user_id, values)
+        result = user.to_dict() if user else None
+        self.session.commit()
+        return result
 
     def delete_user(self, user_id):
         """
-        Delete a user by ID.
+        Delete a user with their movies, reviews, trivia scores and rollups using
+        set-based DELETE statements in one transaction.
 
         :param user_id: The ID of the user to delete
         :return: True if deleted successfully, False if user not found
         """
-        user = User.query.get(user_id)
-        if not user:
+        if not self.session.get(User, user_id):
             return False
 
-        db.session.delete(user)
-        db.session.commit()
+        movie_ids = select(Movie.id).where(Movie.user_id == user_id)
+
+        # Boards of the user's movies disappear with them; boards the user
+        # merely placed on are rebuilt once their scores are gone
+        self._drop_leaderboard_entries(
+            (LeaderboardEntry.board == 'movie') &
+            LeaderboardEntry.board_movie_id.in_(movie_ids)
+        )
+        affected_boards = self._drop_leaderboard_entries(LeaderboardEntry.user_id == user_id)
+
+        try:
+            self.session.execute(delete(TriviaScore).where(TriviaScore.user_id == user_id))
+            self.session.execute(delete(TriviaScoreRollup)
+                                 .where(TriviaScoreRollup.user_id == user_id))
+            self._delete_movie_rows(movie_ids)
+            self.session.execute(delete(User).where(User.id == user_id))
+
+            for board, board_movie_id in affected_boards:
+                self._rebuild_board(board, board_movie_id)
+
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
 
         return True
 
-    def get_user_movies(self, user_id):
+    def get_user_movies(self, user_id, after_id=None, limit=None):
         """
-        Return a list of all movies for a specific user.
+        Return movies for a specific user ordered by ID, optionally one keyset page at a time.
 
         :param user_id: The ID of the user
+        :param after_id: Only return movies with an ID greater than this
+        :param limit: Maximum number of movies to return (None for all)
         :return: List of movie dictionaries for the user
         """
-        user = User.query.get(user_id)
-        if user:
-            return [movie.to_dict() for movie in user.movies]
-        return []
+        statement = _after(projections.MOVIE.select().where(Movie.user_id == user_id),
+                           Movie.id, after_id)
+        rows = self.session.execute(statement.order_by(Movie.id).limit(limit))
+        return projections.MOVIE.to_dicts(rows)
 
     def add_user(self, user_data):
         """
@@ -92,8 +229,8 @@ class SQLiteDataManager(DataManagerInterface):
             email=user_data.get('email')
         )
 
-        db.session.add(new_user)
-        db.session.commit()
+        self.session.add(new_user)
+        self.session.commit()
 
         return new_user.to_dict()
 
@@ -105,7 +242,7 @@ class SQLiteDataManager(DataManagerInterface):
         :param movie_data: Dictionary containing movie data
         :return: Dictionary representation of the created movie
         """
-        user = User.query.get(user_id)
+        user = self.session.get(User, user_id)
         if not user:
             raise ValueError(f"User with ID {user_id} not found")
 
@@ -116,16 +253,59 @@ class SQLiteDataManager(DataManagerInterface):
             rating=movie_data.get('rating') or movie_data.get('imdb_rating'),
             genre=movie_data.get('genre'),
             poster=movie_data.get('poster'),
+            enrichment_status=movie_data.get('enrichment_status'),
             user_id=user_id
         )
 
         try:
-            db.session.add(new_movie)
-            db.session.commit()
+            self.session.add(new_movie)
+            self.session.commit()
             return new_movie.to_dict()
         except Exception as e:
             print(f"Database error: {e}")
-            db.session.rollback()
+            self.session.rollback()
+            raise
+
+    def add_user_movies(self, user_id, movies_data):
+        """
+        Add several movies to a user's movie list in a single transaction.
+        Movies the collection already holds (e.g. added concurrently since the
+        caller checked for duplicates) are skipped instead of failing the batch.
+
+        :param user_id: The ID of the user
+        :param movies_data: List of dictionaries containing movie data, none
+                            sharing a normalized title and year
+        :return: List in input order of dictionaries of the created movies,
+                 with None for each skipped duplicate
+        """
+        user = self.session.get(User, user_id)
+        if not user:
+            raise ValueError(f"User with ID {user_id} not found")
+
+        rows = [{
+            'title': movie_data.get('title'),
+            'normalized_title': normalize_title(movie_data.get('title')),
+            'director': movie_data.get('director'),
+            'year': movie_data.get('year'),
+            'rating': movie_data.get('rating') or movie_data.get('imdb_rating'),
+            'genre': movie_data.get('genre'),
+            'poster': movie_data.get('poster'),
+            'user_id': user_id
+        } for movie_data in movies_data]
+
+        try:
+            # One multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING; skipped
+            # rows return nothing, so results are matched back by title and year
+            new_movies = self.session.scalars(
+                sqlite_insert(Movie).on_conflict_do_nothing().returning(Movie), rows
+            ).all()
+            created = {(movie.normalized_title, movie.year or 0): movie.to_dict()
+                       for movie in new_movies}
+            self.session.commit()
+            return [created.get((row['normalized_title'], row['year'] or 0)) for row in rows]
+        except Exception as e:
+            print(f"Database error: {e}")
+            self.session.rollback()
             raise
 
     def add_movie(self, movie_data):
@@ -137,7 +317,7 @@ class SQLiteDataManager(DataManagerInterface):
         """
         user_id = movie_data.get('user_id')
         if user_id:
-            user = User.query.get(user_id)
+            user = self.session.get(User, user_id)
             if not user:
                 raise ValueError(f"User with ID {user_id} not found")
 
@@ -151,11 +331,55 @@ class SQLiteDataManager(DataManagerInterface):
             user_id=user_id
         )
 
-        db.session.add(new_movie)
-        db.session.commit()
+        self.session.add(new_movie)
+        self.session.commit()
 
         return new_movie.to_dict()
 
+    def movie_exists(self, user_id, title, year=None, exclude_movie_id=None):
+        """
+        Check whether a user's collection already holds a title for a year.
+
+        Titles are compared normalized (case and whitespace insensitive), as
+        one probe of the unique (user_id, normalized_title, year) index.
+
+        :param user_id: The ID of the user
+        :param title: Movie title
+        :param year: Movie year (or None)
+        :param exclude_movie_id: Movie ID to ignore (the movie being updated)
+        :return: True if a matching movie exists
+        """
+        query = self.session.query(Movie.id).filter(
+            Movie.user_id == user_id,
+            Movie.normalized_title == normalize_title(title),
+            func.coalesce(Movie.year, 0) == (year or 0)
+        )
+        if exclude_movie_id is not None:
+            query = query.filter(Movie.id != exclude_movie_id)
+        return query.first() is not None
+
+    def get_movie_with_owner(self, movie_id):
+        """
+        Return a movie and its owning user in a single primary-key query,
+        memoized for the rest of the request.
+
+        :param movie_id: The ID of the movie
+        :return: Tuple of (movie dictionary, user dictionary) or None if not found
+        """
+        def load():
+            row = (self.session.query(Movie, User)
+                   .join(User, Movie.user_id == User.id)
+                   .filter(Movie.id == movie_id)
+                   .first())
+
+            if not row:
+                return None
+
+            movie, user = row
+            return movie.to_dict(), user.to_dict()
+
+        return self._cached_lookup(('movie_with_owner', movie_id), load)
+
     def update_movie(self, movie_id, updated_data):
         """
         Update a movie by ID with new data.
@@ -164,121 +388,297 @@ class SQLiteDataManager(DataManagerInterface):
         :param updated_data: Dictionary containing updated movie data
         :return: Dictionary representation of the updated movie or None if not found
         """
-        movie = Movie.query.get(movie_id)
-        if not movie:
-            return None
+        values = {field: value for field, value in updated_data.items()
+                  if field in {'title', 'director', 'year', 'rating', 'genre', 'poster'}}
+        if 'title' in values:
+            values['normalized_title'] = normalize_title(values['title'])
 
-        allowed_fields = {'title', 'director', 'year', 'rating', 'genre', 'poster'}
+        try:
+            movie = self._update_returning(Movie, movie_id, values)
+            result = movie.to_dict() if movie else None
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return result
 
-        for field, value in updated_data.items():
-            if field in allowed_fields:
-                setattr(movie, field, value)
+    def apply_movie_enrichment(self, movie_id, enrichment, status):
+        """
+        Record the outcome of background enrichment in one UPDATE. Enriched
+        fields only fill columns that are still blank, so edits the user made
+        while enrichment was running win.
 
-        db.session.commit()
-        return movie.to_dict()
+        :param movie_id: The ID of the movie
+        :param enrichment: Dictionary of director, genre, poster and rating found
+        :param status: New enrichment status
+        :return: Dictionary representation of the updated movie or None if not found
+        """
+        values = {'enrichment_status': status}
+        for field in ('director', 'genre', 'poster', 'rating'):
+            if enrichment.get(field):
+                column = getattr(Movie, field)
+                blank = column.is_(None) if field == 'rating' else func.coalesce(column, '') == ''
+                values[field] = case((blank, enrichment[field]), else_=column)
+
+        try:
+            movie = self._update_returning(Movie, movie_id, values)
+            result = movie.to_dict() if movie else None
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return result
+
+    def get_pending_enrichment_movies(self, limit=None):
+        """
+        Return movies still waiting for background enrichment, oldest first.
+
+        :param limit: Maximum number of movies to return (None for all)
+        :return: List of movie dictionaries
+        """
+        rows = self.session.execute(
+            projections.MOVIE.select()
+            .where(Movie.enrichment_status == 'pending')
+            .order_by(Movie.id)
+            .limit(limit)
+        )
+        return projections.MOVIE.to_dicts(rows)
 
     def delete_movie(self, movie_id):
         """
-        Delete a movie by ID.
+        Delete a movie and its reviews using set-based statements. Trivia
+        scores for the movie are kept with movie_id cleared.
 
         :param movie_id: The ID of the movie to delete
         :return: True if deleted successfully, False if movie not found
         """
-        movie = Movie.query.get(movie_id)
-        if not movie:
+        if not self.session.get(Movie, movie_id):
             return False
 
-        db.session.delete(movie)
-        db.session.commit()
+        self._drop_leaderboard_entries(
+            (LeaderboardEntry.board == 'movie') &
+            (LeaderboardEntry.board_movie_id == movie_id)
+        )
+
+        try:
+            self._delete_movie_rows([movie_id])
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
 
         return True
 
     def add_review(self, movie_id, review_data):
         """
-        Add a review to a movie.
+        Add a review to a movie and refresh the movie's review aggregates.
 
         :param movie_id: The ID of the movie to review
         :param review_data: Dictionary containing review data
         :return: Dictionary representation of the created review
         """
-        movie = Movie.query.get(movie_id)
-        if not movie:
-            raise ValueError(f"Movie with ID {movie_id} not found")
-
         new_review = Review(
             content=review_data.get('content'),
             reviewer_rating=review_data.get('reviewer_rating'),
             movie_id=movie_id
         )
 
-        db.session.add(new_review)
-        db.session.commit()
+        self.session.add(new_review)
+        self.session.flush()
+        # Refreshing the aggregates doubles as the existence check for the movie
+        if not self._refresh_review_aggregates(movie_id):
+            self.session.rollback()
+            raise ValueError(f"Movie with ID {movie_id} not found")
+
+        self.session.commit()
         return new_review.to_dict()
 
-    def get_movie_reviews(self, movie_id):
+    def get_movie_reviews(self, movie_id, after_id=None, limit=None):
         """
-        Get all reviews for a specific movie.
+        Get reviews for a specific movie ordered by ID, optionally one keyset page at a time.
 
         :param movie_id: The ID of the movie
+        :param after_id: Only return reviews with an ID greater than this
+        :param limit: Maximum number of reviews to return (None for all)
         :return: List of review dictionaries
         """
-        reviews = Review.query.filter_by(movie_id=movie_id).all()
-        return [review.to_dict() for review in reviews]
+        statement = _after(projections.REVIEW.select().where(Review.movie_id == movie_id),
+                           Review.id, after_id)
+        rows = self.session.execute(statement.order_by(Review.id).limit(limit))
+        return projections.REVIEW.to_dicts(rows)
 
-    def like_review(self, review_id):
+    def search(self, query, user_id=None, offset=0, limit=None):
+        """
+        Full-text search over movie titles, directors, genres and review
+        content, best matches first.
+
+        :param query: Search text
+        :param user_id: Only search this user's movies and their reviews
+        :param offset: Number of ranked results to skip
+        :param limit: Maximum number of results to return (None for all)
+        :return: List of result dictionaries with type ('movie' or 'review'),
+                 id, movie_id, user_id, title, snippet and rank
         """
-        Increment likes for a review.
+        match = _match_expression(query)
+        if match is None:
+            return []
+
+        title_weight, director_weight, genre_weight = SearchConfig.MOVIE_COLUMN_WEIGHTS
+        owner_filter = 'AND movies.user_id = :user_id' if user_id is not None else ''
+        statement = text(f"""
+            SELECT 'movie' AS type, movies.id AS id, movies.id AS movie_id,
+                   movies.user_id AS user_id, movies.title AS title,
+                   snippet(movies_fts, -1, '', '', '…', :tokens) AS snippet,
+                   bm25(movies_fts, {title_weight}, {director_weight}, {genre_weight}) AS rank
+            FROM movies_fts JOIN movies ON movies.id = movies_fts.rowid
+            WHERE movies_fts MATCH :match {owner_filter}
+            UNION ALL
+            SELECT 'review', reviews.id, reviews.movie_id, movies.user_id, movies.title,
+                   snippet(reviews_fts, 0, '', '', '…', :tokens), bm25(reviews_fts)
+            FROM reviews_fts
+            JOIN reviews ON reviews.id = reviews_fts.rowid
+            JOIN movies ON movies.id = reviews.movie_id
+            WHERE reviews_fts MATCH :match {owner_filter}
+            ORDER BY rank, type, id
+            LIMIT :limit OFFSET :offset
+        """)
+
+        rows = self.session.execute(statement, {
+            'match': match,
+            'user_id': user_id,
+            'tokens': SearchConfig.SNIPPET_TOKENS,
+            'limit': -1 if limit is None else limit,
+            'offset': offset
+        })
+        return [dict(row._mapping) for row in rows]
+
+    def get_review_by_id(self, review_id):
+        """
+        Return a specific review by ID.
 
-        :param review_id: The ID of the review to like
-        :return: Dictionary representation of the updated review or None if not found
+        :param review_id: The ID of the review
+        :return: Review dictionary or None if not found
         """
-        review = Review.query.get(review_id)
+        review = self.session.get(Review, review_id)
         if review:
-            review.likes += 1
-            db.session.commit()
             return review.to_dict()
         return None
 
-    def update_review(self, review_id, updated_data):
+    def like_review(self, review_id):
         """
-        Update a review by ID.
+        Atomically increment likes for a review (UPDATE ... SET likes = likes + 1).
 
-        :param review_id: The ID of the review to update
-        :param updated_data: Dictionary containing updated review data
+        :param review_id: The ID of the review to like
         :return: Dictionary representation of the updated review or None if not found
         """
-        review = Review.query.get(review_id)
+        review = self.session.scalars(
+            update(Review)
+            .where(Review.id == review_id)
+            .values(likes=func.coalesce(Review.likes, 0) + 1)
+            .returning(Review)
+        ).first()
         if not review:
+            self.session.rollback()
             return None
 
-        allowed_fields = {'content', 'reviewer_rating'}
+        self.session.execute(
+            update(Movie)
+            .where(Movie.id == review.movie_id)
+            .values(total_likes=Movie.total_likes + 1)
+        )
+        result = review.to_dict()
+        self.session.commit()
+        return result
+
+    def add_review_likes(self, deltas):
+        """
+        Atomically add buffered likes to many reviews in one transaction.
+
+        :param deltas: Dictionary mapping review ID to the number of likes to add
+        :return: Number of reviews updated
+        """
+        if not deltas:
+            return 0
+
+        parameters = [{'review_id': review_id, 'delta': delta}
+                      for review_id, delta in deltas.items()]
+        result = self.session.execute(
+            update(Review.__table__)
+            .where(Review.id == bindparam('review_id'))
+            .values(likes=func.coalesce(Review.likes, 0) + bindparam('delta')),
+            parameters
+        )
+        self.session.execute(
+            update(Movie.__table__)
+            .where(Movie.id == select(Review.movie_id)
+                   .where(Review.id == bindparam('review_id'))
+                   .scalar_subquery())
+            .values(total_likes=Movie.total_likes + bindparam('delta')),
+            parameters
+        )
+        self.session.commit()
+        return result.rowcount
 
-        for field, value in updated_data.items():
-            if field in allowed_fields:
-                setattr(review, field, value)
+    def update_review(self, review_id, updated_data):
+        """
+        Update a review by ID.
+
+        :param review_id: The ID of the review to update
+        :param updated_data: Dictionary containing updated review data
+        :return: Dictionary representation of the updated review or None if not found
+        """
+        values = {field: value for field, value in updated_data.items()
+                  if field in {'content', 'reviewer_rating'}}
+        values['updated_at'] = func.current_timestamp()
 
-        review.updated_at = db.func.current_timestamp()
-        db.session.commit()
-        return review.to_dict()
+        review = self._update_returning(Review, review_id, values)
+        if review and 'reviewer_rating' in values:
+            self._refresh_review_aggregates(review.movie_id)
+        result = review.to_dict() if review else None
+        self.session.commit()
+        return result
 
     def delete_review(self, review_id):
         """
-        Delete a review by ID.
+        Delete a review by ID and refresh its movie's review aggregates.
 
         :param review_id: The ID of the review to delete
         :return: True if deleted successfully, False if review not found
         """
-        review = Review.query.get(review_id)
-        if not review:
+        movie_id = self.session.scalars(
+            delete(Review).where(Review.id == review_id).returning(Review.movie_id)
+        ).first()
+        if movie_id is None:
+            self.session.rollback()
             return False
 
-        db.session.delete(review)
-        db.session.commit()
+        self._refresh_review_aggregates(movie_id)
+        self.session.commit()
         return True
 
+    def reconcile_review_aggregates(self):
+        """
+        Recompute every movie's review aggregates from its reviews, fixing
+        any that drifted.
+
+        :return: Number of movies whose aggregates were corrected
+        """
+        aggregates = _review_aggregates()
+        result = self.session.execute(
+            update(Movie)
+            .where(Movie.review_count.is_distinct_from(aggregates['review_count']) |
+                   Movie.avg_reviewer_rating.is_distinct_from(aggregates['avg_reviewer_rating']) |
+                   Movie.total_likes.is_distinct_from(aggregates['total_likes']))
+            .values(**aggregates)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount
+
     def save_trivia_score(self, score_data):
         """
-        Save a trivia score to the database.
+        Save a trivia score and update the materialized leaderboards in the
+        same transaction.
 
         :param score_data: Dictionary containing trivia score data
         :return: Dictionary representation of the saved trivia score
@@ -293,8 +693,10 @@ class SQLiteDataManager(DataManagerInterface):
             completion_time=score_data.get('completion_time')
         )
 
-        db.session.add(new_score)
-        db.session.commit()
+        self.session.add(new_score)
+        self.session.flush()
+        self._record_leaderboard_score(new_score)
+        self.session.commit()
         return new_score.to_dict()
 
     def get_global_leaderboard(self, limit=10):
@@ -304,23 +706,7 @@ class SQLiteDataManager(DataManagerInterface):
         :param limit: Maximum number of entries to return
         :return: List of leaderboard entries with user information
         """
-        scores = (db.session.query(TriviaScore, User)
-                  .join(User)
-                  .order_by(
-                      TriviaScore.percentage.desc(),
-                      TriviaScore.score.desc(),
-                      TriviaScore.created_at.asc()
-                  )
-                  .limit(limit)
-                  .all())
-
-        leaderboard = []
-        for score, user in scores:
-            entry = score.to_dict()
-            entry['user_name'] = user.name
-            leaderboard.append(entry)
-
-        return leaderboard
+        return self._read_leaderboard('global', limit)
 
     def get_movie_leaderboard(self, movie_id, limit=10):
         """
@@ -330,27 +716,7 @@ class SQLiteDataManager(DataManagerInterface):
         :param limit: Maximum number of entries to return
         :return: List of leaderboard entries for the specific movie
         """
-        scores = (db.session.query(TriviaScore, User)
-                  .join(User)
-                  .filter(
-                      TriviaScore.movie_id == movie_id,
-                      TriviaScore.trivia_type == 'movie'
-                  )
-                  .order_by(
-                      TriviaScore.percentage.desc(),
-                      TriviaScore.score.desc(),
-                      TriviaScore.created_at.asc()
-                  )
-                  .limit(limit)
-                  .all())
-
-        leaderboard = []
-        for score, user in scores:
-            entry = score.to_dict()
-            entry['user_name'] = user.name
-            leaderboard.append(entry)
-
-        return leaderboard
+        return self._read_leaderboard('movie', limit, board_movie_id=movie_id)
 
     def get_collection_leaderboard(self, limit=10):
         """
@@ -359,35 +725,454 @@ class SQLiteDataManager(DataManagerInterface):
         :param limit: Maximum number of entries to return
         :return: List of leaderboard entries for collection trivia
         """
-        scores = (db.session.query(TriviaScore, User)
-                  .join(User)
-                  .filter(TriviaScore.trivia_type == 'collection')
-                  .order_by(
-                      TriviaScore.percentage.desc(),
-                      TriviaScore.score.desc(),
-                      TriviaScore.created_at.asc()
-                  )
-                  .limit(limit)
-                  .all())
-
-        leaderboard = []
-        for score, user in scores:
-            entry = score.to_dict()
-            entry['user_name'] = user.name
-            leaderboard.append(entry)
-
-        return leaderboard
+        return self._read_leaderboard('collection', limit)
+
+    def rebuild_leaderboards(self):
+        """
+        Regenerate every materialized leaderboard from trivia score history.
+
+        :return: Number of leaderboard entries written
+        """
+        self.session.query(LeaderboardEntry).delete(synchronize_session=False)
+
+        self._insert_board_from_history('global')
+        self._insert_board_from_history('collection')
+        self._insert_movie_boards_from_history()
+
+        self.session.commit()
+        return self.session.query(LeaderboardEntry).count()
+
+    def compact_trivia_scores(self, hot_window_days=None):
+        """
+        Fold trivia scores older than the hot window into monthly rollups per
+        user, trivia type and movie, and delete them from trivia_scores, in one
+        transaction. Only whole months before the month the window starts in
+        are compacted.
+
+        :param hot_window_days: Days of raw scores to keep (defaults to
+                                TriviaHistoryConfig.HOT_WINDOW_DAYS)
+        :return: Number of trivia scores compacted
+        """
+        if hot_window_days is None:
+            hot_window_days = TriviaHistoryConfig.HOT_WINDOW_DAYS
+        cutoff = _hot_window_start(hot_window_days)
+
+        month = func.strftime('%Y-%m', TriviaScore.created_at)
+        group = (TriviaScore.user_id, TriviaScore.trivia_type, TriviaScore.movie_id, month)
+        band = func.min(TriviaScore.percentage // 10, 9)
+
+        ranked = (select(
+                      month.label('month'), TriviaScore.user_id, TriviaScore.trivia_type,
+                      TriviaScore.movie_id,
+                      func.count().over(partition_by=group).label('attempts'),
+                      func.sum(TriviaScore.percentage).over(partition_by=group)
+                      .label('percentage_sum'),
+                      func.json_array(*[
+                          func.sum(case((band == index, 1), else_=0)).over(partition_by=group)
+                          for index in range(10)
+                      ]).label('histogram'),
+                      *_score_columns(),
+                      func.row_number().over(
+                          partition_by=group,
+                          order_by=_leaderboard_order(TriviaScore)
+                      ).label('group_rank'))
+                  .where(TriviaScore.created_at < cutoff)
+                  .subquery())
+
+        # The first row of each group in leaderboard order is its best attempt
+        query = (select(ranked.c.month, ranked.c.user_id, ranked.c.trivia_type,
+                        ranked.c.movie_id, ranked.c.attempts, ranked.c.percentage_sum,
+                        ranked.c.percentage, ranked.c.histogram, ranked.c.id,
+                        ranked.c.score, ranked.c.total_questions,
+                        ranked.c.completion_time, ranked.c.created_at)
+                 .where(ranked.c.group_rank == 1))
+
+        try:
+            self.session.execute(insert(TriviaScoreRollup).from_select([
+                'month', 'user_id', 'trivia_type', 'movie_id', 'attempts',
+                'percentage_sum', 'best_percentage', 'histogram', 'best_score_id',
+                'best_score', 'best_total_questions', 'best_completion_time',
+                'best_created_at'
+            ], query))
+            compacted = self.session.execute(
+                delete(TriviaScore)
+                .where(TriviaScore.created_at < cutoff)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return compacted
+
+    def draw_trivia_questions(self, title, year, count):
+        """
+        Draw a random set of banked trivia questions for a movie.
+
+        :param title: Movie title
+        :param year: Movie year (None when unknown)
+        :param count: Number of questions to draw
+        :return: Tuple of (list of question dictionaries, questions banked for the movie)
+        """
+        rows = self.session.execute(
+            select(TriviaQuestion.question, TriviaQuestion.options, TriviaQuestion.correct,
+                   TriviaQuestion.difficulty, func.count().over())
+            .where(TriviaQuestion.title_key == normalize_title(title),
+                   TriviaQuestion.year == (year or 0))
+            .order_by(func.random())
+            .limit(count)
+        ).all()
+
+        questions = [{'question': question, 'options': json.loads(options),
+                      'correct': correct, 'difficulty': difficulty}
+                     for question, options, correct, difficulty, _ in rows]
+        return questions, rows[0][-1] if rows else 0
+
+    def add_trivia_questions(self, title, year, questions, source):
+        """
+        Add generated trivia questions to a movie's question bank, skipping
+        questions already banked for the movie.
+
+        :param title: Movie title
+        :param year: Movie year (None when unknown)
+        :param questions: List of question dictionaries (question, options,
+                          correct, difficulty)
+        :param source: API that generated the questions
+        :return: Number of questions added
+        """
+        rows = [{
+            'title_key': normalize_title(title),
+            'year': year or 0,
+            'question': question['question'],
+            'question_key': normalize_title(question['question']),
+            'options': json.dumps(question['options']),
+            'correct': question['correct'],
+            'difficulty': question.get('difficulty'),
+            'source': source
+        } for question in questions]
+        if not rows:
+            return 0
+
+        try:
+            added = self.session.execute(
+                insert(TriviaQuestion.__table__).prefix_with('OR IGNORE'), rows
+            ).rowcount
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return added
+
+    def count_trivia_questions(self, title, year):
+        """
+        Count the trivia questions banked for a movie.
+
+        :param title: Movie title
+        :param year: Movie year (None when unknown)
+        :return: Number of banked questions
+        """
+        return self.session.execute(
+            select(func.count())
+            .where(TriviaQuestion.title_key == normalize_title(title),
+                   TriviaQuestion.year == (year or 0))
+        ).scalar_one()
+
+    def get_movies_needing_trivia(self, min_questions, limit=None):
+        """
+        Find movies whose question bank is thin, one movie per canonical title
+        and year, those in the most collections first.
+
+        :param min_questions: Banked questions a movie needs to be covered
+        :param limit: Maximum number of movies to return (None for all)
+        :return: List of movie dictionaries
+        """
+        year_key = func.coalesce(Movie.year, 0)
+        banks = (select(TriviaQuestion.title_key, TriviaQuestion.year,
+                        func.count().label('banked'))
+                 .group_by(TriviaQuestion.title_key, TriviaQuestion.year)
+                 .subquery())
+        thin = (select(func.min(Movie.id).label('id'), func.count(Movie.id).label('owners'))
+                .outerjoin(banks, (banks.c.title_key == Movie.normalized_title) &
+                           (banks.c.year == year_key))
+                .group_by(Movie.normalized_title, year_key)
+                .having(func.coalesce(func.max(banks.c.banked), 0) < min_questions)
+                .subquery())
+
+        rows = self.session.execute(
+            projections.MOVIE.select()
+            .join(thin, thin.c.id == Movie.id)
+            .order_by(thin.c.owners.desc(), Movie.id)
+            .limit(limit)
+        )
+        return projections.MOVIE.to_dicts(rows)
+
+    def _cached_lookup(self, key, load):
+        """
+        Run a primary-key lookup through the request's identity cache. Managers
+        bound to their own session bypass it, since their writes do not commit
+        through the app session that clears it.
+
+        :param key: Cache key identifying the lookup
+        :param load: Callable performing the lookup
+        :return: Lookup result
+        """
+        cache = current_identity_cache() if self._session is None else None
+        if cache is None:
+            return load()
+        return cache.get_or_load(key, load)
+
+    def _refresh_review_aggregates(self, movie_id):
+        """
+        Recompute one movie's review aggregates in a single UPDATE. Callers commit.
+
+        :param movie_id: The ID of the movie
+        :return: Number of movies updated (0 if the movie does not exist)
+        """
+        return self.session.execute(
+            update(Movie)
+            .where(Movie.id == movie_id)
+            .values(**_review_aggregates())
+            .execution_options(synchronize_session='fetch')
+        ).rowcount
+
+    def _update_returning(self, model, object_id, values):
+        """
+        Update one row by primary key and load its new state in a single
+        UPDATE ... RETURNING statement. Callers commit.
+
+        :param model: Model class to update
+        :param object_id: Primary key of the row
+        :param values: Dictionary of column values to set (may be empty)
+        :return: Updated model instance or None if not found
+        """
+        if not values:
+            return self.session.get(model, object_id)
+
+        return self.session.scalars(
+            update(model)
+            .where(model.id == object_id)
+            .values(**values)
+            .returning(model)
+        ).first()
+
+    def _read_leaderboard(self, board, limit, board_movie_id=0):
+        """
+        Read a materialized leaderboard, capped at the materialized size.
+
+        :param board: Leaderboard name ('global', 'collection' or 'movie')
+        :param limit: Maximum number of entries to return
+        :param board_movie_id: Movie ID for movie leaderboards
+        :return: List of leaderboard entries with user information
+        """
+        limit = min(limit, LeaderboardConfig.MATERIALIZED_SIZE)
+
+        rows = self.session.execute(
+            projections.LEADERBOARD.select()
+            .join(User, LeaderboardEntry.user_id == User.id)
+            .where(
+                LeaderboardEntry.board == board,
+                LeaderboardEntry.board_movie_id == board_movie_id
+            )
+            .order_by(*_leaderboard_order(LeaderboardEntry))
+            .limit(limit)
+        )
+        return projections.LEADERBOARD.to_dicts(rows)
+
+    def _leaderboard_boards(self, trivia_score):
+        """
+        Get the leaderboards a trivia score competes on.
+
+        :param trivia_score: TriviaScore instance
+        :return: List of (board, board_movie_id) tuples
+        """
+        boards = [('global', 0)]
+        if trivia_score.trivia_type == 'collection':
+            boards.append(('collection', 0))
+        elif trivia_score.trivia_type == 'movie' and trivia_score.movie_id:
+            boards.append(('movie', trivia_score.movie_id))
+        return boards
+
+    def _record_leaderboard_score(self, trivia_score):
+        """
+        Insert a new score into each leaderboard it makes, evicting the lowest
+        entry once a board is full. Callers commit.
+
+        :param trivia_score: Flushed TriviaScore instance
+        :return: None
+        """
+        size = LeaderboardConfig.MATERIALIZED_SIZE
+
+        for board, board_movie_id in self._leaderboard_boards(trivia_score):
+            entry = LeaderboardEntry.from_score(board, trivia_score, board_movie_id)
+            board_query = self.session.query(LeaderboardEntry).filter_by(
+                board=board, board_movie_id=board_movie_id
+            )
+
+            if board_query.count() >= size:
+                lowest = board_query.order_by(
+                    LeaderboardEntry.percentage.asc(),
+                    LeaderboardEntry.score.asc(),
+                    LeaderboardEntry.created_at.desc(),
+                    LeaderboardEntry.score_id.desc()
+                ).first()
+                if entry.rank_key() >= lowest.rank_key():
+                    continue
+                self.session.delete(lowest)
+
+            self.session.add(entry)
+
+    def _drop_leaderboard_entries(self, condition):
+        """
+        Delete leaderboard entries matching a condition. Callers commit.
+
+        :param condition: SQLAlchemy filter on LeaderboardEntry
+        :return: Set of (board, board_movie_id) tuples that lost entries
+        """
+        affected_boards = set(
+            self.session.query(LeaderboardEntry.board, LeaderboardEntry.board_movie_id)
+            .filter(condition)
+            .distinct()
+            .all()
+        )
+        self.session.query(LeaderboardEntry).filter(condition).delete(synchronize_session=False)
+        return affected_boards
+
+    def _delete_movie_rows(self, movie_ids):
+        """
+        Delete movies and their reviews, detaching trivia scores, rollups and
+        leaderboard entries that mention them. Callers commit.
+
+        :param movie_ids: List of movie IDs or a select statement producing them
+        :return: None
+        """
+        # Scores outlive their movie with movie_id nulled; keep entries in step
+        self.session.execute(delete(Review).where(Review.movie_id.in_(movie_ids)))
+        self.session.execute(update(TriviaScore)
+                           .where(TriviaScore.movie_id.in_(movie_ids))
+                           .values(movie_id=None))
+        self.session.execute(update(TriviaScoreRollup)
+                           .where(TriviaScoreRollup.movie_id.in_(movie_ids))
+                           .values(movie_id=None))
+        self.session.execute(update(LeaderboardEntry)
+                           .where(LeaderboardEntry.movie_id.in_(movie_ids))
+                           .values(movie_id=None))
+        self.session.execute(delete(Movie).where(Movie.id.in_(movie_ids)))
+
+    def _rebuild_board(self, board, board_movie_id=0):
+        """
+        Regenerate a single leaderboard from history. Callers commit.
+
+        :param board: Leaderboard name ('global', 'collection' or 'movie')
+        :param board_movie_id: Movie ID for movie leaderboards
+        :return: None
+        """
+        (self.session.query(LeaderboardEntry)
+         .filter_by(board=board, board_movie_id=board_movie_id)
+         .delete(synchronize_session=False))
+        self._insert_board_from_history(board, board_movie_id)
+
+    def _insert_board_from_history(self, board, board_movie_id=0):
+        """
+        Copy the top trivia scores for one leaderboard into leaderboard_entries,
+        drawing on both hot scores and the best attempts kept in rollups.
+
+        :param board: Leaderboard name ('global', 'collection' or 'movie')
+        :param board_movie_id: Movie ID for movie leaderboards
+        :return: None
+        """
+        branches = []
+        for model, columns in ((TriviaScore, _score_columns()),
+                               (TriviaScoreRollup, _rollup_columns())):
+            branch = (select(literal(board).label('board'),
+                             literal(board_movie_id).label('board_movie_id'), *columns)
+                      .join(User, model.user_id == User.id))
+
+            if board == 'collection':
+                branch = branch.where(model.trivia_type == 'collection')
+            elif board == 'movie':
+                branch = branch.where(model.movie_id == board_movie_id,
+                                      model.trivia_type == 'movie')
+            branches.append(branch)
+
+        # Both branches walk a rank index in order, so SQLite merges them and
+        # stops after the board is full instead of sorting the history
+        history = union_all(*branches)
+        query = (history.order_by(*_history_order(history.selected_columns))
+                 .limit(LeaderboardConfig.MATERIALIZED_SIZE))
+
+        self.session.execute(
+            insert(LeaderboardEntry).from_select(_ENTRY_COLUMNS, query)
+        )
+
+    def _insert_movie_boards_from_history(self):
+        """
+        Copy the top trivia scores of every movie leaderboard in one statement,
+        from both hot scores and rollups.
+
+        :return: None
+        """
+        history = union_all(*[
+            select(*columns)
+            .join(User, model.user_id == User.id)
+            .where(model.trivia_type == 'movie', model.movie_id.isnot(None))
+            for model, columns in ((TriviaScore, _score_columns()),
+                                   (TriviaScoreRollup, _rollup_columns()))
+        ]).subquery()
+
+        ranked = select(
+            *history.c,
+            func.row_number().over(
+                partition_by=history.c.movie_id,
+                order_by=_history_order(history.c)
+            ).label('board_rank')
+        ).subquery()
+
+        query = (select(literal('movie'), ranked.c.movie_id,
+                        *[ranked.c[column.key] for column in _score_columns()])
+                 .where(ranked.c.board_rank <= LeaderboardConfig.MATERIALIZED_SIZE))
+
+        self.session.execute(
+            insert(LeaderboardEntry).from_select(_ENTRY_COLUMNS, query)
+        )
 
     def get_user_trivia_stats(self, user_id):
         """
-        Get trivia statistics for a specific user.
+        Get trivia statistics for a specific user, combining hot scores with
+        monthly rollups of compacted ones. Recent scores come from hot scores.
 
         :param user_id: The ID of the user
         :return: Dictionary containing comprehensive user trivia statistics
         """
-        stats = TriviaScore.query.filter(TriviaScore.user_id == user_id).all()
+        def attempts_of(trivia_type, model, attempts):
+            return func.sum(case((model.trivia_type == trivia_type, attempts), else_=0))
+
+        history = union_all(
+            select(func.count(TriviaScore.id).label('attempts'),
+                   func.max(TriviaScore.percentage).label('best'),
+                   func.sum(TriviaScore.percentage).label('percentage_sum'),
+                   attempts_of('movie', TriviaScore, 1).label('movie_attempts'),
+                   attempts_of('collection', TriviaScore, 1).label('collection_attempts'))
+            .where(TriviaScore.user_id == user_id),
+            select(func.sum(TriviaScoreRollup.attempts),
+                   func.max(TriviaScoreRollup.best_percentage),
+                   func.sum(TriviaScoreRollup.percentage_sum),
+                   attempts_of('movie', TriviaScoreRollup, TriviaScoreRollup.attempts),
+                   attempts_of('collection', TriviaScoreRollup, TriviaScoreRollup.attempts))
+            .where(TriviaScoreRollup.user_id == user_id)
+        ).subquery()
+
+        total_attempts, best_score, percentage_sum, movie_attempts, collection_attempts = (
+            self.session.execute(select(
+                func.coalesce(func.sum(history.c.attempts), 0),
+                func.max(history.c.best),
+                func.sum(history.c.percentage_sum),
+                func.sum(history.c.movie_attempts),
+                func.sum(history.c.collection_attempts)
+            )).one()
+        )
 
-        if not stats:
+        if not total_attempts:
             return {
                 'total_attempts': 0,
                 'best_score': 0,
@@ -396,16 +1181,15 @@ class SQLiteDataManager(DataManagerInterface):
                 'collection_attempts': 0
             }
 
-        total_attempts = len(stats)
-        movie_attempts = len([s for s in stats if s.trivia_type == 'movie'])
-        collection_attempts = len([s for s in stats if s.trivia_type == 'collection'])
-        best_score = max(s.percentage for s in stats)
-        average_score = round(sum(s.percentage for s in stats) / total_attempts)
+        average_score = round(percentage_sum / total_attempts)
 
         recent_limit = LeaderboardConfig.USER_STATS_RECENT_LIMIT
-        recent_scores = [s.to_dict() for s in sorted(
-            stats, key=lambda x: x.created_at, reverse=True
-        )[:recent_limit]]
+        recent_scores = projections.TRIVIA_SCORE.to_dicts(self.session.execute(
+            projections.TRIVIA_SCORE.select()
+            .where(TriviaScore.user_id == user_id)
+            .order_by(TriviaScore.created_at.desc(), TriviaScore.id.desc())
+            .limit(recent_limit)
+        ))
 
         return {
             'total_attempts': total_attempts,
@@ -4,5 +4,6 @@ from .review_routes import review_bp
 from .api_routes import api_bp
 from .trivia_routes import trivia_bp
 from .homepage_routes import homepage_bp
+from .search_routes import search_bp
 
-__all__ = ['user_bp', 'movie_bp', 'review_bp', 'api_bp', 'trivia_bp', 'homepage_bp']
\ No newline at end of file
+__all__ = ['user_bp', 'movie_bp', 'review_bp', 'api_bp', 'trivia_bp', 'homepage_bp', 'search_bp']
\ No newline at end of file
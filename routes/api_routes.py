@@ -2,13 +2,22 @@
 API Routes - RESTful API endpoints for MovieWeb application.
 Provides JSON API for all core functionality including users, movies, and reviews.
 """
+from functools import partial
+
 from flask import Blueprint, jsonify, request
 
+from services.movie_metadata_index import movie_metadata_index
 from services.movie_service import MovieService
+from services.omdb_cache import omdb_cache
 from services.rapidapi_service import RapidAPIService
 from services.review_service import ReviewService
+from services.search_service import SearchService
+from services.single_flight import omdb_flights, trivia_flights
+from services.trivia_prefetcher import trivia_prefetcher
 from services.trivia_service import TriviaService
 from services.user_service import UserService
+from config import BulkImportConfig, PaginationConfig
+from utils.pagination import fetch_page, fetch_ranked_page, parse_limit
 
 from exceptions import (
     UserNotFoundError, MovieNotFoundError, ReviewNotFoundError,
@@ -20,6 +29,7 @@ api_bp = Blueprint('api', __name__, url_prefix='/api')
 movie_service = MovieService()
 rapidapi_service = RapidAPIService()
 review_service = ReviewService()
+search_service = SearchService()
 trivia_service = TriviaService()
 user_service = UserService()
 
@@ -51,6 +61,29 @@ def success_response(data=None, message=None):
     return jsonify(response)
 
 
+def paginated_response(items, next_cursor):
+    """
+    Create standardized success response for one page of a list.
+
+    :param items: Items on the requested page
+    :param next_cursor: Opaque cursor for the next page (None on the last page)
+    :return: Flask JSON response
+    """
+    return jsonify({'success': True, 'data': items, 'next_cursor': next_cursor})
+
+
+def get_page(fetch):
+    """
+    Fetch the page of a list selected by the request's cursor and limit arguments.
+
+    :param fetch: Callable taking after_id and limit keywords, returning item dicts
+    :return: Flask JSON response with the page and its next cursor
+    """
+    limit = parse_limit(request.args.get('limit'))
+    items, next_cursor = fetch_page(fetch, request.args.get('cursor'), limit)
+    return paginated_response(items, next_cursor)
+
+
 def clean_string_data(data, fields):
     """
     Clean and validate string fields from request data.
@@ -106,12 +139,11 @@ def handle_service_exceptions(func):
 @handle_service_exceptions
 def api_get_users():
     """
-    Get all users.
+    Get one page of users (query args: cursor, limit).
 
-    :return: JSON response with list of all users
+    :return: JSON response with a page of users and the next cursor
     """
-    users = user_service.get_all_users()
-    return success_response(users)
+    return get_page(user_service.get_all_users)
 
 
 @api_bp.route('/users', methods=['POST'])
@@ -150,14 +182,13 @@ def api_get_user(user_id):
 @handle_service_exceptions
 def api_get_user_movies(user_id):
     """
-    Get all movies for a specific user.
+    Get one page of movies for a specific user (query args: cursor, limit).
 
     :param user_id: ID of the user
-    :return: JSON response with list of user's movies
+    :return: JSON response with a page of the user's movies and the next cursor
     """
     user_service.get_user_by_id(user_id)
-    movies = movie_service.get_user_movies(user_id)
-    return success_response(movies)
+    return get_page(partial(movie_service.get_user_movies, user_id))
 
 
 @api_bp.route('/users/<int:user_id>/movies', methods=['POST'])
@@ -185,27 +216,83 @@ def api_create_movie(user_id):
     return success_response(new_movie, 'Movie added successfully'), 201
 
 
+@api_bp.route('/users/<int:user_id>/movies/bulk', methods=['POST'])
+@handle_service_exceptions
+def api_import_movies(user_id):
+    """
+    Add many movies to a user's collection in one request.
+
+    Accepts {"movies": [...]} where each item is a title string or a movie
+    object. Items are validated, enriched and deduplicated individually and
+    all new movies are inserted in a single transaction.
+
+    :param user_id: ID of the user
+    :return: JSON response with per-item results
+    """
+    data = request.get_json()
+    if not data:
+        return error_response('No JSON data provided')
+
+    items = data.get('movies')
+    if not isinstance(items, list) or not items:
+        return error_response('"movies" must be a non-empty list')
+    if len(items) > BulkImportConfig.MAX_ITEMS:
+        return error_response(f'At most {BulkImportConfig.MAX_ITEMS} movies per import')
+
+    movies_data = []
+    for item in items:
+        if isinstance(item, str):
+            item = {'title': item}
+        elif not isinstance(item, dict):
+            item = {}
+
+        clean_data = clean_string_data(item, ['title', 'director', 'genre'])
+        clean_data.update({
+            'year': item.get('year'),
+            'rating': item.get('rating')
+        })
+        movies_data.append(clean_data)
+
+    summary = movie_service.import_movies_for_user(user_id, movies_data)
+    return success_response(summary, f"Imported {summary['created']} of {len(items)} movies")
+
+
 @api_bp.route('/movies/<int:movie_id>', methods=['GET'])
 @handle_service_exceptions
 def api_get_movie(movie_id):
     """
-    Get specific movie with its reviews.
+    Get specific movie with its review aggregates and first page of reviews.
 
     :param movie_id: ID of the movie to retrieve
     :return: JSON response with movie data and reviews
     """
     movie, user_id = movie_service.get_movie_by_id(movie_id)
-    reviews = review_service.get_movie_reviews(movie_id)
+    reviews, next_cursor = fetch_page(partial(review_service.get_movie_reviews, movie_id),
+                                      None, PaginationConfig.API_DEFAULT_LIMIT)
 
     response_data = {
         'movie': movie,
         'reviews': reviews,
+        'reviews_next_cursor': next_cursor,
         'user_id': user_id
     }
 
     return success_response(response_data)
 
 
+@api_bp.route('/movies/<int:movie_id>/enrichment', methods=['GET'])
+@handle_service_exceptions
+def api_movie_enrichment(movie_id):
+    """
+    Get the background OMDb enrichment status of a movie.
+
+    :param movie_id: ID of the movie
+    :return: JSON response with the status ('pending', 'enriched', 'unmatched',
+             'failed' or null) and the current movie data
+    """
+    return success_response(movie_service.get_enrichment_status(movie_id))
+
+
 @api_bp.route('/movies/<int:movie_id>', methods=['PUT'])
 @handle_service_exceptions
 def api_update_movie(movie_id):
@@ -250,13 +337,12 @@ def api_delete_movie(movie_id):
 @handle_service_exceptions
 def api_get_movie_reviews(movie_id):
     """
-    Get all reviews for a specific movie.
+    Get one page of reviews for a specific movie (query args: cursor, limit).
 
     :param movie_id: ID of the movie
-    :return: JSON response with list of reviews
+    :return: JSON response with a page of reviews and the next cursor
     """
-    reviews = review_service.get_movie_reviews(movie_id)
-    return success_response(reviews)
+    return get_page(partial(review_service.get_movie_reviews, movie_id))
 
 
 @api_bp.route('/movies/<int:movie_id>/reviews', methods=['POST'])
@@ -329,6 +415,24 @@ def api_like_review(review_id):
     return success_response(result, 'Review liked successfully')
 
 
+# ==================== SEARCH ENDPOINTS ====================
+
+@api_bp.route('/search', methods=['GET'])
+@handle_service_exceptions
+def api_search():
+    """
+    Full-text search over movies and reviews, best matches first
+    (query args: q, user_id, cursor, limit).
+
+    :return: JSON response with a page of ranked results and the next cursor
+    """
+    limit = parse_limit(request.args.get('limit'))
+    search = partial(search_service.search, request.args.get('q'),
+                     user_id=request.args.get('user_id', type=int))
+    results, next_cursor = fetch_ranked_page(search, request.args.get('cursor'), limit)
+    return paginated_response(results, next_cursor)
+
+
 @api_bp.route('/usage', methods=['GET'])
 def api_usage_stats():
     """
@@ -362,6 +466,19 @@ def reset_api_usage():
         return error_response(f'Error resetting usage: {str(e)}', 500)
 
 
+@api_bp.route('/trivia/prefetch', methods=['GET'])
+def api_trivia_prefetch_status():
+    """
+    Get the trivia prefetch queue status.
+
+    :return: JSON response with queue size, outcome counters and quota left
+    """
+    try:
+        return success_response({'trivia_prefetch': trivia_prefetcher.status()})
+    except Exception as e:
+        return error_response(f'Error getting prefetch status: {str(e)}', 500)
+
+
 @api_bp.route('/test-apis', methods=['GET'])
 def test_apis():
     """
@@ -391,6 +508,26 @@ def test_apis():
     except Exception as e:
         return error_response(f'Error testing APIs: {str(e)}', 500)
 
+@api_bp.route('/metrics', methods=['GET'])
+def api_metrics():
+    """
+    Get cache and request coalescing metrics for this process.
+
+    :return: JSON response with OMDb cache, metadata index and single-flight counters
+    """
+    try:
+        return success_response({
+            'omdb_cache': omdb_cache.stats(),
+            'metadata_index': movie_metadata_index.stats(),
+            'single_flight': {
+                'omdb': omdb_flights.stats(),
+                'trivia': trivia_flights.stats()
+            }
+        })
+    except Exception as e:
+        return error_response(f'Error getting metrics: {str(e)}', 500)
+
+
 # ==================== API INFO ENDPOINT ====================
 
 @api_bp.route('/', methods=['GET'])
@@ -410,6 +547,7 @@ def api_info():
         'movies': {
             'POST /api/users/{id}/movies': 'Add movie to user',
             'GET /api/movies/{id}': 'Get movie details with reviews',
+            'GET /api/movies/{id}/enrichment': 'Get OMDb enrichment status',
             'PUT /api/movies/{id}': 'Update movie',
             'DELETE /api/movies/{id}': 'Delete movie'
         },
@@ -419,6 +557,13 @@ def api_info():
             'PUT /api/reviews/{id}': 'Update review',
             'DELETE /api/reviews/{id}': 'Delete review',
             'POST /api/reviews/{id}/like': 'Like a review'
+        },
+        'search': {
+            'GET /api/search?q=': 'Search movies and reviews'
+        },
+        'metrics': {
+            'GET /api/metrics': 'Get OMDb cache, metadata index and coalesced request counters',
+            'GET /api/trivia/prefetch': 'Get trivia prefetch queue status'
         }
     }
 
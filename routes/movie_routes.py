@@ -2,7 +2,10 @@
 Movie Routes - Web routes for movie management functionality.
 Handles CRUD operations for movies within user collections.
 """
+from functools import partial
+
 from flask import Blueprint, render_template, request, redirect, url_for, flash
+from config import PaginationConfig
 from services.movie_service import MovieService
 from services.review_service import ReviewService
 from services.user_service import UserService
@@ -11,6 +14,7 @@ from exceptions import (
     ExternalAPIError, DuplicateMovieError
 )
 from utils.decorators import require_user, require_user_and_movie
+from utils.pagination import fetch_page
 
 movie_bp = Blueprint('movies', __name__, url_prefix='/users/<int:user_id>')
 
@@ -38,15 +42,22 @@ def extract_movie_data_from_form():
 @require_user
 def user_movies(user_id, user):
     """
-    Display a user's favorite movies.
+    Display one page of a user's favorite movies.
 
     :param user_id: ID of the user
     :param user: User object (injected by decorator)
-    :return: Rendered template with user's movies
+    :return: Rendered template with a page of the user's movies
     """
+    cursor = request.args.get('cursor')
     try:
-        movies = movie_service.get_user_movies(user_id)
-        return render_template('user_movies.html', user=user, movies=movies)
+        movies, next_cursor = fetch_page(partial(movie_service.get_user_movies, user_id),
+                                         cursor, PaginationConfig.MOVIES_PAGE_SIZE)
+        return render_template('user_movies.html', user=user, movies=movies,
+                               cursor=cursor, next_cursor=next_cursor)
+
+    except ValidationError as e:
+        flash(e.message, 'error')
+        return redirect(url_for('movies.user_movies', user_id=user_id))
 
     except DatabaseError as e:
         flash(f'Database error: {e.message}', 'error')
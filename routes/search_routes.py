@@ -0,0 +1,45 @@
+"""
+Search Routes - Web route for full-text search over movies and reviews.
+"""
+from functools import partial
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+
+from config import SearchConfig
+from services.search_service import SearchService
+from exceptions import ValidationError, DatabaseError
+from utils.pagination import fetch_ranked_page
+
+search_bp = Blueprint('search', __name__, url_prefix='/search')
+
+search_service = SearchService()
+
+
+@search_bp.route('/')
+def search():
+    """
+    Display one page of ranked search results.
+
+    :return: Rendered template with the query and its results
+    """
+    query = request.args.get('q', '').strip()
+    cursor = request.args.get('cursor')
+    if not query:
+        return render_template('search.html', query='', results=[])
+
+    try:
+        results, next_cursor = fetch_ranked_page(
+            partial(search_service.search, query), cursor, SearchConfig.PAGE_SIZE
+        )
+        return render_template('search.html', query=query, results=results,
+                               cursor=cursor, next_cursor=next_cursor)
+
+    except ValidationError as e:
+        flash(e.message, 'error')
+        if cursor:
+            return redirect(url_for('search.search', q=query))
+        return render_template('search.html', query=query, results=[])
+
+    except DatabaseError as e:
+        flash(f'Database error: {e.message}', 'error')
+        return render_template('search.html', query=query, results=[])
@@ -4,9 +4,11 @@ Handles user listing and creation operations.
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 
+from config import PaginationConfig
 from services.user_service import UserService
 from exceptions import ValidationError, DatabaseError
 from utils.decorators import require_user
+from utils.pagination import fetch_page
 
 user_bp = Blueprint('users', __name__, url_prefix='/users')
 
@@ -16,13 +18,20 @@ user_service = UserService()
 @user_bp.route('/')
 def list_users():
     """
-    Display all users in an HTML template.
+    Display one page of users in an HTML template.
 
-    :return: Rendered template with list of all users
+    :return: Rendered template with a page of users
     """
+    cursor = request.args.get('cursor')
     try:
-        users = user_service.get_all_users()
-        return render_template('users.html', users=users)
+        users, next_cursor = fetch_page(user_service.get_all_users, cursor,
+                                        PaginationConfig.USERS_PAGE_SIZE)
+        return render_template('users.html', users=users,
+                               cursor=cursor, next_cursor=next_cursor)
+
+    except ValidationError as e:
+        flash(e.message, 'error')
+        return redirect(url_for('users.list_users'))
 
     except DatabaseError as e:
         flash(f'Database error: {e.message}', 'error')
@@ -1,19 +1,39 @@
 from .api_usage_tracker import APIUsageTracker
+from .entity_resolver import EntityResolver
+from .http_client import HTTPClient
+from .like_buffer import LikeBuffer, like_buffer
+from .movie_metadata_index import MovieMetadataIndex, movie_metadata_index
 from .movie_service import MovieService
+from .omdb_cache import OMDbCache, omdb_cache
 from .omdb_service import OMDbService
 from .openai_service import OpenAIService
 from .rapidapi_service import RapidAPIService
 from .review_service import ReviewService
+from .search_service import SearchService
+from .single_flight import SingleFlight
+from .trivia_prefetcher import TriviaPrefetcher, trivia_prefetcher
 from .trivia_service import TriviaService
 from .user_service import UserService
 
 __all__ = [
     'APIUsageTracker',
+    'EntityResolver',
+    'HTTPClient',
+    'LikeBuffer',
+    'like_buffer',
+    'MovieMetadataIndex',
+    'movie_metadata_index',
     'MovieService',
+    'OMDbCache',
+    'omdb_cache',
     'OMDbService',
     'OpenAIService',
     'RapidAPIService',
     'ReviewService',
+    'SearchService',
+    'SingleFlight',
+    'TriviaPrefetcher',
+    'trivia_prefetcher',
     'TriviaService',
     'UserService'
 ]
\ No newline at end of file
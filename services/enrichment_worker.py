@@ -0,0 +1,108 @@
+"""
+Enrichment Worker - Background OMDb enrichment of newly added movies.
+Movie adds insert the user-entered fields right away and queue the movie
+here; a small thread pool looks it up in OMDb and fills in director, genre,
+poster and rating, recording the outcome in movies.enrichment_status so the
+UI can poll for it.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import EnrichmentConfig
+from datamanager import SQLiteDataManager
+from services.omdb_service import OMDbService
+
+
+class EnrichmentWorker:
+    """Thread pool applying OMDb lookups to movies already in the database"""
+
+    def __init__(self, omdb_service=None, data_manager=None, workers=None):
+        """
+        Initialize enrichment worker. Threads start with the first submitted movie.
+
+        :param omdb_service: OMDb service used for lookups
+        :param data_manager: Data manager used to store results (defaults to SQLite)
+        :param workers: Number of worker threads
+        """
+        self.omdb_service = omdb_service or OMDbService()
+        self.data_manager = data_manager or SQLiteDataManager()
+        self.workers = workers or EnrichmentConfig.WORKERS
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, app, movie_id, movie_data):
+        """
+        Queue a movie for enrichment.
+
+        :param app: Flask application providing the database context
+        :param movie_id: ID of the inserted movie
+        :param movie_data: Validated movie data with at least 'title'
+        :return: Future resolving to the enrichment status
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='omdb-enrichment')
+            return self._executor.submit(self._enrich, app, movie_id, dict(movie_data))
+
+    def requeue_pending(self, app, limit=None):
+        """
+        Queue movies left 'pending' by a restart or a shutdown without waiting.
+
+        :param app: Flask application providing the database context
+        :param limit: Maximum number of movies to queue (None for all)
+        :return: List of futures resolving to the enrichment statuses
+        """
+        movies = self.data_manager.get_pending_enrichment_movies(limit=limit)
+        return [self.submit(app, movie['id'], movie) for movie in movies]
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker threads, by default after the queued movies are done.
+        A later submit starts a new pool.
+
+        :param wait: Wait for queued enrichments to finish
+        :return: None
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def _enrich(self, app, movie_id, movie_data):
+        """
+        Look a movie up in OMDb and store the result.
+
+        :param app: Flask application providing the database context
+        :param movie_id: ID of the movie to enrich
+        :param movie_data: Validated movie data
+        :return: Enrichment status stored for the movie
+        """
+        with app.app_context():
+            try:
+                omdb_data = self.omdb_service.search_movie(movie_data['title'],
+                                                           movie_data.get('year'))
+            except Exception as e:
+                print(f"Warning: Failed to enrich movie {movie_id} with OMDb: {e}")
+                omdb_data, status = None, 'failed'
+            else:
+                status = 'enriched' if omdb_data else 'unmatched'
+
+            enrichment = {}
+            if omdb_data:
+                enrichment = {
+                    'director': omdb_data.get('director'),
+                    'genre': omdb_data.get('genre'),
+                    'poster': omdb_data.get('poster'),
+                    'rating': omdb_data.get('imdb_rating'),
+                }
+
+            try:
+                self.data_manager.apply_movie_enrichment(movie_id, enrichment, status)
+            except Exception as e:
+                print(f"Warning: Failed to store enrichment of movie {movie_id}: {e}")
+                return 'failed'
+            return status
+
+
+enrichment_worker = EnrichmentWorker()
@@ -0,0 +1,66 @@
+"""
+Entity Resolver - Shared primary-key lookups for users and movies.
+Used by services and route decorators so that resolving a single entity
+is one indexed query instead of a scan over the whole table.
+"""
+from sqlalchemy.exc import SQLAlchemyError
+
+from datamanager import SQLiteDataManager
+from exceptions import UserNotFoundError, MovieNotFoundError, DatabaseError
+
+
+class EntityResolver:
+    """Resolves entities by primary key and raises domain errors when missing"""
+
+    def __init__(self, data_manager=None):
+        """
+        Initialize entity resolver with a data manager.
+
+        :param data_manager: Data manager to resolve against (defaults to SQLite)
+        """
+        self.data_manager = data_manager or SQLiteDataManager()
+
+    def resolve_user(self, user_id):
+        """
+        Resolve a user by primary key.
+
+        :param user_id: ID of the user to resolve
+        :return: User dictionary
+        """
+        try:
+            user = self.data_manager.get_user_by_id(user_id)
+        except SQLAlchemyError as e:
+            raise DatabaseError('fetching user', e)
+
+        if not user:
+            raise UserNotFoundError(user_id)
+        return user
+
+    def resolve_movie(self, movie_id):
+        """
+        Resolve a movie and its owner by the movie's primary key.
+
+        :param movie_id: ID of the movie to resolve
+        :return: Tuple of (movie_dict, owner_dict)
+        """
+        try:
+            result = self.data_manager.get_movie_with_owner(movie_id)
+        except SQLAlchemyError as e:
+            raise DatabaseError('fetching movie', e)
+
+        if not result:
+            raise MovieNotFoundError(movie_id)
+        return result
+
+    def resolve_user_movie(self, user_id, movie_id):
+        """
+        Resolve a movie that must belong to the given user.
+
+        :param user_id: ID of the user who must own the movie
+        :param movie_id: ID of the movie to resolve
+        :return: Movie dictionary
+        """
+        movie, owner = self.resolve_movie(movie_id)
+        if owner['id'] != user_id:
+            raise MovieNotFoundError(movie_id)
+        return movie
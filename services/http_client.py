@@ -0,0 +1,90 @@
+"""
+HTTP Client - Shared, pooled HTTP sessions for external services.
+Each external service gets one long-lived requests.Session whose per-host
+connection pools keep TCP/TLS connections alive between calls. Requests are
+retried on connection errors and 429/5xx responses with jittered exponential
+backoff (honouring Retry-After), and every call gets the service's timeout.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import APIConfig, HTTPClientConfig
+
+
+class HTTPClient:
+    """Keep-alive HTTP session with a retry policy and a default timeout"""
+
+    def __init__(self, timeout, retries=None, retry_reads=True, retry_statuses=True,
+                 pool_size=None):
+        """
+        Initialize HTTP client.
+
+        :param timeout: Read timeout in seconds applied to every request
+        :param retries: Retries after the first attempt (defaults to HTTPClientConfig.RETRIES)
+        :param retry_reads: Also retry requests that failed after being sent. Keep
+                            False for services whose POSTs must not be repeated
+                            once the server may have acted on them.
+        :param retry_statuses: Retry 429/5xx responses. Keep False for services
+                               that bill or count every request answered.
+        :param pool_size: Connections kept alive per host
+        """
+        self.timeout = (HTTPClientConfig.CONNECT_TIMEOUT, timeout)
+        retries = HTTPClientConfig.RETRIES if retries is None else retries
+        self.retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries if retry_reads else 0,
+            status=retries if retry_statuses else 0,
+            status_forcelist=HTTPClientConfig.RETRY_STATUSES if retry_statuses else (),
+            respect_retry_after_header=retry_statuses,
+            allowed_methods=None,   # Status retries apply to POST too; see retry_reads
+            backoff_factor=HTTPClientConfig.BACKOFF_FACTOR,
+            backoff_jitter=HTTPClientConfig.BACKOFF_JITTER,
+            backoff_max=HTTPClientConfig.BACKOFF_MAX,
+            raise_on_status=False,  # Hand the last response to the caller's status handling
+        )
+
+        pool_size = pool_size or HTTPClientConfig.POOL_SIZE
+        adapter = HTTPAdapter(pool_connections=HTTPClientConfig.POOL_HOSTS,
+                              pool_maxsize=pool_size, max_retries=self.retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url, **kwargs):
+        """
+        Send a GET request.
+
+        :param url: Request URL
+        :param kwargs: Arguments for requests (timeout defaults to the client's)
+        :return: requests.Response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """
+        Send a POST request.
+
+        :param url: Request URL
+        :param kwargs: Arguments for requests (timeout defaults to the client's)
+        :return: requests.Response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+
+
+# Shared clients, one per external service. OMDb lookups are idempotent GETs;
+# trivia generation POSTs are not resent after a timeout or dropped response.
+# RapidAPI answers count against the monthly quota, which the usage tracker
+# records once per call, so its 429/5xx responses are not retried either.
+omdb_client = HTTPClient(APIConfig.OMDB_TIMEOUT, retries=APIConfig.OMDB_RETRIES)
+rapidapi_client = HTTPClient(APIConfig.RAPIDAPI_TIMEOUT, retries=APIConfig.RAPIDAPI_RETRIES,
+                             retry_reads=False, retry_statuses=False)
+openai_client = HTTPClient(APIConfig.OPENAI_TIMEOUT, retries=APIConfig.OPENAI_RETRIES,
+                           retry_reads=False)
@@ -0,0 +1,156 @@
+"""
+Like Buffer - Coalesces bursts of review likes in process.
+Likes are counted in memory and written as one atomic increment per review,
+either when enough likes are pending or on a fixed interval, so a burst of
+clicks on a popular review takes one write lock instead of one per click.
+"""
+import atexit
+import threading
+
+from config import LikeBufferConfig
+from datamanager import SQLiteDataManager
+
+
+class LikeBuffer:
+    """Thread-safe buffer of pending review likes"""
+
+    def __init__(self, data_manager=None, flush_size=None, flush_interval=None):
+        """
+        Initialize like buffer.
+
+        :param data_manager: Data manager used to apply likes (defaults to SQLite)
+        :param flush_size: Pending likes that trigger a flush
+        :param flush_interval: Seconds between background flushes
+        """
+        self.data_manager = data_manager or SQLiteDataManager()
+        self.flush_size = flush_size or LikeBufferConfig.FLUSH_SIZE
+        self.flush_interval = flush_interval or LikeBufferConfig.FLUSH_INTERVAL
+        self._pending = {}
+        self._pending_total = 0
+        # Likes taken by a flush whose write has not committed yet
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._atexit_registered = False
+
+    def add(self, review_id, count=1):
+        """
+        Buffer likes for a review, flushing if the size threshold is reached.
+
+        :param review_id: ID of the liked review
+        :param count: Number of likes to add
+        :return: True if this call flushed, so likes read before it are stale
+        """
+        with self._lock:
+            self._pending[review_id] = self._pending.get(review_id, 0) + count
+            self._pending_total += count
+            should_flush = self._pending_total >= self.flush_size
+
+        if should_flush:
+            self.flush()
+        return should_flush
+
+    def pending(self, review_id):
+        """
+        Get likes buffered for a review but not yet written, including those
+        of a flush that has not committed.
+
+        :param review_id: ID of the review
+        :return: Number of pending likes
+        """
+        with self._lock:
+            return self._pending.get(review_id, 0) + self._in_flight.get(review_id, 0)
+
+    def apply_pending(self, review):
+        """
+        Add pending likes to a review dictionary so reads see buffered likes.
+
+        :param review: Review dictionary (or None)
+        :return: The same dictionary with likes including pending likes
+        """
+        if review:
+            review['likes'] = (review.get('likes') or 0) + self.pending(review['id'])
+        return review
+
+    def flush(self):
+        """
+        Write all pending likes in one transaction.
+
+        Must run inside a Flask application context. The likes stay visible
+        through pending() until the write commits. On failure they are put
+        back so the next flush retries them.
+
+        :return: Number of likes written
+        """
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._pending, self._pending_total = self._pending, {}, 0
+                self._in_flight = deltas
+
+            if not deltas:
+                return 0
+
+            try:
+                self.data_manager.add_review_likes(deltas)
+            except Exception:
+                with self._lock:
+                    self._in_flight = {}
+                    for review_id, count in deltas.items():
+                        self._pending[review_id] = self._pending.get(review_id, 0) + count
+                        self._pending_total += count
+                raise
+
+            with self._lock:
+                self._in_flight = {}
+            return sum(deltas.values())
+
+    def start(self, app):
+        """
+        Start a daemon thread that flushes on the configured interval.
+
+        :param app: Flask application providing the database context
+        :return: None
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(app,),
+                                        name='like-buffer', daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop, app)
+            self._atexit_registered = True
+
+    def stop(self, app):
+        """
+        Stop the flush thread and write any remaining likes.
+
+        :param app: Flask application providing the database context
+        :return: None
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        with app.app_context():
+            self.flush()
+
+    def _run(self, app):
+        """
+        Flush loop executed by the background thread.
+
+        :param app: Flask application providing the database context
+        :return: None
+        """
+        while not self._stop_event.wait(self.flush_interval):
+            with app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"⚠️ Failed to flush buffered likes: {e}")
+
+
+like_buffer = LikeBuffer()
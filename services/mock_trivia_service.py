@@ -4,10 +4,8 @@ Generates fake trivia questions to test scoring system
 """
 from config import TriviaConfig
 from datamanager import SQLiteDataManager
-from exceptions import (
-    TriviaError, InsufficientMoviesError, UserNotFoundError,
-    MovieNotFoundError
-)
+from services.entity_resolver import EntityResolver
+from exceptions import TriviaError, InsufficientMoviesError
 from utils.template_helpers import format_percentage, get_performance_badge
 
 
@@ -16,22 +14,15 @@ class MockTriviaService:
 
     def __init__(self):
         self.data_manager = SQLiteDataManager()
+        self.entity_resolver = EntityResolver(self.data_manager)
 
     def validate_user(self, user_id):
         """Validate that user exists, raise UserNotFoundError if not"""
-        users = self.data_manager.get_all_users()
-        user = next((u for u in users if u['id'] == user_id), None)
-        if not user:
-            raise UserNotFoundError(user_id)
-        return user
+        return self.entity_resolver.resolve_user(user_id)
 
     def validate_movie(self, user_id, movie_id):
         """Validate that movie exists for user, raise MovieNotFoundError if not"""
-        movies = self.data_manager.get_user_movies(user_id)
-        movie = next((m for m in movies if m['id'] == movie_id), None)
-        if not movie:
-            raise MovieNotFoundError(movie_id)
-        return movie
+        return self.entity_resolver.resolve_user_movie(user_id, movie_id)
 
     def validate_collection_trivia_requirements(self, user_id):
         """Validate user has enough movies for collection trivia"""
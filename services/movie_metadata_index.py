@@ -0,0 +1,292 @@
+"""
+Movie Metadata Index - Offline lookup of movie metadata.
+Loads a bulk dump of movie metadata (CSV or TSV of title, year, director,
+genre and rating) into an SQLite table under instance/ keyed by normalized
+title and year, so most movie adds are enriched without calling OMDb. A load
+replaces the whole index at once, so it can be refreshed nightly while the
+app keeps serving lookups.
+"""
+import csv
+import gzip
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import DatabaseConfig, MetadataIndexConfig
+from datamanager import normalize_title
+
+# Dump header names (lower-cased) accepted for each index column, including
+# those of the IMDb title.basics/title.ratings datasets. IMDb's title.crew
+# 'directors' column holds name IDs (nm...), not names, so it is not accepted;
+# join it with name.basics into a 'director' column first.
+COLUMN_ALIASES = {
+    'title': ('title', 'primarytitle'),
+    'year': ('year', 'startyear'),
+    'director': ('director',),
+    'genre': ('genre', 'genres'),
+    'rating': ('rating', 'imdb_rating', 'imdbrating', 'averagerating'),
+}
+
+# Dump values meaning "unknown"
+_NULL_VALUES = {'', '\\N', 'N/A'}
+
+
+class MovieMetadataIndex:
+    """Persistent movie metadata index with hit/miss counters"""
+
+    def __init__(self, path=None):
+        """
+        Initialize metadata index. The database file is created by the first load.
+
+        :param path: Path of the index database file
+        """
+        self.path = Path(path or Path(DatabaseConfig.INSTANCE_FOLDER) / MetadataIndexConfig.FILENAME)
+        self._counters = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def lookup(self, title, year=None):
+        """
+        Look a movie up by title and optionally year. Without a year a title
+        only matches if the index holds a single movie of that name.
+
+        :param title: Movie title as entered
+        :param year: Optional release year
+        :return: Dictionary shaped like OMDbService.search_movie() results, or None
+        """
+        row = None
+        if self.path.exists():
+            try:
+                with self._connect() as connection:
+                    row = self._find(connection, normalize_title(title), year)
+            except sqlite3.Error as e:
+                print(f"Warning: Movie metadata index unavailable: {e}")
+
+        if row is None:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        title, year, director, genre, rating = row
+        return {
+            'title': title,
+            'director': director or '',
+            'year': year or None,
+            'genre': genre or '',
+            'imdb_rating': rating,
+            'plot': '',
+            'poster': ''
+        }
+
+    def load(self, source):
+        """
+        Replace the index with the movies of a CSV or TSV dump (optionally
+        gzipped). Rows without a title are skipped; of rows sharing a title
+        and year the last one wins. Lookups see the old index until the new
+        one is complete.
+
+        :param source: Path of the dump; '.tsv' files are tab separated
+        :return: Tuple of (movies indexed, rows skipped)
+        """
+        source = Path(source)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._open_dump(source) as dump:
+            delimiter = self._delimiter(source)
+            # TSV dumps such as IMDb's are unquoted and may contain bare quotes
+            reader = csv.reader(dump, delimiter=delimiter,
+                                quoting=csv.QUOTE_NONE if delimiter == '\t' else csv.QUOTE_MINIMAL)
+            columns = self._map_columns(next(reader, []))
+            with self._connect() as connection:
+                connection.execute('DROP TABLE IF EXISTS movie_metadata_load')
+                self._create_table(connection, 'movie_metadata_load')
+                skipped = 0
+                batch = []
+                for values in reader:
+                    row = self._parse_row(values, columns)
+                    if row is None:
+                        skipped += 1
+                        continue
+                    batch.append(row)
+                    if len(batch) >= MetadataIndexConfig.LOAD_BATCH_SIZE:
+                        self._insert(connection, batch)
+                        batch = []
+                self._insert(connection, batch)
+
+                count = connection.execute('SELECT count(*) FROM movie_metadata_load').fetchone()[0]
+                connection.execute('DROP TABLE IF EXISTS movie_metadata')
+                connection.execute('ALTER TABLE movie_metadata_load RENAME TO movie_metadata')
+                connection.execute('DELETE FROM movie_metadata_info')
+                connection.execute(
+                    'INSERT INTO movie_metadata_info (source, loaded_at, entries) VALUES (?, ?, ?)',
+                    (str(source), time.time(), count)
+                )
+        return count, skipped
+
+    def stats(self):
+        """
+        Get lookup counters for this process and the size of the index.
+
+        :return: Dictionary of counters, entry count, load time and hit ratio
+        """
+        with self._lock:
+            stats = dict(self._counters)
+
+        stats['entries'], stats['loaded_at'] = 0, None
+        if self.path.exists():
+            with self._connect() as connection:
+                row = connection.execute(
+                    'SELECT entries, loaded_at FROM movie_metadata_info'
+                ).fetchone()
+            if row:
+                stats['entries'], stats['loaded_at'] = row
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+    @staticmethod
+    def _find(connection, title_key, year):
+        """
+        Find the index row of a normalized title.
+
+        :param connection: Open index connection
+        :param title_key: Normalized title
+        :param year: Optional release year
+        :return: Row tuple, or None if missing or ambiguous
+        """
+        query = ('SELECT title, year, director, genre, rating FROM movie_metadata '
+                 'WHERE title_key = ?')
+        if year:
+            return connection.execute(query + ' AND year = ?', (title_key, int(year))).fetchone()
+
+        rows = connection.execute(query + ' LIMIT 2', (title_key,)).fetchall()
+        return rows[0] if len(rows) == 1 else None
+
+    @staticmethod
+    def _map_columns(header):
+        """
+        Locate the index columns in a dump header.
+
+        :param header: List of header names
+        :return: Dictionary of index column to position in a row
+        :raises ValueError: If the header has no title column
+        """
+        positions = {name.strip().lower(): index for index, name in enumerate(header)}
+        columns = {}
+        for column, aliases in COLUMN_ALIASES.items():
+            for alias in aliases:
+                if alias in positions:
+                    columns[column] = positions[alias]
+                    break
+
+        if 'title' not in columns:
+            raise ValueError(f"Metadata dump has no title column (header: {header})")
+        return columns
+
+    @staticmethod
+    def _parse_row(values, columns):
+        """
+        Turn a dump row into an index row.
+
+        :param values: List of field values
+        :param columns: Dictionary of index column to position
+        :return: Tuple of index values, or None if the row is unusable
+        """
+        fields = {}
+        for column, position in columns.items():
+            value = values[position].strip() if position < len(values) else ''
+            fields[column] = None if value in _NULL_VALUES else value
+
+        title = fields.get('title')
+        if not title:
+            return None
+        try:
+            year = int(fields['year']) if fields.get('year') else 0
+            rating = float(fields['rating']) if fields.get('rating') else None
+        except ValueError:
+            return None
+
+        # IMDb datasets separate genres with bare commas
+        genre = fields.get('genre')
+        if genre:
+            genre = ', '.join(part.strip() for part in genre.split(','))
+
+        return (normalize_title(title), year, title, fields.get('director'), genre, rating)
+
+    @staticmethod
+    def _delimiter(source):
+        """Tab for .tsv dumps, comma otherwise"""
+        suffixes = [suffix.lower() for suffix in source.suffixes]
+        return '\t' if '.tsv' in suffixes or '.tab' in suffixes else ','
+
+    @staticmethod
+    def _open_dump(source):
+        """Open a dump as text, decompressing .gz files"""
+        if source.suffix.lower() == '.gz':
+            return gzip.open(source, 'rt', encoding='utf-8', newline='')
+        return open(source, encoding='utf-8', newline='')
+
+    @staticmethod
+    def _insert(connection, rows):
+        """Insert a batch of index rows into the table being loaded"""
+        connection.executemany(
+            'INSERT OR REPLACE INTO movie_metadata_load '
+            '(title_key, year, title, director, genre, rating) VALUES (?, ?, ?, ?, ?, ?)',
+            rows
+        )
+
+    @staticmethod
+    def _create_table(connection, name):
+        """Create an index table; year 0 stands for an unknown year"""
+        connection.execute(
+            f'CREATE TABLE {name} ('
+            'title_key TEXT NOT NULL, '
+            'year INTEGER NOT NULL, '
+            'title TEXT NOT NULL, '
+            'director TEXT, '
+            'genre TEXT, '
+            'rating REAL, '
+            'PRIMARY KEY (title_key, year)) WITHOUT ROWID'
+        )
+
+    def _count(self, counter):
+        """Increment a process-wide counter"""
+        with self._lock:
+            self._counters[counter] += 1
+
+    @contextmanager
+    def _connect(self):
+        """
+        Open a connection to the index database, creating its schema once.
+        The transaction commits when the block succeeds and the connection
+        is always closed.
+
+        :return: Context manager yielding a sqlite3 connection
+        """
+        connection = sqlite3.connect(self.path, timeout=MetadataIndexConfig.BUSY_TIMEOUT)
+        try:
+            if not self._schema_ready:
+                self._create_schema(connection)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _create_schema(self, connection):
+        """Create an empty index and its load record if missing"""
+        connection.execute('PRAGMA journal_mode = WAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS movie_metadata_info '
+                '(source TEXT, loaded_at REAL, entries INTEGER)'
+            )
+            if not connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movie_metadata'"
+            ).fetchone():
+                self._create_table(connection, 'movie_metadata')
+        self._schema_ready = True
+
+movie_metadata_index = MovieMetadataIndex()
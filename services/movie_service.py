@@ -2,10 +2,17 @@
 Movie Service - Business logic for movie operations.
 Handles movie CRUD operations, validation, and external API integration.
 """
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from config import ValidationConfig
-from datamanager import SQLiteDataManager
+from config import (BulkImportConfig, EnrichmentConfig, MetadataIndexConfig,
+                    TriviaPrefetchConfig, ValidationConfig)
+from datamanager import SQLiteDataManager, normalize_title
+from services.enrichment_worker import enrichment_worker
+from services.entity_resolver import EntityResolver
 from services.omdb_service import OMDbService
+from services.trivia_prefetcher import trivia_prefetcher
 from exceptions import (
     UserNotFoundError, MovieNotFoundError, ValidationError,
     DatabaseError, DuplicateMovieError
@@ -18,7 +25,10 @@ class MovieService:
     def __init__(self):
         """Initialize movie service with data manager and OMDb service."""
         self.data_manager = SQLiteDataManager()
+        self.entity_resolver = EntityResolver(self.data_manager)
         self.omdb_service = OMDbService()
+        self.enrichment_worker = enrichment_worker
+        self.trivia_prefetcher = trivia_prefetcher
 
         # ==================== VALIDATION METHODS ====================
 
@@ -135,15 +145,16 @@ class MovieService:
 
     # ==================== EXTERNAL API INTEGRATION ====================
 
-    def enhance_movie_with_omdb(self, movie_data):
+    def enhance_movie_with_omdb(self, movie_data, use_index=True):
         """
         Enhance movie data with OMDb API information.
 
         :param movie_data: Dictionary containing basic movie data
+        :param use_index: Consult the offline metadata index before OMDb
         :return: Enhanced movie data dictionary
         """
         try:
-            enhanced_data = self.omdb_service.enhance_movie_data(movie_data)
+            enhanced_data = self.omdb_service.enhance_movie_data(movie_data, use_index=use_index)
             return enhanced_data
         except Exception as e:
             print(f"Warning: Failed to enhance movie data with OMDb: {e}")
@@ -151,15 +162,17 @@ class MovieService:
 
     # ==================== DATA RETRIEVAL METHODS ====================
 
-    def get_user_movies(self, user_id):
+    def get_user_movies(self, user_id, after_id=None, limit=None):
         """
-        Get all movies for a specific user.
+        Get movies for a specific user ordered by ID.
 
         :param user_id: ID of the user
+        :param after_id: Only return movies with an ID greater than this
+        :param limit: Maximum number of movies to return (None for all)
         :return: List of movie dictionaries
         """
         try:
-            return self.data_manager.get_user_movies(user_id)
+            return self.data_manager.get_user_movies(user_id, after_id=after_id, limit=limit)
         except SQLAlchemyError as e:
             raise DatabaseError('fetching user movies', e)
 
@@ -170,16 +183,8 @@ class MovieService:
         :param movie_id: ID of the movie to retrieve
         :return: Tuple of (movie_dict, user_id)
         """
-        try:
-            all_users = self.data_manager.get_all_users()
-            for user in all_users:
-                movies = self.data_manager.get_user_movies(user['id'])
-                movie = next((m for m in movies if m['id'] == movie_id), None)
-                if movie:
-                    return movie, user['id']
-            raise MovieNotFoundError(movie_id)
-        except SQLAlchemyError as e:
-            raise DatabaseError('fetching movie', e)
+        movie, owner = self.entity_resolver.resolve_movie(movie_id)
+        return movie, owner['id']
 
     def get_movie_for_user(self, user_id, movie_id):
         """
@@ -189,11 +194,7 @@ class MovieService:
         :param movie_id: ID of the movie
         :return: Movie dictionary
         """
-        movies = self.get_user_movies(user_id)
-        movie = next((m for m in movies if m['id'] == movie_id), None)
-        if not movie:
-            raise MovieNotFoundError(movie_id)
-        return movie
+        return self.entity_resolver.resolve_user_movie(user_id, movie_id)
 
     # ==================== MOVIE CREATION AND MODIFICATION ====================
 
@@ -201,19 +202,37 @@ class MovieService:
         """
         Create new movie for a user with validation and enhancement.
 
+        Movies found in the offline metadata index are enriched right away.
+        With background enrichment, other movies are stored with the entered
+        fields and status 'pending' and OMDb fills in the rest later; indexed
+        movies are also queued so OMDb fills in their poster.
+        Trivia for movies the question bank does not cover is pre-generated.
+
         :param user_id: ID of the user
         :param movie_data: Dictionary containing movie data
         :return: Dictionary representation of created movie
         """
         validated_data = self.validate_movie_data(movie_data)
-        enhanced_data = self.enhance_movie_with_omdb(validated_data)
+
+        indexed = self.omdb_service.lookup_offline(validated_data['title'],
+                                                   validated_data.get('year'))
+        background = (EnrichmentConfig.BACKGROUND and bool(self.omdb_service.api_key)
+                      and (not indexed or MetadataIndexConfig.FETCH_POSTERS))
+        if indexed:
+            enhanced_data = self.omdb_service.merge_movie_data(validated_data, indexed)
+        elif not background:
+            enhanced_data = self.enhance_movie_with_omdb(validated_data, use_index=False)
+        else:
+            enhanced_data = dict(validated_data)
+        if background:
+            enhanced_data['enrichment_status'] = 'pending'
 
         self._check_duplicate_movie(user_id, enhanced_data)
 
         try:
-            return self.data_manager.add_user_movie(user_id, enhanced_data)
+            movie = self.data_manager.add_user_movie(user_id, enhanced_data)
         except IntegrityError as e:
-            if 'unique_user_movie' in str(e):
+            if self._is_duplicate_movie_error(e):
                 raise DuplicateMovieError(user_id,
                                           enhanced_data['title'],
                                           enhanced_data.get('year'))
@@ -225,6 +244,98 @@ class MovieService:
         except SQLAlchemyError as e:
             raise DatabaseError('creating movie', e)
 
+        if background:
+            self.enrichment_worker.submit(current_app._get_current_object(),
+                                          movie['id'], validated_data)
+        self.prefetch_trivia(movie)
+        return movie
+
+    def prefetch_trivia(self, movie):
+        """
+        Queue background trivia generation for a movie the question bank does
+        not cover yet. Failing to queue it does not affect the caller.
+
+        :param movie: Dictionary representation of the movie
+        :return: None
+        """
+        if not TriviaPrefetchConfig.ENABLED:
+            return
+        try:
+            self.trivia_prefetcher.enqueue(current_app._get_current_object(), movie)
+        except Exception as e:
+            print(f"Warning: Failed to queue trivia prefetch: {e}")
+
+    def get_enrichment_status(self, movie_id):
+        """
+        Get the background enrichment status of a movie.
+
+        :param movie_id: ID of the movie
+        :return: Dictionary with the movie ID, status and current movie data
+        """
+        movie, _ = self.entity_resolver.resolve_movie(movie_id)
+        return {'movie_id': movie_id, 'status': movie['enrichment_status'], 'movie': movie}
+
+    def import_movies_for_user(self, user_id, movies_data):
+        """
+        Import many movies for a user in one batch.
+
+        Valid items are enriched through OMDb with bounded parallelism, deduplicated
+        against one snapshot of the collection (and each other), then inserted in a
+        single transaction. Items another request adds after the snapshot are
+        reported as duplicates as well.
+
+        :param user_id: ID of the user
+        :param movies_data: List of dictionaries containing movie data
+        :return: Dictionary with per-item results and created/duplicate/invalid counts
+        """
+        self.entity_resolver.resolve_user(user_id)
+
+        results = [None] * len(movies_data)
+        valid = []
+        for index, movie_data in enumerate(movies_data):
+            try:
+                valid.append((index, self.validate_movie_data(movie_data)))
+            except ValidationError as e:
+                results[index] = {'index': index, 'title': movie_data.get('title'),
+                                  'status': 'invalid', 'error': e.message}
+
+        with ThreadPoolExecutor(max_workers=BulkImportConfig.ENRICHMENT_WORKERS) as executor:
+            enriched = list(executor.map(self.enhance_movie_with_omdb,
+                                         [movie_data for _, movie_data in valid]))
+
+        seen = {self._movie_key(movie) for movie in self.get_user_movies(user_id)}
+        to_insert = []
+        for (index, _), movie_data in zip(valid, enriched):
+            key = self._movie_key(movie_data)
+            if key in seen:
+                results[index] = self._duplicate_result(user_id, index, movie_data)
+                continue
+            seen.add(key)
+            to_insert.append((index, movie_data))
+
+        if to_insert:
+            try:
+                created = self.data_manager.add_user_movies(
+                    user_id, [movie_data for _, movie_data in to_insert]
+                )
+            except SQLAlchemyError as e:
+                raise DatabaseError('importing movies', e)
+
+            for (index, movie_data), movie in zip(to_insert, created):
+                if movie is None:
+                    # Added concurrently since the collection snapshot was taken
+                    results[index] = self._duplicate_result(user_id, index, movie_data)
+                    continue
+                results[index] = {'index': index, 'title': movie['title'],
+                                  'status': 'created', 'movie': movie}
+
+        return {
+            'results': results,
+            'created': sum(1 for r in results if r['status'] == 'created'),
+            'duplicates': sum(1 for r in results if r['status'] == 'duplicate'),
+            'invalid': sum(1 for r in results if r['status'] == 'invalid')
+        }
+
     def update_movie(self, movie_id, movie_data):
         """
         Update existing movie with validation.
@@ -235,22 +346,10 @@ class MovieService:
         """
         validated_data = self.validate_movie_data(movie_data)
 
-        try:
-            current_movie, user_id = self.get_movie_by_id(movie_id)
-        except MovieNotFoundError:
-            raise MovieNotFoundError(movie_id)
-
-        existing_movies = self.get_user_movies(user_id)
-        title = validated_data['title'].lower()
+        current_movie, user_id = self.get_movie_by_id(movie_id)
         year = validated_data.get('year')
 
-        for movie in existing_movies:
-            if movie['id'] == movie_id:
-                continue
-
-            if (movie['title'].lower() == title and
-                    movie.get('year') == year):
-                raise DuplicateMovieError(user_id, validated_data['title'], year)
+        self._check_duplicate_movie(user_id, validated_data, exclude_movie_id=movie_id)
 
         try:
             result = self.data_manager.update_movie(movie_id, validated_data)
@@ -258,7 +357,7 @@ class MovieService:
                 raise MovieNotFoundError(movie_id)
             return result
         except IntegrityError as e:
-            if 'unique_user_movie' in str(e):
+            if self._is_duplicate_movie_error(e):
                 raise DuplicateMovieError(user_id, validated_data['title'], year)
             raise DatabaseError('updating movie', e)
         except SQLAlchemyError as e:
@@ -276,6 +375,30 @@ class MovieService:
 
     # ==================== HELPER METHODS ====================
 
+    @staticmethod
+    def _movie_key(movie_data):
+        """
+        Build the key two movies in one collection must not share.
+
+        :param movie_data: Movie data or movie dictionary
+        :return: Tuple of (normalized title, year)
+        """
+        return normalize_title(movie_data['title']), movie_data.get('year')
+
+    @staticmethod
+    def _duplicate_result(user_id, index, movie_data):
+        """
+        Build the import result of an item the collection already holds.
+
+        :param user_id: ID of the user
+        :param index: Position of the item in the import
+        :param movie_data: Movie data of the item
+        :return: Result dictionary with status 'duplicate'
+        """
+        error = DuplicateMovieError(user_id, movie_data['title'], movie_data.get('year'))
+        return {'index': index, 'title': movie_data['title'],
+                'status': 'duplicate', 'error': error.message}
+
     def _check_duplicate_movie(self, user_id, movie_data, exclude_movie_id=None):
         """
         Check for duplicate movies in user's collection.
@@ -285,14 +408,25 @@ class MovieService:
         :param exclude_movie_id: Movie ID to exclude from check (for updates)
         :return: None (raises exception if duplicate found)
         """
-        existing_movies = self.get_user_movies(user_id)
-        title = movie_data['title'].lower()
         year = movie_data.get('year')
+        try:
+            exists = self.data_manager.movie_exists(user_id, movie_data['title'], year,
+                                                    exclude_movie_id=exclude_movie_id)
+        except SQLAlchemyError as e:
+            raise DatabaseError('checking for duplicate movie', e)
 
-        for movie in existing_movies:
-            if exclude_movie_id and movie['id'] == exclude_movie_id:
-                continue
+        if exists:
+            raise DuplicateMovieError(user_id, movie_data['title'], year)
 
-            if (movie['title'].lower() == title and
-                    movie.get('year') == year):
-                raise DuplicateMovieError(user_id, movie_data['title'], year)
\ No newline at end of file
+    @staticmethod
+    def _is_duplicate_movie_error(error):
+        """
+        Check whether an IntegrityError comes from a movies uniqueness rule.
+
+        :param error: IntegrityError raised while writing a movie
+        :return: True if the write collided with an existing movie
+        """
+        message = str(error.orig)
+        return 'UNIQUE constraint failed' in message and (
+            'ux_movies_user_title_year' in message or 'movies.' in message
+        )
@@ -0,0 +1,213 @@
+"""
+OMDb Cache - Persistent cache of OMDb lookups.
+Stores movie data (and "Movie not found" answers) keyed by normalized title
+and year in a small SQLite file under instance/, so popular titles are looked
+up once per TTL instead of once per movie add. The least recently used
+entries are evicted once the cache exceeds its size bound.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import DatabaseConfig, OMDbCacheConfig
+from datamanager import normalize_title
+
+# Sentinel returned by OMDbCache.get() when a lookup is not cached
+MISS = object()
+
+
+class OMDbCache:
+    """Thread-safe persistent cache of OMDb lookups with hit/miss counters"""
+
+    def __init__(self, path=None, ttl=None, negative_ttl=None, max_entries=None):
+        """
+        Initialize OMDb cache. The database file is created on first use.
+
+        :param path: Path of the cache database file
+        :param ttl: Seconds a found movie stays cached
+        :param negative_ttl: Seconds a "Movie not found" answer stays cached
+        :param max_entries: Entries kept before least recently used ones are evicted
+        """
+        self.path = Path(path or Path(DatabaseConfig.INSTANCE_FOLDER) / OMDbCacheConfig.FILENAME)
+        self.ttl = ttl if ttl is not None else OMDbCacheConfig.TTL_SECONDS
+        self.negative_ttl = (negative_ttl if negative_ttl is not None
+                             else OMDbCacheConfig.NEGATIVE_TTL_SECONDS)
+        self.max_entries = max_entries or OMDbCacheConfig.MAX_ENTRIES
+        self._counters = {'hits': 0, 'negative_hits': 0, 'misses': 0,
+                          'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    @staticmethod
+    def cache_key(title, year=None):
+        """
+        Build the cache key of a lookup.
+
+        :param title: Movie title as entered
+        :param year: Optional release year
+        :return: Key string of normalized title and year
+        """
+        return f"{normalize_title(title)}|{year or ''}"
+
+    def get(self, title, year=None):
+        """
+        Look up a cached OMDb answer. An unreadable cache counts as a miss.
+
+        :param title: Movie title
+        :param year: Optional release year
+        :return: Movie data dictionary, None for a cached "not found", or MISS
+        """
+        key = self.cache_key(title, year)
+        now = time.time()
+
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    'SELECT payload FROM omdb_cache WHERE cache_key = ? AND expires_at > ?',
+                    (key, now)
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        'UPDATE omdb_cache SET last_used_at = ? WHERE cache_key = ?', (now, key)
+                    )
+        except sqlite3.Error as e:
+            print(f"Warning: OMDb cache unavailable: {e}")
+            row = None
+
+        if row is None:
+            self._count('misses')
+            return MISS
+        if row[0] is None:
+            self._count('negative_hits')
+            return None
+        self._count('hits')
+        return json.loads(row[0])
+
+    def put(self, title, year, movie_data):
+        """
+        Cache an OMDb answer, evicting least recently used entries if full.
+        Failing to write the cache is not an error for the caller.
+
+        :param title: Movie title
+        :param year: Optional release year
+        :param movie_data: Movie data dictionary, or None for "not found"
+        :return: None
+        """
+        now = time.time()
+        ttl = self.ttl if movie_data is not None else self.negative_ttl
+        payload = json.dumps(movie_data) if movie_data is not None else None
+
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO omdb_cache '
+                    '(cache_key, payload, expires_at, last_used_at) VALUES (?, ?, ?, ?)',
+                    (self.cache_key(title, year), payload, now + ttl, now)
+                )
+                evicted = self._evict(connection, now)
+        except sqlite3.Error as e:
+            print(f"Warning: OMDb cache unavailable: {e}")
+            return
+
+        self._count('stores')
+        self._count('evictions', evicted)
+
+    def clear(self):
+        """
+        Remove every cached entry.
+
+        :return: Number of entries removed
+        """
+        with self._connect() as connection:
+            return connection.execute('DELETE FROM omdb_cache').rowcount
+
+    def stats(self):
+        """
+        Get cache counters for this process and the current cache size.
+        A cache file that was never written counts as empty and is not created.
+
+        :return: Dictionary of counters, entry count and hit ratio
+        """
+        with self._lock:
+            stats = dict(self._counters)
+
+        stats['entries'] = 0
+        if self.path.exists():
+            with self._connect() as connection:
+                stats['entries'] = connection.execute(
+                    'SELECT count(*) FROM omdb_cache'
+                ).fetchone()[0]
+
+        lookups = stats['hits'] + stats['negative_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['negative_hits']) / lookups, 3) \
+            if lookups else 0.0
+        return stats
+
+    def _evict(self, connection, now):
+        """
+        Drop expired entries, then the least recently used beyond the size bound.
+
+        :param connection: Open cache connection
+        :param now: Current time in seconds
+        :return: Number of entries evicted
+        """
+        evicted = connection.execute(
+            'DELETE FROM omdb_cache WHERE expires_at <= ?', (now,)
+        ).rowcount
+
+        excess = connection.execute('SELECT count(*) FROM omdb_cache').fetchone()[0] \
+            - self.max_entries
+        if excess > 0:
+            evicted += connection.execute(
+                'DELETE FROM omdb_cache WHERE cache_key IN '
+                '(SELECT cache_key FROM omdb_cache ORDER BY last_used_at LIMIT ?)', (excess,)
+            ).rowcount
+        return evicted
+
+    def _count(self, counter, amount=1):
+        """Increment a process-wide counter"""
+        with self._lock:
+            self._counters[counter] += amount
+
+    @contextmanager
+    def _connect(self):
+        """
+        Open a connection to the cache database, creating its schema once.
+        The transaction commits when the block succeeds and the connection
+        is always closed.
+
+        :return: Context manager yielding a sqlite3 connection
+        """
+        if not self._schema_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=OMDbCacheConfig.BUSY_TIMEOUT)
+        try:
+            if not self._schema_ready:
+                self._create_schema(connection)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _create_schema(self, connection):
+        """Create the cache table and its eviction index if missing"""
+        connection.execute('PRAGMA journal_mode = WAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS omdb_cache ('
+                'cache_key TEXT PRIMARY KEY, '
+                'payload TEXT, '            # JSON movie data; NULL caches "not found"
+                'expires_at REAL NOT NULL, '
+                'last_used_at REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS ix_omdb_cache_last_used ON omdb_cache (last_used_at)'
+            )
+        self._schema_ready = True
+
+
+omdb_cache = OMDbCache()
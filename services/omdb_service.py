@@ -4,24 +4,49 @@ Integrates with OMDb API to fetch comprehensive movie information.
 """
 import os
 import requests
-from config import APIConfig
+from config import APIConfig, MetadataIndexConfig, OMDbCacheConfig
+from services.http_client import omdb_client
+from services.movie_metadata_index import movie_metadata_index
+from services.omdb_cache import MISS, OMDbCache, omdb_cache
+from services.single_flight import omdb_flights
+from exceptions import ExternalAPIError
+
+# OMDb's answer for titles it does not know; cached like a found movie
+_NOT_FOUND_ERROR = 'Movie not found!'
 
 
 class OMDbService:
     """Service to interact with OMDb API for movie data"""
 
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, cache=None, http_client=None, flights=None,
+                 metadata_index=None):
         """
         Initialize OMDb service with API key.
 
         :param api_key: OMDb API key
+        :param cache: OMDbCache for lookups (defaults to the shared cache when
+                      OMDbCacheConfig.ENABLED)
+        :param http_client: HTTPClient for OMDb requests (defaults to the shared one)
+        :param flights: SingleFlight coalescing concurrent identical lookups
+                        (defaults to the shared one)
+        :param metadata_index: MovieMetadataIndex consulted before the API
+                               (defaults to the shared index when
+                               MetadataIndexConfig.ENABLED)
         """
         self.api_key = api_key or os.getenv('OMDB_API_KEY')
         self.base_url = APIConfig.OMDB_BASE_URL
+        self.http_client = http_client or omdb_client
+        self.cache = cache or (omdb_cache if OMDbCacheConfig.ENABLED else None)
+        self.flights = flights or omdb_flights
+        self.metadata_index = metadata_index or (
+            movie_metadata_index if MetadataIndexConfig.ENABLED else None
+        )
 
     def search_movie(self, title, year=None):
         """
-        Search for a movie by title and optionally year.
+        Search for a movie by title and optionally year. Answers, including
+        "Movie not found", are served from and stored in the OMDb cache.
+        Concurrent lookups of the same title and year share one request.
 
         :param title: Movie title to search for
         :param year: Optional year to narrow search
@@ -31,6 +56,26 @@ class OMDbService:
             print("Warning: No OMDb API key provided. Skipping API call.")
             return None
 
+        if self.cache:
+            cached = self.cache.get(title, year)
+            if cached is not MISS:
+                return cached
+
+        try:
+            return self.flights.do(OMDbCache.cache_key(title, year),
+                                   self._fetch_movie, title, year)
+        except ExternalAPIError as e:
+            print(f"Error calling OMDb API: {e}")
+            return None
+
+    def _fetch_movie(self, title, year=None):
+        """
+        Request a movie from the OMDb API and cache the answer.
+
+        :param title: Movie title to search for
+        :param year: Optional year to narrow search
+        :return: Dictionary with movie data or None if not found
+        """
         try:
             params = {
                 'apikey': self.api_key,
@@ -42,17 +87,22 @@ class OMDbService:
             if year:
                 params['y'] = year
 
-            response = requests.get(self.base_url,
-                                    params=params,
-                                    timeout=APIConfig.OMDB_TIMEOUT)
+            response = self.http_client.get(self.base_url, params=params)
             response.raise_for_status()
 
             data = response.json()
 
             if data.get('Response') == 'True':
-                return self._extract_movie_data(data, title, year)
+                movie_data = self._extract_movie_data(data, title, year)
+                if self.cache:
+                    self.cache.put(title, year, movie_data)
+                return movie_data
             else:
-                print(f"Movie not found in OMDb: {data.get('Error', 'Unknown error')}")
+                error = data.get('Error', 'Unknown error')
+                print(f"Movie not found in OMDb: {error}")
+                # Only a definite "not found" is cached; key or quota errors are retried
+                if self.cache and error == _NOT_FOUND_ERROR:
+                    self.cache.put(title, year, None)
                 return None
 
         except requests.RequestException as e:
@@ -92,11 +142,14 @@ class OMDbService:
             'poster': data.get('Poster', '')
         }
 
-    def enhance_movie_data(self, movie_data):
+    def enhance_movie_data(self, movie_data, use_index=True):
         """
-        Enhance movie data with information from OMDb API.
+        Enhance movie data from the offline metadata index, or from the OMDb
+        API for movies the index does not know.
 
         :param movie_data: Dictionary with at least 'title' key
+        :param use_index: Consult the metadata index first (False when the
+                          caller already looked the movie up there)
         :return: Enhanced movie data dictionary
         """
         title = movie_data.get('title')
@@ -105,8 +158,30 @@ class OMDbService:
         if not title:
             return movie_data
 
-        omdb_data = self.search_movie(title, year)
+        omdb_data = (use_index and self.lookup_offline(title, year)) or self.search_movie(title, year)
+        return self.merge_movie_data(movie_data, omdb_data)
+
+    def lookup_offline(self, title, year=None):
+        """
+        Look a movie up in the offline metadata index only.
+
+        :param title: Movie title
+        :param year: Optional release year
+        :return: Dictionary with movie data, or None if not indexed
+        """
+        if not self.metadata_index:
+            return None
+        return self.metadata_index.lookup(title, year)
+
+    @staticmethod
+    def merge_movie_data(movie_data, omdb_data):
+        """
+        Fill in movie data from a lookup result without overwriting entered fields.
 
+        :param movie_data: Dictionary of entered movie data
+        :param omdb_data: Dictionary shaped like search_movie() results, or None
+        :return: Enhanced movie data dictionary
+        """
         if omdb_data:
             enhanced_data = movie_data.copy()
 
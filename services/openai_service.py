@@ -8,7 +8,8 @@ import re
 import requests
 from dotenv import load_dotenv
 
-from config import TriviaConfig, APIConfig
+from config import TriviaConfig, APIConfig, HTTPClientConfig
+from services.http_client import openai_client
 
 load_dotenv()
 
@@ -20,6 +21,7 @@ class OpenAIService:
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.base_url = "https://api.openai.com/v1/chat/completions"
         self.model = "gpt-3.5-turbo"
+        self.http_client = openai_client
 
     def generate_movie_trivia(self, movie_data):
         """
@@ -143,10 +145,9 @@ class OpenAIService:
 
         try:
             print("🤖 Generating trivia with OpenAI ChatGPT...")
-            response = requests.post(self.base_url,
-                                     json=payload,
-                                     headers=headers,
-                                     timeout=30)
+            response = self.http_client.post(self.base_url,
+                                             json=payload,
+                                             headers=headers)
 
             print(f"📡 OpenAI API Response Status: {response.status_code}")
 
@@ -250,10 +251,11 @@ class OpenAIService:
         }
 
         try:
-            response = requests.post(self.base_url,
-                                     json=payload,
-                                     headers=headers,
-                                     timeout=10)
+            response = self.http_client.post(self.base_url,
+                                             json=payload,
+                                             headers=headers,
+                                             timeout=(HTTPClientConfig.CONNECT_TIMEOUT,
+                                                      APIConfig.OPENAI_TEST_TIMEOUT))
 
             if response.status_code == 200:
                 print("✅ OpenAI API connection successful")
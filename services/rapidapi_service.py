@@ -9,7 +9,8 @@ import re
 import requests
 from dotenv import load_dotenv
 
-from config import TriviaConfig, APIConfig
+from config import TriviaConfig
+from services.http_client import rapidapi_client
 
 load_dotenv()
 
@@ -20,6 +21,7 @@ class RapidAPIService:
         """Initialize RapidAPI service with API key and usage tracker."""
         self.api_key = os.getenv('RAPIDAPI_KEY')
         self.base_url = "https://chatgpt-ai-chat-bot.p.rapidapi.com/ask"
+        self.http_client = rapidapi_client
 
         from .api_usage_tracker import APIUsageTracker
         self.usage_tracker = APIUsageTracker(limit=95)
@@ -155,10 +157,9 @@ class RapidAPIService:
 
         try:
             print("🤖 Generating trivia questions...")
-            response = requests.post(self.base_url,
-                                     json=payload,
-                                     headers=headers,
-                                     timeout=APIConfig.RAPIDAPI_TIMEOUT)
+            response = self.http_client.post(self.base_url,
+                                             json=payload,
+                                             headers=headers)
 
             self.usage_tracker.record_call()
             print(f"📡 API Response Status: {response.status_code}")
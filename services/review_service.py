@@ -4,8 +4,9 @@ Handles review CRUD operations with comprehensive validation and error handling.
 """
 from sqlalchemy.exc import SQLAlchemyError
 
-from config import ValidationConfig
+from config import LikeBufferConfig, ValidationConfig
 from datamanager import SQLiteDataManager
+from services.like_buffer import like_buffer
 from exceptions import (
     MovieNotFoundError, ReviewNotFoundError, ValidationError,
     DatabaseError
@@ -17,6 +18,7 @@ class ReviewService:
 
     def __init__(self):
         self.data_manager = SQLiteDataManager()
+        self.like_buffer = like_buffer if LikeBufferConfig.ENABLED else None
 
     def validate_review_data(self, review_data):
         """
@@ -94,15 +96,18 @@ class ReviewService:
         except SQLAlchemyError as e:
             raise DatabaseError('creating review', e)
 
-    def get_movie_reviews(self, movie_id):
+    def get_movie_reviews(self, movie_id, after_id=None, limit=None):
         """
-        Get all reviews for a specific movie.
+        Get reviews for a specific movie ordered by ID.
 
         :param movie_id: ID of the movie
+        :param after_id: Only return reviews with an ID greater than this
+        :param limit: Maximum number of reviews to return (None for all)
         :return: List of review dictionaries
         """
         try:
-            return self.data_manager.get_movie_reviews(movie_id)
+            reviews = self.data_manager.get_movie_reviews(movie_id, after_id=after_id, limit=limit)
+            return [self._with_pending_likes(review) for review in reviews]
         except SQLAlchemyError as e:
             raise DatabaseError('fetching reviews', e)
 
@@ -120,7 +125,7 @@ class ReviewService:
             result = self.data_manager.update_review(review_id, validated_data)
             if not result:
                 raise ReviewNotFoundError(review_id)
-            return result
+            return self._with_pending_likes(result)
         except SQLAlchemyError as e:
             raise DatabaseError('updating review', e)
 
@@ -143,13 +148,34 @@ class ReviewService:
         """
         Add like to review (increment like count).
 
+        With the like buffer enabled the like is counted in memory and written
+        with the next flush; the returned review already includes it.
+
         :param review_id: ID of the review to like
         :return: Dictionary representation of updated review
         """
         try:
-            result = self.data_manager.like_review(review_id)
+            if self.like_buffer:
+                result = self.data_manager.get_review_by_id(review_id)
+                if result and self.like_buffer.add(review_id):
+                    # The flush moved pending likes into the stored count
+                    result = self.data_manager.get_review_by_id(review_id)
+            else:
+                result = self.data_manager.like_review(review_id)
+
             if not result:
                 raise ReviewNotFoundError(review_id)
-            return result
+            return self._with_pending_likes(result)
         except SQLAlchemyError as e:
-            raise DatabaseError('liking review', e)
\ No newline at end of file
+            raise DatabaseError('liking review', e)
+
+    def _with_pending_likes(self, review):
+        """
+        Include likes still waiting in the like buffer in a review's count.
+
+        :param review: Review dictionary
+        :return: Review dictionary with an up-to-date like count
+        """
+        if self.like_buffer:
+            return self.like_buffer.apply_pending(review)
+        return review
\ No newline at end of file
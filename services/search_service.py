@@ -0,0 +1,58 @@
+"""
+Search Service - Business logic for full-text search.
+Validates search input and pages ranked results from the FTS5 index over
+movie titles, directors, genres and review content.
+"""
+from sqlalchemy.exc import SQLAlchemyError
+
+from config import SearchConfig
+from datamanager import SQLiteDataManager
+from services.entity_resolver import EntityResolver
+from exceptions import ValidationError, DatabaseError
+
+
+class SearchService:
+    """Service class for handling search-related business logic"""
+
+    def __init__(self):
+        """Initialize search service with data manager."""
+        self.data_manager = SQLiteDataManager()
+        self.entity_resolver = EntityResolver(self.data_manager)
+
+    def validate_query(self, query):
+        """
+        Validate a search query.
+
+        :param query: Search text
+        :return: Cleaned search text
+        """
+        query = ' '.join((query or '').split())
+        if not query:
+            raise ValidationError('q', 'Search query is required')
+
+        if len(query) > SearchConfig.QUERY_MAX_LENGTH:
+            raise ValidationError(
+                'q', f'Search query must be at most {SearchConfig.QUERY_MAX_LENGTH} characters'
+            )
+
+        return query
+
+    def search(self, query, user_id=None, offset=0, limit=None):
+        """
+        Search movies and reviews, best matches first.
+
+        :param query: Search text
+        :param user_id: Only search this user's collection (None for everyone's)
+        :param offset: Number of ranked results to skip
+        :param limit: Maximum number of results to return (None for all)
+        :return: List of search result dictionaries
+        """
+        query = self.validate_query(query)
+        if user_id is not None:
+            self.entity_resolver.resolve_user(user_id)
+
+        try:
+            return self.data_manager.search(query, user_id=user_id,
+                                            offset=offset, limit=limit)
+        except SQLAlchemyError as e:
+            raise DatabaseError('searching', e)
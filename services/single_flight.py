@@ -0,0 +1,116 @@
+"""
+Single Flight - Coalescing of concurrent identical external lookups.
+When many requests ask for the same thing at once (a trending title being
+added by several users, collection trivia for the same movies), only the
+first caller performs the external call; the others wait for it and share
+its result or its error.
+"""
+import copy
+import threading
+
+from config import SingleFlightConfig
+from exceptions import ExternalAPIError
+
+
+class _Call:
+    """An in-flight call and the outcome its waiters receive"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time, sharing it with concurrent callers"""
+
+    def __init__(self, name, timeout=None):
+        """
+        Initialize single-flight group.
+
+        :param name: Service name used in metrics and timeout errors
+        :param timeout: Seconds a waiting caller waits for the in-flight call
+                        (None waits indefinitely)
+        """
+        self.name = name
+        self.timeout = timeout
+        self._calls = {}
+        self._counters = {'calls': 0, 'coalesced': 0, 'errors': 0, 'timeouts': 0}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Call fn unless an identical call is in flight, in which case wait for
+        that call instead. Waiters receive a copy of the result, or the
+        exception the call raised.
+
+        :param key: Hashable key of normalized request parameters
+        :param fn: Callable performing the lookup
+        :param args: Positional arguments for fn
+        :param kwargs: Keyword arguments for fn
+        :return: Result of fn
+        :raises ExternalAPIError: If waiting for the in-flight call timed out
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters['calls'] += 1
+            else:
+                self._counters['coalesced'] += 1
+
+        if leader:
+            return self._run(key, call, fn, args, kwargs)
+
+        if not call.done.wait(self.timeout):
+            self._count('timeouts')
+            raise ExternalAPIError(
+                self.name, f"Timed out after {self.timeout}s waiting for an identical request"
+            )
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    def stats(self):
+        """
+        Get counters for this process and the number of calls in flight.
+
+        :return: Dictionary of counters
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+    def _run(self, key, call, fn, args, kwargs):
+        """
+        Perform a call as its leader and release its waiters.
+
+        :return: Result of fn
+        """
+        try:
+            result = fn(*args, **kwargs)
+            # Waiters copy a snapshot, unaffected by what the leader's caller does next
+            call.result = copy.deepcopy(result)
+            return result
+        except Exception as e:
+            call.error = e
+            self._count('errors')
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _count(self, counter):
+        """Increment a process-wide counter"""
+        with self._lock:
+            self._counters[counter] += 1
+
+
+# Shared groups, one per kind of external lookup
+omdb_flights = SingleFlight('OMDb', timeout=SingleFlightConfig.OMDB_WAIT_TIMEOUT)
+trivia_flights = SingleFlight('Trivia', timeout=SingleFlightConfig.TRIVIA_WAIT_TIMEOUT)
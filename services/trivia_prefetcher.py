@@ -0,0 +1,208 @@
+"""
+Trivia Prefetcher - Background generation of movie trivia before it is played.
+Movie adds queue movies the question bank does not cover yet; a small thread
+pool generates questions into the bank so the first game of a movie starts
+from banked questions instead of waiting on RapidAPI or OpenAI. Generation
+stops while the monthly RapidAPI quota is down to its reserve, leaving the
+remaining calls to interactive games.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from config import TriviaBankConfig, TriviaPrefetchConfig
+from datamanager import normalize_title
+
+
+class TriviaPrefetcher:
+    """Thread pool filling the question bank of newly added movies"""
+
+    def __init__(self, trivia_service=None, workers=None, reserve=None):
+        """
+        Initialize trivia prefetcher. Threads start with the first queued movie.
+
+        :param trivia_service: Trivia service used for generation (created on first use)
+        :param workers: Number of worker threads
+        :param reserve: RapidAPI calls per month that prefetching leaves unused
+        """
+        self._trivia_service = trivia_service
+        self.workers = workers or TriviaPrefetchConfig.WORKERS
+        self.reserve = TriviaPrefetchConfig.QUOTA_RESERVE if reserve is None else reserve
+        self._executor = None
+        self._queued = {}
+        self._counters = {'enqueued': 0, 'generations': 0, 'banked': 0,
+                          'skipped': 0, 'deferred': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def trivia_service(self):
+        """Trivia service used for generation, created on first use"""
+        if self._trivia_service is None:
+            # Imported here: trivia_service imports utils, which imports movie_service
+            from services.trivia_service import TriviaService
+            self._trivia_service = TriviaService()
+        return self._trivia_service
+
+    def can_generate(self):
+        """
+        Check whether any trivia API is configured.
+
+        :return: True if RapidAPI or OpenAI has an API key
+        """
+        service = self.trivia_service
+        return bool(service.rapidapi_service.api_key or service.openai_service.api_key)
+
+    def enqueue(self, app, movie):
+        """
+        Queue question generation for a movie the question bank does not cover.
+        A movie already queued under the same title and year is not queued again.
+
+        :param app: Flask application providing the database context
+        :param movie: Movie dictionary with at least 'title'
+        :return: Future resolving to the prefetch outcome, or None if nothing was queued
+        """
+        if not self.can_generate() or not self.trivia_service.needs_questions(movie):
+            return None
+        return self._submit(app, movie)
+
+    def backfill(self, app, limit=None):
+        """
+        Queue every movie whose question bank is thin, those in the most
+        collections first.
+
+        :param app: Flask application providing the database context
+        :param limit: Maximum number of movies to queue (None for all)
+        :return: Number of movies queued
+        """
+        if not self.can_generate():
+            return 0
+
+        movies = self.trivia_service.data_manager.get_movies_needing_trivia(
+            TriviaBankConfig.MIN_QUESTIONS, limit=limit
+        )
+        for movie in movies:
+            self._submit(app, movie)
+        return len(movies)
+
+    def drain(self, timeout=None):
+        """
+        Wait for the queued movies to be processed.
+
+        :param timeout: Seconds to wait at most (None waits until done)
+        :return: True if the queue is empty
+        """
+        with self._lock:
+            futures = list(self._queued.values())
+        _, pending = wait(futures, timeout=timeout)
+        return not pending
+
+    def status(self):
+        """
+        Get queue size, outcome counters for this process and the quota left.
+
+        :return: Dictionary of queue status
+        """
+        with self._lock:
+            status = dict(self._counters)
+            status['queued'] = len(self._queued)
+        status['workers'] = self.workers
+        status['quota'] = {'remaining': self._quota_remaining(), 'reserve': self.reserve}
+        return status
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker threads, by default after the queued movies are done.
+        Without waiting, queued movies that have not started are dropped.
+        A later enqueue starts a new pool.
+
+        :param wait: Wait for queued generations to finish
+        :return: None
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _submit(self, app, movie):
+        """
+        Queue a movie unless its title and year are already queued.
+
+        :return: Future resolving to the prefetch outcome
+        """
+        key = (normalize_title(movie['title']), movie.get('year') or 0)
+        with self._lock:
+            if key in self._queued:
+                return self._queued[key]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='trivia-prefetch')
+            future = self._executor.submit(self._prefetch, app, dict(movie))
+            self._queued[key] = future
+            self._counters['enqueued'] += 1
+
+        future.add_done_callback(lambda _: self._dequeue(key))
+        return future
+
+    def _dequeue(self, key):
+        """Forget a processed movie"""
+        with self._lock:
+            self._queued.pop(key, None)
+
+    def _prefetch(self, app, movie):
+        """
+        Generate questions until the movie's bank is covered, the quota reserve
+        is reached or MAX_GENERATIONS attempts were made.
+
+        :param app: Flask application providing the database context
+        :param movie: Movie dictionary
+        :return: Outcome: 'banked', 'skipped', 'deferred' or 'failed'
+        """
+        with app.app_context():
+            try:
+                if not self.trivia_service.needs_questions(movie):
+                    return self._finish('skipped')
+
+                for _ in range(TriviaPrefetchConfig.MAX_GENERATIONS):
+                    if not self._quota_allows():
+                        print(f"⏸️ Trivia prefetch for {movie['title']} deferred "
+                              f"to keep {self.reserve} RapidAPI calls in reserve")
+                        return self._finish('deferred')
+
+                    self._count('generations')
+                    if self.trivia_service.generate_bank_questions(movie) == "none":
+                        return self._finish('failed')
+                    if not self.trivia_service.needs_questions(movie):
+                        return self._finish('banked')
+            except Exception as e:
+                print(f"Warning: Trivia prefetch for {movie['title']} failed: {e}")
+            return self._finish('failed')
+
+    def _quota_allows(self):
+        """
+        Check that a generation would not dip into the RapidAPI quota reserve.
+        Without a RapidAPI key generation goes straight to OpenAI, which has
+        no tracked quota.
+
+        :return: True if prefetching may generate now
+        """
+        remaining = self._quota_remaining()
+        return remaining is None or remaining > self.reserve
+
+    def _quota_remaining(self):
+        """RapidAPI calls left this month, or None without a RapidAPI key"""
+        rapidapi = self.trivia_service.rapidapi_service
+        if not rapidapi.api_key:
+            return None
+        return rapidapi.usage_tracker.get_usage_stats()['remaining']
+
+    def _finish(self, outcome):
+        """Count a prefetch outcome and return it"""
+        self._count(outcome)
+        return outcome
+
+    def _count(self, counter):
+        """Increment a process-wide counter"""
+        with self._lock:
+            self._counters[counter] += 1
+
+
+trivia_prefetcher = TriviaPrefetcher()
@@ -2,13 +2,14 @@
 Trivia Service - Business logic for trivia operations.
 Handles trivia generation, scoring, and leaderboard operations.
 """
-from config import TriviaConfig, LeaderboardConfig
-from datamanager import SQLiteDataManager
+from config import TriviaConfig, TriviaBankConfig, LeaderboardConfig
+from datamanager import SQLiteDataManager, normalize_title
+from services.entity_resolver import EntityResolver
 from services.openai_service import OpenAIService
 from services.rapidapi_service import RapidAPIService
+from services.single_flight import trivia_flights
 from exceptions import (
-    TriviaError, InsufficientMoviesError, UserNotFoundError,
-    MovieNotFoundError, ExternalAPIError
+    TriviaError, InsufficientMoviesError, ExternalAPIError
 )
 from utils.template_helpers import format_percentage, get_performance_badge
 
@@ -19,8 +20,10 @@ class TriviaService:
     def __init__(self):
         """Initialize trivia service with data manager and API services."""
         self.data_manager = SQLiteDataManager()
+        self.entity_resolver = EntityResolver(self.data_manager)
         self.rapidapi_service = RapidAPIService()
         self.openai_service = OpenAIService()
+        self.flights = trivia_flights
 
     # ==================== VALIDATION METHODS ====================
 
@@ -31,11 +34,7 @@ class TriviaService:
         :param user_id: ID of the user to validate
         :return: User dictionary if found
         """
-        users = self.data_manager.get_all_users()
-        user = next((u for u in users if u['id'] == user_id), None)
-        if not user:
-            raise UserNotFoundError(user_id)
-        return user
+        return self.entity_resolver.resolve_user(user_id)
 
     def validate_movie(self, user_id, movie_id):
         """
@@ -45,11 +44,7 @@ class TriviaService:
         :param movie_id: ID of the movie to validate
         :return: Movie dictionary if found
         """
-        movies = self.data_manager.get_user_movies(user_id)
-        movie = next((m for m in movies if m['id'] == movie_id), None)
-        if not movie:
-            raise MovieNotFoundError(movie_id)
-        return movie
+        return self.entity_resolver.resolve_user_movie(user_id, movie_id)
 
     def validate_collection_trivia_requirements(self, user_id):
         """
@@ -136,6 +131,43 @@ class TriviaService:
     def _generate_trivia_with_fallback(self, trivia_type, data):
         """
         Generate trivia with automatic fallback from RapidAPI to OpenAI.
+        Movie trivia is drawn from the question bank once it holds enough
+        questions for the movie. Concurrent requests for the same movie or
+        movie set share one generation.
+
+        :param trivia_type: Type of trivia ('movie' or 'collection')
+        :param data: Movie data or movies list depending on type
+        :return: Tuple of (trivia_data, api_used)
+        """
+        if trivia_type == 'movie':
+            questions = self._draw_from_bank(data)
+            if questions:
+                return {'questions': questions}, "bank"
+
+        try:
+            return self.flights.do(self._flight_key(trivia_type, data),
+                                   self._generate_with_fallback, trivia_type, data)
+        except ExternalAPIError as e:
+            print(f"⚠️ {e}")
+            return None, "none"
+
+    @staticmethod
+    def _flight_key(trivia_type, data):
+        """
+        Build the key under which identical trivia generations are coalesced.
+
+        :param trivia_type: Type of trivia ('movie' or 'collection')
+        :param data: Movie data or movies list depending on type
+        :return: Hashable key of trivia type and normalized titles and years
+        """
+        movies = [data] if trivia_type == 'movie' else data
+        return (trivia_type,) + tuple(sorted(
+            (normalize_title(movie['title']), movie.get('year') or 0) for movie in movies
+        ))
+
+    def _generate_with_fallback(self, trivia_type, data):
+        """
+        Request trivia from RapidAPI, falling back to OpenAI.
 
         :param trivia_type: Type of trivia ('movie' or 'collection')
         :param data: Movie data or movies list depending on type
@@ -144,13 +176,13 @@ class TriviaService:
         # Try RapidAPI first
         trivia_data, api_used = self._try_rapidapi_generation(trivia_type, data)
 
-        if trivia_data and trivia_data.get('questions'):
-            return trivia_data, api_used
-
-        # Fallback to OpenAI
-        print("⚠️ RapidAPI failed, trying fallback...")
-        trivia_data, api_used = self._try_openai_generation(trivia_type, data)
+        if not (trivia_data and trivia_data.get('questions')):
+            # Fallback to OpenAI
+            print("⚠️ RapidAPI failed, trying fallback...")
+            trivia_data, api_used = self._try_openai_generation(trivia_type, data)
 
+        if trivia_type == 'movie' and trivia_data and trivia_data.get('questions'):
+            self._add_to_bank(data, trivia_data['questions'], api_used)
         return trivia_data, api_used
 
     def _try_rapidapi_generation(self, trivia_type, data):
@@ -207,6 +239,99 @@ class TriviaService:
             print(f"❌ OpenAI fallback error: {e}")
             return None, "none"
 
+    # ==================== QUESTION BANK ====================
+
+    def needs_questions(self, movie):
+        """
+        Check whether a movie's question bank is too thin to draw games from.
+
+        :param movie: Movie dictionary
+        :return: True if new questions should be generated for the movie
+        """
+        banked = self.data_manager.count_trivia_questions(movie['title'], movie.get('year'))
+        return banked < TriviaBankConfig.MIN_QUESTIONS
+
+    def generate_bank_questions(self, movie):
+        """
+        Generate one set of movie trivia questions into the question bank,
+        sharing any identical generation already in flight.
+
+        :param movie: Movie dictionary
+        :return: API that generated the questions ('none' if generation failed)
+        """
+        try:
+            _, api_used = self.flights.do(self._flight_key('movie', movie),
+                                          self._generate_with_fallback, 'movie', movie)
+        except ExternalAPIError as e:
+            print(f"⚠️ {e}")
+            return "none"
+        return api_used
+
+    def _draw_from_bank(self, movie):
+        """
+        Draw a random movie trivia set from the question bank.
+
+        :param movie: Movie dictionary
+        :return: List of questions, or None if the movie's bank is too thin
+        """
+        if not TriviaBankConfig.ENABLED:
+            return None
+
+        try:
+            questions, banked = self.data_manager.draw_trivia_questions(
+                movie['title'], movie.get('year'), TriviaConfig.MOVIE_QUESTIONS
+            )
+        except Exception as e:
+            print(f"⚠️ Question bank unavailable: {e}")
+            return None
+
+        if banked < TriviaBankConfig.MIN_QUESTIONS:
+            return None
+        print(f"🏦 Drew {len(questions)} of {banked} banked questions")
+        return questions
+
+    def _add_to_bank(self, movie, questions, api_used):
+        """
+        Store well-formed generated questions in the movie's question bank.
+        Failing to bank questions does not affect the game.
+
+        :param movie: Movie dictionary
+        :param questions: Generated question dictionaries
+        :param api_used: API that generated the questions
+        :return: Number of questions added
+        """
+        if not TriviaBankConfig.ENABLED:
+            return 0
+
+        valid = [question for question in questions if self._is_bankable(question)]
+        try:
+            added = self.data_manager.add_trivia_questions(
+                movie['title'], movie.get('year'), valid, api_used
+            )
+        except Exception as e:
+            print(f"⚠️ Failed to bank trivia questions: {e}")
+            return 0
+
+        print(f"🏦 Banked {added} new questions")
+        return added
+
+    @staticmethod
+    def _is_bankable(question):
+        """
+        Check that a generated question is complete enough to be reused.
+
+        :param question: Question dictionary
+        :return: True if the question has text, options and a valid answer index
+        """
+        if not isinstance(question, dict):
+            return False
+        options = question.get('options')
+        correct = question.get('correct')
+        return (isinstance(question.get('question'), str) and question['question'].strip() != ''
+                and isinstance(options, list) and len(options) >= 2
+                and isinstance(correct, int) and not isinstance(correct, bool)
+                and 0 <= correct < len(options))
+
     # ==================== GAME PROCESSING ====================
 
     def process_trivia_answer(self, trivia_session, user_answer):
@@ -6,6 +6,7 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from config import ValidationConfig
 from datamanager import SQLiteDataManager
+from services.entity_resolver import EntityResolver
 from exceptions import UserNotFoundError, ValidationError, DatabaseError
 
 
@@ -15,6 +16,7 @@ class UserService:
     def __init__(self):
         """Initialize user service with data manager."""
         self.data_manager = SQLiteDataManager()
+        self.entity_resolver = EntityResolver(self.data_manager)
 
     def validate_email(self, email):
         """
@@ -74,14 +76,16 @@ class UserService:
 
     # ==================== USER OPERATIONS ====================
 
-    def get_all_users(self):
+    def get_all_users(self, after_id=None, limit=None):
         """
-        Get all users with error handling.
+        Get users ordered by ID with error handling.
 
+        :param after_id: Only return users with an ID greater than this
+        :param limit: Maximum number of users to return (None for all)
         :return: List of user dictionaries
         """
         try:
-            return self.data_manager.get_all_users()
+            return self.data_manager.get_all_users(after_id=after_id, limit=limit)
         except SQLAlchemyError as e:
             raise DatabaseError('fetching users', e)
 
@@ -92,11 +96,7 @@ class UserService:
         :param user_id: ID of the user to retrieve
         :return: User dictionary
         """
-        users = self.get_all_users()
-        user = next((u for u in users if u['id'] == user_id), None)
-        if not user:
-            raise UserNotFoundError(user_id)
-        return user
+        return self.entity_resolver.resolve_user(user_id)
 
     def create_user(self, user_data):
         """
@@ -11,6 +11,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import threading
 import time
+from sqlalchemy import event
 
 # Add project root to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -65,6 +66,22 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def query_counter(app):
+    """Record every SQL statement executed against the test database"""
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+
+    event.listen(engine, 'before_cursor_execute', record_statement)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', record_statement)
+
+
 @pytest.fixture
 def user_service(app):
     """User service instance for testing"""
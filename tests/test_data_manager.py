@@ -0,0 +1,825 @@
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy import text, update
+from sqlalchemy.exc import IntegrityError
+
+from config import DatabaseConfig
+from datamanager import (
+    db, init_database, Movie, Review, SQLiteDataManager, TriviaQuestion, TriviaScore,
+    TriviaScoreRollup, User
+)
+from datamanager.projections import sqlite_timestamp_to_iso
+
+
+def explain_query_plan(statement):
+    """Return the EXPLAIN QUERY PLAN detail lines for a captured statement"""
+    parameters = tuple(None for _ in range(statement.count('?')))
+    rows = db.session.connection().exec_driver_sql(
+        f'EXPLAIN QUERY PLAN {statement}', parameters
+    ).fetchall()
+    return [row[-1] for row in rows]
+
+
+@pytest.fixture
+def data_manager(app):
+    """SQLite data manager instance for testing"""
+    with app.app_context():
+        return SQLiteDataManager()
+
+
+class TestConnectionProfile:
+    """Test that the SQLite PRAGMA profile is applied to new connections"""
+
+    @pytest.mark.parametrize('pragma, expected', [
+        ('journal_mode', 'wal'),
+        ('synchronous', 1),
+        ('busy_timeout', 5000),
+        ('cache_size', -20000),
+        ('temp_store', 2),
+    ])
+    def test_pragma_applied(self, app, pragma, expected):
+        """Test that each configured PRAGMA is in effect on a pooled connection"""
+        with app.app_context():
+            connection = db.session.connection()
+            assert connection.exec_driver_sql(f'PRAGMA {pragma}').scalar() == expected
+
+    def test_pool_settings_applied(self, app):
+        """Test that the engine pool uses the configured size"""
+        with app.app_context():
+            assert db.engine.pool.size() == DatabaseConfig.POOL_SIZE
+
+
+class TestQueryPlans:
+    """Test that hot read paths are served by indexes"""
+
+    @pytest.mark.parametrize('read_leaderboard', [
+        lambda dm: dm.get_global_leaderboard(20),
+        lambda dm: dm.get_collection_leaderboard(20),
+        lambda dm: dm.get_movie_leaderboard(1, 15),
+    ], ids=['global', 'collection', 'movie'])
+    def test_leaderboard_uses_index_without_sort(self, app, data_manager,
+                                                 query_counter, read_leaderboard):
+        """Test that leaderboard queries walk an index instead of sorting"""
+        with app.app_context():
+            read_leaderboard(data_manager)
+
+            plans = [explain_query_plan(q) for q in list(query_counter)]
+            assert plans
+            for plan in plans:
+                assert not any('TEMP B-TREE' in line for line in plan)
+                assert any('USING INDEX' in line for line in plan)
+
+    def test_leaderboard_rebuild_uses_index(self, app, data_manager, query_counter):
+        """Test that rebuilding global and collection boards merges score and rollup indexes"""
+        with app.app_context():
+            data_manager.rebuild_leaderboards()
+
+            statements = [q for q in list(query_counter)
+                          if q.startswith('INSERT INTO leaderboard_entries')]
+            for statement in statements[:2]:
+                plan = explain_query_plan(statement)
+                assert not any('TEMP B-TREE' in line for line in plan)
+                assert any('trivia_scores USING INDEX' in line for line in plan)
+                assert any('trivia_score_rollups USING INDEX' in line for line in plan)
+
+    def test_user_movies_uses_index(self, app, data_manager, created_user, query_counter):
+        """Test that loading a collection searches movies by indexed user_id"""
+        with app.app_context():
+            data_manager.get_user_movies(created_user['id'])
+
+            plan_lines = [line for q in list(query_counter) if 'FROM movies' in q
+                          for line in explain_query_plan(q)]
+            assert any(line.startswith('SEARCH movies USING') for line in plan_lines)
+
+    def test_user_movies_page_uses_index_without_sort(self, app, data_manager,
+                                                      created_user, query_counter):
+        """Test that a keyset page of a collection is an index range scan"""
+        with app.app_context():
+            data_manager.get_user_movies(created_user['id'], after_id=10, limit=5)
+
+            plan_lines = [line for q in list(query_counter) if 'FROM movies' in q
+                          for line in explain_query_plan(q)]
+            assert any(line.startswith('SEARCH movies USING') for line in plan_lines)
+            assert not any('TEMP B-TREE' in line for line in plan_lines)
+
+    def test_movie_exists_probes_unique_index(self, app, data_manager, created_movie,
+                                              query_counter):
+        """Test that duplicate checks are a single probe of the normalized title index"""
+        with app.app_context():
+            assert data_manager.movie_exists(created_movie['user_id'],
+                                             created_movie['title'].upper(),
+                                             created_movie['year'])
+
+            assert len(query_counter) == 1
+            plan = explain_query_plan(query_counter[0])
+            assert any('ux_movies_user_title_year' in line for line in plan)
+
+    def test_movie_reviews_uses_index(self, app, data_manager, query_counter):
+        """Test that loading reviews searches by the movie_id index"""
+        with app.app_context():
+            data_manager.get_movie_reviews(1)
+
+            plan_lines = [line for q in list(query_counter)
+                          for line in explain_query_plan(q)]
+            assert any('reviews USING INDEX ix_reviews_movie_id' in line
+                       for line in plan_lines)
+
+    def test_user_trivia_stats_uses_index(self, app, data_manager, created_user, query_counter):
+        """Test that user stats aggregate and read recent scores via the user index"""
+        with app.app_context():
+            data_manager.get_user_trivia_stats(created_user['id'])
+
+            plans = [explain_query_plan(q) for q in list(query_counter)
+                     if 'FROM trivia_scores' in q]
+            assert plans
+            for plan in plans:
+                assert not any('TEMP B-TREE' in line for line in plan)
+                assert any('ix_trivia_scores_user_recent' in line for line in plan)
+
+
+class TestNormalizedTitles:
+    """Test database-enforced duplicate detection"""
+
+    def test_unique_index_rejects_recased_title(self, app, data_manager, created_movie):
+        """Test that the database itself rejects a recased duplicate"""
+        with app.app_context():
+            with pytest.raises(IntegrityError):
+                data_manager.add_user_movie(created_movie['user_id'], {
+                    'title': created_movie['title'].swapcase(),
+                    'year': created_movie['year']
+                })
+
+    def test_unique_index_treats_missing_year_as_one_value(self, app, data_manager, created_user):
+        """Test that two movies without a year still collide"""
+        with app.app_context():
+            data_manager.add_user_movie(created_user['id'], {'title': 'Yearless'})
+            with pytest.raises(IntegrityError):
+                data_manager.add_user_movie(created_user['id'], {'title': 'YEARLESS'})
+
+    def test_title_update_renormalizes(self, app, data_manager, created_movie):
+        """Test that renaming a movie updates its normalized title"""
+        with app.app_context():
+            data_manager.update_movie(created_movie['id'], {'title': 'Renamed  Movie'})
+
+            assert db.session.get(Movie, created_movie['id']).normalized_title == 'renamed movie'
+
+    def test_migration_backfills_existing_movies(self, tmp_path):
+        """Test that databases without the column are migrated and backfilled"""
+        db_path = tmp_path / 'legacy.sqlite'
+        connection = sqlite3.connect(db_path)
+        connection.executescript("""
+            CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL,
+                                email VARCHAR(120) NOT NULL UNIQUE);
+            CREATE TABLE movies (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL,
+                                 director VARCHAR(100), year INTEGER, rating FLOAT,
+                                 genre VARCHAR(100), poster VARCHAR(500),
+                                 user_id INTEGER NOT NULL REFERENCES users (id),
+                                 CONSTRAINT unique_user_movie UNIQUE (user_id, title, year));
+            INSERT INTO users VALUES (1, 'Legacy', 'legacy@example.com');
+            INSERT INTO movies (id, title, year, user_id) VALUES
+                (1, 'The Matrix', 1999, 1), (2, 'THE MATRIX', 1999, 1), (3, 'Heat', NULL, 1);
+        """)
+        connection.close()
+
+        legacy_app = Flask(__name__)
+        legacy_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+        init_database(legacy_app)
+
+        with legacy_app.app_context():
+            titles = dict(db.session.query(Movie.id, Movie.normalized_title))
+            assert titles == {1: 'the matrix', 2: 'the matrix #2', 3: 'heat'}
+            assert SQLiteDataManager().movie_exists(1, 'the MATRIX', 1999)
+            db.session.remove()
+            db.engine.dispose()
+
+
+class TestProjections:
+    """Test that projection reads return exactly what to_dict() would"""
+
+    def test_list_reads_match_to_dict(self, app, data_manager, created_user,
+                                      created_movie, created_review):
+        """Test users, movies and reviews projections against ORM serialization"""
+        with app.app_context():
+            data_manager.like_review(created_review['id'])
+
+            assert data_manager.get_all_users() == \
+                [u.to_dict() for u in User.query.order_by(User.id)]
+            assert data_manager.get_user_movies(created_user['id']) == \
+                [m.to_dict() for m in Movie.query.filter_by(user_id=created_user['id'])]
+            assert data_manager.get_movie_reviews(created_movie['id']) == \
+                [r.to_dict() for r in Review.query.filter_by(movie_id=created_movie['id'])]
+
+    def test_score_reads_match_to_dict(self, app, data_manager, created_user, created_movie):
+        """Test leaderboard and recent score projections against ORM serialization"""
+        with app.app_context():
+            save_scores(data_manager, created_user['id'], [70, 90],
+                        movie_id=created_movie['id'])
+            scores = {s.id: s.to_dict() for s in TriviaScore.query}
+
+            board = data_manager.get_global_leaderboard(20)
+            recent = data_manager.get_user_trivia_stats(created_user['id'])['recent_scores']
+
+            assert board == [{**scores[e['id']], 'user_name': created_user['name']}
+                             for e in board]
+            assert recent == [scores[s['id']] for s in recent]
+
+    @pytest.mark.parametrize('stored, expected', [
+        ('2024-05-01 12:30:45', datetime(2024, 5, 1, 12, 30, 45).isoformat()),
+        ('2024-05-01 12:30:45.000000', datetime(2024, 5, 1, 12, 30, 45).isoformat()),
+        ('2024-05-01 12:30:45.123400', datetime(2024, 5, 1, 12, 30, 45, 123400).isoformat()),
+        (None, None),
+    ])
+    def test_sqlite_timestamp_to_iso(self, stored, expected):
+        """Test that stored timestamps convert to datetime.isoformat() output"""
+        assert sqlite_timestamp_to_iso(stored) == expected
+
+
+class TestSearchIndex:
+    """Test that the FTS5 search index follows writes"""
+
+    def test_index_follows_updates_and_deletes(self, app, data_manager, created_user):
+        """Test that renamed and deleted movies leave the index"""
+        with app.app_context():
+            movie = data_manager.add_user_movie(created_user['id'], {'title': 'Alien'})
+            review = data_manager.add_review(movie['id'], {'content': 'Xenomorph nightmare'})
+
+            data_manager.update_movie(movie['id'], {'title': 'Predator'})
+            data_manager.update_review(review['id'], {'content': 'Space marines'})
+            assert data_manager.search('alien') == []
+            assert data_manager.search('xenomorph') == []
+            assert [r['type'] for r in data_manager.search('predator')] == ['movie']
+            assert [r['type'] for r in data_manager.search('marines')] == ['review']
+
+            data_manager.delete_user(created_user['id'])
+            assert data_manager.search('predator') == []
+            assert data_manager.search('marines') == []
+
+    def test_query_syntax_is_matched_literally(self, app, data_manager, created_user):
+        """Test that FTS5 operators and quotes in user input cannot break the query"""
+        with app.app_context():
+            data_manager.add_user_movie(created_user['id'], {'title': 'Mission: Impossible'})
+
+            assert len(data_manager.search('mission: "impossible')) == 1
+            assert data_manager.search('NOT OR (') == []
+
+    def test_index_built_for_existing_rows(self, tmp_path):
+        """Test that a database created before search gets its rows indexed"""
+        db_path = tmp_path / 'legacy.sqlite'
+        connection = sqlite3.connect(db_path)
+        connection.executescript("""
+            CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL,
+                                email VARCHAR(120) NOT NULL UNIQUE);
+            CREATE TABLE movies (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL,
+                                 director VARCHAR(100), year INTEGER, rating FLOAT,
+                                 genre VARCHAR(100), poster VARCHAR(500),
+                                 user_id INTEGER NOT NULL REFERENCES users (id));
+            INSERT INTO users VALUES (1, 'Legacy', 'legacy@example.com');
+            INSERT INTO movies (id, title, director, user_id)
+                VALUES (1, 'Blade Runner', 'Ridley Scott', 1);
+        """)
+        connection.close()
+
+        legacy_app = Flask(__name__)
+        legacy_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+        init_database(legacy_app)
+
+        with legacy_app.app_context():
+            results = SQLiteDataManager().search('ridley')
+            assert [(r['type'], r['id']) for r in results] == [('movie', 1)]
+            db.session.remove()
+            db.engine.dispose()
+
+
+class TestReviewAggregates:
+    """Test the per-movie review aggregates maintained on review writes"""
+
+    @staticmethod
+    def aggregates(data_manager, movie_id):
+        """Read a movie's (review_count, avg_reviewer_rating, total_likes)"""
+        movie, _ = data_manager.get_movie_with_owner(movie_id)
+        return movie['review_count'], movie['avg_reviewer_rating'], movie['total_likes']
+
+    def test_review_writes_maintain_aggregates(self, app, data_manager, created_movie):
+        """Test add, update, like and delete against the expected aggregates"""
+        movie_id = created_movie['id']
+        with app.app_context():
+            assert self.aggregates(data_manager, movie_id) == (0, None, 0)
+
+            first = data_manager.add_review(movie_id, {'content': 'Good', 'reviewer_rating': 6})
+            second = data_manager.add_review(movie_id, {'content': 'Unrated'})
+            third = data_manager.add_review(movie_id, {'content': 'Great', 'reviewer_rating': 9})
+            assert self.aggregates(data_manager, movie_id) == (3, 7.5, 0)
+
+            data_manager.update_review(first['id'], {'reviewer_rating': 8})
+            data_manager.like_review(second['id'])
+            data_manager.add_review_likes({second['id']: 2, third['id']: 4})
+            assert self.aggregates(data_manager, movie_id) == (3, 8.5, 7)
+
+            data_manager.delete_review(third['id'])
+            assert self.aggregates(data_manager, movie_id) == (2, 8.0, 3)
+
+    def test_add_review_to_missing_movie(self, app, data_manager):
+        """Test that reviewing an unknown movie raises and writes nothing"""
+        with app.app_context():
+            with pytest.raises(ValueError):
+                data_manager.add_review(9999, {'content': 'Lost'})
+            assert Review.query.count() == 0
+
+    def test_reconcile_fixes_drift(self, app, data_manager, created_movie, created_review):
+        """Test that reconciliation recomputes drifted aggregates only"""
+        movie_id = created_movie['id']
+        with app.app_context():
+            expected = self.aggregates(data_manager, movie_id)
+            assert data_manager.reconcile_review_aggregates() == 0
+
+            db.session.execute(text('UPDATE movies SET review_count = 42, total_likes = 7'))
+            db.session.commit()
+
+            assert data_manager.reconcile_review_aggregates() == 1
+            db.session.expire_all()
+            assert self.aggregates(data_manager, movie_id) == expected
+
+    def test_migration_computes_aggregates(self, tmp_path):
+        """Test that databases without the columns get them computed"""
+        db_path = tmp_path / 'legacy.sqlite'
+        connection = sqlite3.connect(db_path)
+        connection.executescript("""
+            CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL,
+                                email VARCHAR(120) NOT NULL UNIQUE);
+            CREATE TABLE movies (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL,
+                                 director VARCHAR(100), year INTEGER, rating FLOAT,
+                                 genre VARCHAR(100), poster VARCHAR(500),
+                                 user_id INTEGER NOT NULL REFERENCES users (id));
+            CREATE TABLE reviews (id INTEGER PRIMARY KEY, content TEXT NOT NULL,
+                                  reviewer_rating INTEGER, likes INTEGER,
+                                  created_at DATETIME, updated_at DATETIME,
+                                  movie_id INTEGER NOT NULL REFERENCES movies (id));
+            INSERT INTO users VALUES (1, 'Legacy', 'legacy@example.com');
+            INSERT INTO movies (id, title, user_id) VALUES (1, 'Heat', 1), (2, 'Alien', 1);
+            INSERT INTO reviews (content, reviewer_rating, likes, movie_id) VALUES
+                ('Tense', 8, 2, 1), ('Long', 6, 1, 1);
+        """)
+        connection.close()
+
+        legacy_app = Flask(__name__)
+        legacy_app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+        init_database(legacy_app)
+
+        with legacy_app.app_context():
+            data_manager = SQLiteDataManager()
+            assert self.aggregates(data_manager, 1) == (2, 7.0, 3)
+            assert self.aggregates(data_manager, 2) == (0, None, 0)
+            db.session.remove()
+            db.engine.dispose()
+
+
+class TestWriteQueryCounts:
+    """Pin write paths to their statements, with no SELECT to refetch the result"""
+
+    def test_add_user_single_insert(self, app, data_manager, query_counter):
+        """Test that add_user returns the new user from its INSERT alone"""
+        with app.app_context():
+            user = data_manager.add_user({'name': 'Ann', 'email': 'ann@example.com'})
+
+        assert user['id'] and user['name'] == 'Ann'
+        assert len(query_counter) == 1
+        assert query_counter[0].startswith('INSERT INTO users')
+
+    def test_add_user_movie_owner_check_and_insert(self, app, data_manager, created_user,
+                                                   query_counter):
+        """Test that add_user_movie issues only the owner lookup and the INSERT"""
+        with app.app_context():
+            query_counter.clear()
+            movie = data_manager.add_user_movie(created_user['id'], {'title': 'Heat',
+                                                                     'year': 1995})
+
+        assert movie['id'] and movie['title'] == 'Heat'
+        assert len(query_counter) == 2
+        assert query_counter[1].startswith('INSERT INTO movies')
+
+    def test_add_review_returns_timestamps(self, app, data_manager, created_movie,
+                                           query_counter):
+        """Test that add_review reads its SQL timestamps back via RETURNING"""
+        with app.app_context():
+            query_counter.clear()
+            review = data_manager.add_review(created_movie['id'], {'content': 'Great',
+                                                                  'reviewer_rating': 9})
+
+        assert review['created_at'] and review['updated_at']
+        assert len(query_counter) == 2
+        assert query_counter[0].startswith('INSERT INTO reviews')
+        assert 'RETURNING' in query_counter[0]
+        assert query_counter[1].startswith('UPDATE movies')
+
+    @pytest.mark.parametrize('method, fixture, data', [
+        ('update_user', 'created_user', {'name': 'Renamed'}),
+        ('update_movie', 'created_movie', {'title': 'Renamed'}),
+        ('update_review', 'created_review', {'content': 'Renamed'}),
+    ])
+    def test_update_single_statement(self, request, app, data_manager, method, fixture,
+                                     data, query_counter):
+        """Test that updates are one UPDATE ... RETURNING"""
+        existing = request.getfixturevalue(fixture)
+        with app.app_context():
+            query_counter.clear()
+            updated = getattr(data_manager, method)(existing['id'], data)
+
+        assert updated['id'] == existing['id']
+        assert updated.items() >= data.items()
+        assert len(query_counter) == 1
+        assert query_counter[0].startswith('UPDATE')
+        assert 'RETURNING' in query_counter[0]
+
+    def test_update_missing_row_returns_none(self, app, data_manager):
+        """Test that updating an unknown ID still returns None"""
+        with app.app_context():
+            assert data_manager.update_movie(9999, {'title': 'Nothing'}) is None
+
+    def test_save_trivia_score_no_refetch(self, app, data_manager, created_user,
+                                          query_counter):
+        """Test that save_trivia_score never re-selects the saved score"""
+        with app.app_context():
+            query_counter.clear()
+            score = save_scores(data_manager, created_user['id'], [80],
+                                trivia_type='collection')[0]
+
+        assert score['created_at']
+        assert not [q for q in query_counter if 'FROM trivia_scores' in q]
+
+
+class TestCascadeDeletes:
+    """Test set-based deletes of users and movies"""
+
+    def seed_account(self, data_manager, user_id, other_user_id, movies):
+        """Give a user movies with reviews and scores, plus another user's scores on them"""
+        for i in range(movies):
+            movie = data_manager.add_user_movie(user_id, {'title': f'Movie {i}'})
+            data_manager.add_review(movie['id'], {'content': 'Fine'})
+            data_manager.add_review(movie['id'], {'content': 'Great'})
+            save_scores(data_manager, user_id, [70], movie_id=movie['id'])
+            save_scores(data_manager, other_user_id, [50], movie_id=movie['id'])
+        save_scores(data_manager, user_id, [90], trivia_type='collection')
+
+    def test_delete_user_removes_account_rows(self, app, data_manager, created_user):
+        """Test that a user's movies, reviews and trivia scores are deleted"""
+        with app.app_context():
+            other = data_manager.add_user({'name': 'Other', 'email': 'other@example.com'})
+            self.seed_account(data_manager, created_user['id'], other['id'], movies=3)
+
+            assert data_manager.delete_user(created_user['id']) is True
+
+            assert data_manager.get_user_by_id(created_user['id']) is None
+            assert Movie.query.count() == 0
+            assert Review.query.count() == 0
+            remaining = TriviaScore.query.all()
+            assert {score.user_id for score in remaining} == {other['id']}
+            assert all(score.movie_id is None for score in remaining)
+
+    def test_delete_user_rebuilds_leaderboards(self, app, data_manager, created_user):
+        """Test that boards the user placed on are rebuilt from remaining scores"""
+        with app.app_context():
+            other = data_manager.add_user({'name': 'Other', 'email': 'other@example.com'})
+            self.seed_account(data_manager, created_user['id'], other['id'], movies=2)
+
+            data_manager.delete_user(created_user['id'])
+
+            global_board = data_manager.get_global_leaderboard(20)
+            assert {entry['user_id'] for entry in global_board} == {other['id']}
+            assert data_manager.get_collection_leaderboard(20) == []
+
+            data_manager.rebuild_leaderboards()
+            assert data_manager.get_global_leaderboard(20) == global_board
+
+    def test_delete_user_statement_count_independent_of_size(self, app, data_manager,
+                                                             query_counter):
+        """Test that deleting a heavy account issues no per-row statements"""
+        counts = []
+        with app.app_context():
+            for movies in (1, 8):
+                user = data_manager.add_user({'name': 'Heavy',
+                                              'email': f'heavy{movies}@example.com'})
+                other = data_manager.add_user({'name': 'Other',
+                                               'email': f'other{movies}@example.com'})
+                self.seed_account(data_manager, user['id'], other['id'], movies)
+
+                query_counter.clear()
+                data_manager.delete_user(user['id'])
+                counts.append(len(query_counter))
+
+        assert counts[0] == counts[1]
+
+    def test_delete_missing_user(self, app, data_manager):
+        """Test that deleting an unknown user returns False"""
+        with app.app_context():
+            assert data_manager.delete_user(9999) is False
+
+    def test_delete_movie_keeps_scores(self, app, data_manager, created_user, created_movie,
+                                       created_review):
+        """Test that deleting a movie removes its reviews and detaches its scores"""
+        with app.app_context():
+            save_scores(data_manager, created_user['id'], [80], movie_id=created_movie['id'])
+
+            assert data_manager.delete_movie(created_movie['id']) is True
+
+            assert data_manager.get_review_by_id(created_review['id']) is None
+            score = TriviaScore.query.one()
+            assert score.user_id == created_user['id']
+            assert score.movie_id is None
+
+
+class TestIdentityCache:
+    """Test request-scoped memoization of user and movie lookups"""
+
+    def test_lookups_are_memoized_per_request(self, app, data_manager, created_movie,
+                                              query_counter):
+        """Test that repeated lookups in one request run one query each"""
+        with app.test_request_context():
+            for _ in range(3):
+                assert data_manager.get_user_by_id(created_movie['user_id'])['id'] == \
+                    created_movie['user_id']
+                assert data_manager.get_movie_with_owner(created_movie['id'])[0] == \
+                    created_movie
+                assert data_manager.get_user_by_id(9999) is None
+
+        assert len(query_counter) == 3
+
+    def test_commits_invalidate_cached_lookups(self, app, data_manager, created_movie):
+        """Test that a write in the request is visible to later lookups"""
+        with app.test_request_context():
+            data_manager.get_movie_with_owner(created_movie['id'])
+            data_manager.update_movie(created_movie['id'], {'title': 'Renamed'})
+            data_manager.add_review(created_movie['id'], {'content': 'Counted'})
+
+            movie, _ = data_manager.get_movie_with_owner(created_movie['id'])
+            assert (movie['title'], movie['review_count']) == ('Renamed', 1)
+
+    def test_cached_results_are_copies(self, app, data_manager, created_user):
+        """Test that changing a returned dictionary does not change the cache"""
+        with app.test_request_context():
+            data_manager.get_user_by_id(created_user['id'])['name'] = 'Changed'
+            assert data_manager.get_user_by_id(created_user['id']) == created_user
+
+    def test_no_caching_outside_requests(self, app, data_manager, created_user,
+                                         query_counter):
+        """Test that lookups outside a request always query"""
+        with app.app_context():
+            data_manager.get_user_by_id(created_user['id'])
+            data_manager.get_user_by_id(created_user['id'])
+
+        assert len(query_counter) == 2
+
+
+def save_scores(data_manager, user_id, percentages, trivia_type='movie', movie_id=None):
+    """Save one trivia score per percentage and return the saved dictionaries"""
+    return [data_manager.save_trivia_score({
+        'user_id': user_id,
+        'trivia_type': trivia_type,
+        'movie_id': movie_id,
+        'score': percentage // 10,
+        'total_questions': 10,
+        'percentage': percentage
+    }) for percentage in percentages]
+
+
+def expected_board(scores, limit):
+    """Rank saved scores the way the leaderboards do"""
+    ranked = sorted(scores, key=lambda s: (-s['percentage'], -s['score'], s['id']))
+    return [s['id'] for s in ranked[:limit]]
+
+
+class TestUserTriviaStats:
+    """Test SQL-side user trivia statistics"""
+
+    def test_stats_aggregate_attempts(self, app, data_manager, created_user, created_movie):
+        """Test that counts, best and average score are computed per user"""
+        with app.app_context():
+            save_scores(data_manager, created_user['id'], [40, 90, 75],
+                        movie_id=created_movie['id'])
+            save_scores(data_manager, created_user['id'], [60], trivia_type='collection')
+
+            stats = data_manager.get_user_trivia_stats(created_user['id'])
+
+            assert stats['total_attempts'] == 4
+            assert stats['movie_attempts'] == 3
+            assert stats['collection_attempts'] == 1
+            assert stats['best_score'] == 90
+            assert stats['average_score'] == round((40 + 90 + 75 + 60) / 4)
+
+    def test_stats_recent_scores_newest_first(self, app, data_manager, created_user):
+        """Test that only the configured number of most recent scores is returned"""
+        with app.app_context():
+            scores = save_scores(data_manager, created_user['id'], range(10, 90, 10),
+                                 trivia_type='collection')
+
+            stats = data_manager.get_user_trivia_stats(created_user['id'])
+
+            assert [s['id'] for s in stats['recent_scores']] == \
+                [s['id'] for s in reversed(scores)][:5]
+
+    def test_stats_empty_for_new_user(self, app, data_manager, created_user):
+        """Test the zeroed statistics for a user without attempts"""
+        with app.app_context():
+            stats = data_manager.get_user_trivia_stats(created_user['id'])
+
+            assert stats['total_attempts'] == 0
+            assert 'recent_scores' not in stats
+
+
+class TestMaterializedLeaderboards:
+    """Test incrementally maintained leaderboard tables"""
+
+    def test_board_keeps_top_scores(self, app, data_manager, created_user, created_movie):
+        """Test that saving scores keeps exactly the top entries per board"""
+        with app.app_context():
+            percentages = [(i * 37) % 101 for i in range(30)]
+            scores = save_scores(data_manager, created_user['id'], percentages,
+                                 movie_id=created_movie['id'])
+
+            global_board = data_manager.get_global_leaderboard(20)
+            movie_board = data_manager.get_movie_leaderboard(created_movie['id'], 15)
+
+            assert [e['id'] for e in global_board] == expected_board(scores, 20)
+            assert [e['id'] for e in movie_board] == expected_board(scores, 15)
+            assert global_board[0]['user_name'] == created_user['name']
+            assert data_manager.get_collection_leaderboard(20) == []
+
+    def test_read_is_capped_at_materialized_size(self, app, data_manager, created_user):
+        """Test that reads never return more rows than are materialized"""
+        with app.app_context():
+            save_scores(data_manager, created_user['id'], range(25), trivia_type='collection')
+
+            assert len(data_manager.get_collection_leaderboard(100)) == 20
+
+    def test_rebuild_matches_incremental(self, app, data_manager, created_user, created_movie):
+        """Test that a rebuild from history reproduces the maintained boards"""
+        with app.app_context():
+            save_scores(data_manager, created_user['id'], [50, 90, 70, 90, 10],
+                        movie_id=created_movie['id'])
+            save_scores(data_manager, created_user['id'], [60, 80, 40],
+                        trivia_type='collection')
+
+            before = (data_manager.get_global_leaderboard(20),
+                      data_manager.get_collection_leaderboard(20),
+                      data_manager.get_movie_leaderboard(created_movie['id'], 20))
+            data_manager.rebuild_leaderboards()
+            after = (data_manager.get_global_leaderboard(20),
+                     data_manager.get_collection_leaderboard(20),
+                     data_manager.get_movie_leaderboard(created_movie['id'], 20))
+
+            assert before == after
+
+    def test_delete_movie_drops_movie_board(self, app, data_manager, movie_service,
+                                            created_user, created_movie):
+        """Test that deleting a movie drops its board but keeps global entries"""
+        with app.app_context():
+            scores = save_scores(data_manager, created_user['id'], [80, 60],
+                                 movie_id=created_movie['id'])
+
+            movie_service.delete_movie(created_movie['id'])
+
+            global_board = data_manager.get_global_leaderboard(20)
+            assert data_manager.get_movie_leaderboard(created_movie['id'], 20) == []
+            assert [e['id'] for e in global_board] == expected_board(scores, 20)
+            assert all(e['movie_id'] is None for e in global_board)
+
+            data_manager.rebuild_leaderboards()
+            assert data_manager.get_global_leaderboard(20) == global_board
+
+
+def age_scores(scores, created_at):
+    """Backdate saved trivia scores so they fall outside the hot window"""
+    db.session.execute(update(TriviaScore)
+                       .where(TriviaScore.id.in_([s['id'] for s in scores]))
+                       .values(created_at=created_at))
+    db.session.commit()
+
+
+class TestTriviaHistoryCompaction:
+    """Test compacting old trivia scores into monthly rollups"""
+
+    def test_old_scores_fold_into_monthly_rollups(self, app, data_manager, created_user,
+                                                  created_movie):
+        """Test that scores before the hot window become one rollup per group and month"""
+        with app.app_context():
+            movie_scores = save_scores(data_manager, created_user['id'], [40, 90, 75],
+                                       movie_id=created_movie['id'])
+            collection_scores = save_scores(data_manager, created_user['id'], [60],
+                                            trivia_type='collection')
+            age_scores(movie_scores, datetime(2020, 1, 15))
+            age_scores(collection_scores, datetime(2020, 2, 3))
+
+            assert data_manager.compact_trivia_scores(hot_window_days=90) == 4
+            assert TriviaScore.query.count() == 0
+
+            rollups = {r.trivia_type: r for r in TriviaScoreRollup.query.all()}
+            movie_rollup = rollups['movie']
+            assert (movie_rollup.month, movie_rollup.attempts, movie_rollup.percentage_sum,
+                    movie_rollup.best_percentage) == ('2020-01', 3, 205, 90)
+            assert movie_rollup.best_score_id == movie_scores[1]['id']
+            assert movie_rollup.movie_id == created_movie['id']
+            assert json.loads(movie_rollup.histogram) == [0, 0, 0, 0, 1, 0, 0, 1, 0, 1]
+            assert (rollups['collection'].month, rollups['collection'].attempts) == \
+                ('2020-02', 1)
+
+    def test_hot_window_is_kept(self, app, data_manager, created_user):
+        """Test that scores inside the hot window stay in trivia_scores"""
+        with app.app_context():
+            save_scores(data_manager, created_user['id'], [50, 70], trivia_type='collection')
+
+            assert data_manager.compact_trivia_scores(hot_window_days=90) == 0
+            assert TriviaScore.query.count() == 2
+            assert TriviaScoreRollup.query.count() == 0
+
+    def test_stats_combine_rollups_with_hot_scores(self, app, data_manager, created_user,
+                                                   created_movie):
+        """Test that statistics are unchanged by compaction and include new scores"""
+        with app.app_context():
+            old_scores = save_scores(data_manager, created_user['id'], [40, 90],
+                                     movie_id=created_movie['id'])
+            old_scores += save_scores(data_manager, created_user['id'], [60],
+                                      trivia_type='collection')
+            age_scores(old_scores, datetime(2020, 3, 1))
+            before = data_manager.get_user_trivia_stats(created_user['id'])
+
+            data_manager.compact_trivia_scores(hot_window_days=90)
+            compacted = data_manager.get_user_trivia_stats(created_user['id'])
+            assert {**compacted, 'recent_scores': None} == {**before, 'recent_scores': None}
+            assert compacted['recent_scores'] == []
+
+            hot = save_scores(data_manager, created_user['id'], [100], trivia_type='collection')
+            stats = data_manager.get_user_trivia_stats(created_user['id'])
+            assert (stats['total_attempts'], stats['movie_attempts'],
+                    stats['collection_attempts']) == (4, 2, 2)
+            assert stats['best_score'] == 100
+            assert stats['average_score'] == round((40 + 90 + 60 + 100) / 4)
+            assert [s['id'] for s in stats['recent_scores']] == [hot[0]['id']]
+
+    def test_rebuild_uses_best_compacted_attempts(self, app, data_manager, created_user,
+                                                  created_movie):
+        """Test that rebuilt boards rank each rollup's best attempt beside hot scores"""
+        with app.app_context():
+            rival = data_manager.add_user({'name': 'Rival', 'email': 'rival@example.com'})
+            old_scores = save_scores(data_manager, created_user['id'], [95, 50],
+                                     movie_id=created_movie['id'])
+            age_scores(old_scores, datetime(2020, 5, 20))
+            hot_scores = save_scores(data_manager, rival['id'], [80],
+                                     movie_id=created_movie['id'])
+
+            data_manager.compact_trivia_scores(hot_window_days=90)
+            data_manager.rebuild_leaderboards()
+
+            expected = [old_scores[0]['id'], hot_scores[0]['id']]
+            assert [e['id'] for e in data_manager.get_global_leaderboard()] == expected
+            assert [e['id'] for e in
+                    data_manager.get_movie_leaderboard(created_movie['id'])] == expected
+            assert data_manager.get_global_leaderboard()[0]['percentage'] == 95
+
+    def test_deletes_reach_rollups(self, app, data_manager, created_user, created_movie):
+        """Test that deleting movies detaches rollups and deleting users removes them"""
+        with app.app_context():
+            scores = save_scores(data_manager, created_user['id'], [70],
+                                 movie_id=created_movie['id'])
+            age_scores(scores, datetime(2020, 7, 4))
+            data_manager.compact_trivia_scores(hot_window_days=90)
+
+            data_manager.delete_movie(created_movie['id'])
+            assert TriviaScoreRollup.query.one().movie_id is None
+
+            data_manager.delete_user(created_user['id'])
+            assert TriviaScoreRollup.query.count() == 0
+
+
+class TestTriviaQuestionBank:
+    """Test the trivia question bank keyed by canonical movie"""
+
+    QUESTIONS = [{'question': f'Question {index}?', 'options': ['A', 'B'], 'correct': 0,
+                  'difficulty': 'easy'} for index in range(5)]
+
+    def test_questions_are_deduplicated_per_movie(self, app, data_manager):
+        """Test that repeats of a question are skipped for the same canonical movie only"""
+        with app.app_context():
+            assert data_manager.add_trivia_questions('Heat', 1995, self.QUESTIONS, 'rapidapi') == 5
+            repeats = [{**question, 'question': question['question'].upper()}
+                       for question in self.QUESTIONS[:2]]
+            assert data_manager.add_trivia_questions(' heat ', 1995, repeats, 'openai') == 0
+            assert data_manager.add_trivia_questions('Heat', 1986, repeats, 'openai') == 2
+
+            questions, banked = data_manager.draw_trivia_questions('HEAT', 1995, 3)
+            assert banked == 5
+            assert len(questions) == 3
+            assert all(question in self.QUESTIONS for question in questions)
+            assert data_manager.draw_trivia_questions('Heat', None, 3) == ([], 0)
+            assert db.session.query(TriviaQuestion).count() == 7
+
+    def test_draw_uses_movie_index(self, app, data_manager, query_counter):
+        """Test that drawing a set searches the bank by canonical movie"""
+        with app.app_context():
+            data_manager.draw_trivia_questions('Heat', 1995, 7)
+
+            plan = explain_query_plan(list(query_counter)[-1])
+            assert any('trivia_questions USING INDEX ux_trivia_questions_movie_question' in line
+                       for line in plan)
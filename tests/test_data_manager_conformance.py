@@ -0,0 +1,264 @@
+"""
+Conformance suite shared by every data manager implementation.
+Each test runs once against SQLiteDataManager and once against
+AsyncSQLiteDataManager (skipped when aiosqlite/greenlet are missing), through
+adapters that give both the same synchronous call style.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from datamanager import AsyncSQLiteDataManager, SQLiteDataManager
+
+
+class SyncManager:
+    """Calls SQLiteDataManager methods inside an application context"""
+
+    def __init__(self, app):
+        self.app = app
+        self.manager = SQLiteDataManager()
+
+    def __getattr__(self, name):
+        method = getattr(self.manager, name)
+
+        def call(*args, **kwargs):
+            with self.app.app_context():
+                return method(*args, **kwargs)
+        return call
+
+    def close(self):
+        pass
+
+
+class AsyncManager:
+    """Runs AsyncSQLiteDataManager coroutines to completion on one event loop"""
+
+    def __init__(self, app):
+        self.loop = asyncio.new_event_loop()
+        self.manager = AsyncSQLiteDataManager.from_app(app)
+
+    def __getattr__(self, name):
+        method = getattr(self.manager, name)
+
+        def call(*args, **kwargs):
+            return self.loop.run_until_complete(method(*args, **kwargs))
+        return call
+
+    def close(self):
+        self.loop.run_until_complete(self.manager.dispose())
+        self.loop.close()
+
+
+@pytest.fixture(params=['sync', 'async'])
+def manager(request, app):
+    """Data manager under test, wrapped for synchronous calls"""
+    if request.param == 'async':
+        pytest.importorskip('aiosqlite')
+        pytest.importorskip('greenlet')
+        wrapped = AsyncManager(app)
+    else:
+        wrapped = SyncManager(app)
+
+    yield wrapped
+    wrapped.close()
+
+
+@pytest.fixture
+def user(manager):
+    """A user created through the manager under test"""
+    return manager.add_user({'name': 'Conformance', 'email': 'conformance@example.com'})
+
+
+@pytest.fixture
+def movie(manager, user):
+    """A movie created through the manager under test"""
+    return manager.add_user_movie(user['id'], {
+        'title': 'The Matrix', 'director': 'Lana Wachowski', 'year': 1999, 'genre': 'Sci-Fi'
+    })
+
+
+def save_score(manager, user_id, percentage, trivia_type='movie', movie_id=None):
+    """Save one trivia score through the manager under test"""
+    return manager.save_trivia_score({
+        'user_id': user_id,
+        'trivia_type': trivia_type,
+        'movie_id': movie_id,
+        'score': percentage // 10,
+        'total_questions': 10,
+        'percentage': percentage
+    })
+
+
+class TestUsers:
+    """User operations"""
+
+    def test_add_get_update_user(self, manager, user):
+        """Test creating, reading and updating a user"""
+        assert manager.get_user_by_id(user['id']) == user
+
+        updated = manager.update_user(user['id'], {'name': 'Renamed', 'id': 999})
+        assert updated == {**user, 'name': 'Renamed'}
+        assert manager.get_user_by_id(user['id']) == updated
+
+    def test_missing_user(self, manager):
+        """Test that unknown users read and update as None"""
+        assert manager.get_user_by_id(9999) is None
+        assert manager.update_user(9999, {'name': 'Nobody'}) is None
+        assert manager.delete_user(9999) is False
+
+    def test_get_all_users_pages(self, manager):
+        """Test keyset paging over users"""
+        ids = [manager.add_user({'name': f'User {i}', 'email': f'user{i}@example.com'})['id']
+               for i in range(3)]
+
+        assert [u['id'] for u in manager.get_all_users()][-3:] == ids
+        assert [u['id'] for u in manager.get_all_users(after_id=ids[0], limit=1)] == ids[1:2]
+
+    def test_delete_user_removes_collection(self, manager, user, movie):
+        """Test that deleting a user removes their movies, reviews and scores"""
+        review = manager.add_review(movie['id'], {'content': 'Whoa'})
+        save_score(manager, user['id'], 80, movie_id=movie['id'])
+
+        assert manager.delete_user(user['id']) is True
+        assert manager.get_user_by_id(user['id']) is None
+        assert manager.get_review_by_id(review['id']) is None
+        assert manager.get_user_trivia_stats(user['id'])['total_attempts'] == 0
+
+
+class TestMovies:
+    """Movie operations"""
+
+    def test_add_and_list_movies(self, manager, user, movie):
+        """Test adding movies singly and in bulk, in input order"""
+        added = manager.add_user_movies(user['id'], [{'title': 'Heat'}, {'title': 'Alien'}])
+
+        assert [m['title'] for m in added] == ['Heat', 'Alien']
+        assert manager.get_user_movies(user['id']) == [movie] + added
+        assert manager.get_user_movies(user['id'], after_id=movie['id'], limit=1) == added[:1]
+
+    def test_bulk_add_skips_existing_movies(self, manager, user, movie):
+        """Test that a bulk add skips titles the collection already holds"""
+        added = manager.add_user_movies(user['id'], [{'title': 'Heat'},
+                                                     {'title': 'the matrix', 'year': 1999}])
+
+        assert added[0]['title'] == 'Heat'
+        assert added[1] is None
+        assert len(manager.get_user_movies(user['id'])) == 2
+
+    def test_movie_with_owner(self, manager, user, movie):
+        """Test reading a movie together with its owner"""
+        assert manager.get_movie_with_owner(movie['id']) == (movie, user)
+        assert manager.get_movie_with_owner(9999) is None
+
+    def test_duplicate_detection(self, manager, user, movie):
+        """Test normalized duplicate checks and the unique index"""
+        assert manager.movie_exists(user['id'], '  the   MATRIX ', 1999)
+        assert not manager.movie_exists(user['id'], 'The Matrix', 1999,
+                                        exclude_movie_id=movie['id'])
+
+        with pytest.raises(IntegrityError):
+            manager.add_user_movie(user['id'], {'title': 'THE MATRIX', 'year': 1999})
+
+    def test_add_movie_for_unknown_user(self, manager):
+        """Test that adding a movie to an unknown user raises ValueError"""
+        with pytest.raises(ValueError):
+            manager.add_user_movie(9999, {'title': 'Orphan'})
+
+    def test_update_and_delete_movie(self, manager, user, movie):
+        """Test updating and deleting a movie"""
+        updated = manager.update_movie(movie['id'], {'title': 'The Matrix Reloaded',
+                                                     'year': 2003})
+        assert updated == {**movie, 'title': 'The Matrix Reloaded', 'year': 2003}
+        assert manager.movie_exists(user['id'], 'the matrix reloaded', 2003)
+
+        assert manager.delete_movie(movie['id']) is True
+        assert manager.get_user_movies(user['id']) == []
+        assert manager.delete_movie(movie['id']) is False
+
+
+class TestReviews:
+    """Review operations"""
+
+    def test_review_lifecycle(self, manager, movie):
+        """Test creating, listing, updating and deleting a review"""
+        review = manager.add_review(movie['id'], {'content': 'Great', 'reviewer_rating': 9})
+        assert review['created_at'] and review['likes'] == 0
+        assert manager.get_movie_reviews(movie['id']) == [review]
+        assert manager.get_review_by_id(review['id']) == review
+
+        updated = manager.update_review(review['id'], {'content': 'Even better'})
+        assert updated['content'] == 'Even better'
+        assert updated['reviewer_rating'] == 9
+
+        assert manager.delete_review(review['id']) is True
+        assert manager.get_review_by_id(review['id']) is None
+
+    def test_likes(self, manager, movie):
+        """Test single and batched like increments"""
+        review = manager.add_review(movie['id'], {'content': 'Liked'})
+
+        assert manager.like_review(review['id'])['likes'] == 1
+        assert manager.add_review_likes({review['id']: 4}) == 1
+        assert manager.get_review_by_id(review['id'])['likes'] == 5
+        assert manager.like_review(9999) is None
+
+
+class TestSearch:
+    """Full-text search"""
+
+    def test_search_movies_and_reviews(self, manager, user, movie):
+        """Test ranked search results across movies and reviews"""
+        review = manager.add_review(movie['id'], {'content': 'Bullet time changed sci-fi'})
+
+        results = manager.search('sci')
+        assert [(r['type'], r['id']) for r in results] == [('movie', movie['id']),
+                                                          ('review', review['id'])]
+        assert manager.search('bullet', user_id=user['id'] + 1) == []
+
+
+class TestTrivia:
+    """Trivia scores, leaderboards and statistics"""
+
+    def test_scores_reach_leaderboards_and_stats(self, manager, user, movie):
+        """Test that saved scores show on every board they compete on"""
+        movie_score = save_score(manager, user['id'], 70, movie_id=movie['id'])
+        collection_score = save_score(manager, user['id'], 90, trivia_type='collection')
+
+        assert [e['id'] for e in manager.get_global_leaderboard()] == \
+            [collection_score['id'], movie_score['id']]
+        assert [e['id'] for e in manager.get_movie_leaderboard(movie['id'])] == \
+            [movie_score['id']]
+        assert [e['id'] for e in manager.get_collection_leaderboard()] == \
+            [collection_score['id']]
+        assert manager.get_global_leaderboard()[0]['user_name'] == user['name']
+
+        stats = manager.get_user_trivia_stats(user['id'])
+        assert (stats['total_attempts'], stats['best_score'], stats['average_score']) == \
+            (2, 90, 80)
+
+    def test_rebuild_matches_incremental(self, manager, user, movie):
+        """Test that rebuilding the boards reproduces them"""
+        for percentage in (40, 80, 60):
+            save_score(manager, user['id'], percentage, movie_id=movie['id'])
+        board = manager.get_global_leaderboard()
+
+        assert manager.rebuild_leaderboards() > 0
+        assert manager.get_global_leaderboard() == board
+
+
+def test_async_operations_run_concurrently(app, created_movie):
+    """Test that concurrent coroutines share the async manager safely"""
+    pytest.importorskip('aiosqlite')
+    pytest.importorskip('greenlet')
+    manager = AsyncSQLiteDataManager.from_app(app)
+
+    async def scenario():
+        try:
+            review = await manager.add_review(created_movie['id'], {'content': 'Popular'})
+            await asyncio.gather(*[manager.like_review(review['id']) for _ in range(10)])
+            return await manager.get_review_by_id(review['id'])
+        finally:
+            await manager.dispose()
+
+    assert asyncio.run(scenario())['likes'] == 10
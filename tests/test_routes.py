@@ -1,5 +1,10 @@
 import pytest
 import json
+import re
+
+from config import BulkImportConfig, PaginationConfig
+from routes import api_routes
+from services.omdb_cache import OMDbCache
 
 
 class TestUserRoutes:
@@ -362,6 +367,248 @@ class TestAPIRoutes:
         assert 'movies' in data['data']
         assert 'reviews' in data['data']
 
+    def test_api_movie_enrichment(self, client, created_movie):
+        """Test the enrichment status endpoint"""
+        response = client.get(f'/api/movies/{created_movie["id"]}/enrichment')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)['data']
+        assert data['movie_id'] == created_movie['id']
+        assert data['status'] == created_movie['enrichment_status']
+        assert client.get('/api/movies/9999/enrichment').status_code == 404
+
+    def test_api_metrics(self, client, monkeypatch, tmp_path):
+        """Test that cache counters are reported"""
+        cache = OMDbCache(tmp_path / 'omdb.sqlite')
+        monkeypatch.setattr(api_routes, 'omdb_cache', cache)
+
+        response = client.get('/api/metrics')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)['data']
+        assert {'hits', 'negative_hits', 'misses', 'evictions', 'entries'} <= set(data['omdb_cache'])
+        assert data['omdb_cache']['entries'] == 0
+        assert not cache.path.exists()
+        assert set(data['single_flight']) == {'omdb', 'trivia'}
+        assert {'calls', 'coalesced', 'errors', 'timeouts', 'in_flight'} \
+            <= set(data['single_flight']['omdb'])
+
+    def test_api_trivia_prefetch_status(self, client):
+        """Test that the prefetch queue status and quota reserve are reported"""
+        response = client.get('/api/trivia/prefetch')
+        assert response.status_code == 200
+
+        status = json.loads(response.data)['data']['trivia_prefetch']
+        assert {'queued', 'enqueued', 'banked', 'deferred', 'failed'} <= set(status)
+        assert set(status['quota']) == {'remaining', 'reserve'}
+
+
+class TestPagination:
+    """Test keyset pagination of list endpoints and pages"""
+
+    @staticmethod
+    def collect_pages(client, url):
+        """Follow next_cursor links and return the item IDs of every page"""
+        pages, cursor = [], None
+        while True:
+            query = f'&cursor={cursor}' if cursor else ''
+            data = json.loads(client.get(f'{url}?limit=2{query}').data)
+            assert data['success'] is True
+            pages.append([item['id'] for item in data['data']])
+            cursor = data['next_cursor']
+            if cursor is None:
+                return pages
+
+    def test_api_users_pages_follow_cursor(self, app, client, user_service):
+        """Test that paging /api/users visits every user once in ID order"""
+        with app.app_context():
+            user_ids = [user_service.create_user({
+                'name': f'Paged User {i}', 'email': f'paged{i}@example.com'
+            })['id'] for i in range(5)]
+
+        pages = self.collect_pages(client, '/api/users')
+        ids = [user_id for page in pages for user_id in page]
+
+        assert all(len(page) <= 2 for page in pages)
+        assert ids == sorted(set(ids))
+        assert set(user_ids) <= set(ids)
+
+    def test_api_user_movies_pages(self, app, client, movie_service, created_user):
+        """Test that paging a collection returns all of the user's movies"""
+        with app.app_context():
+            movie_ids = [movie_service.create_movie_for_user(created_user['id'], {
+                'title': f'Paged Movie {i}', 'year': str(2000 + i)
+            })['id'] for i in range(3)]
+
+        pages = self.collect_pages(client, f'/api/users/{created_user["id"]}/movies')
+
+        assert pages == [movie_ids[:2], movie_ids[2:]]
+
+    def test_api_movie_reviews_pages(self, app, client, review_service, created_movie):
+        """Test that paging reviews ends with a null cursor"""
+        with app.app_context():
+            review_ids = [review_service.create_review(created_movie['id'], {
+                'content': f'Paged review {i}', 'reviewer_rating': '7'
+            })['id'] for i in range(2)]
+
+        pages = self.collect_pages(client, f'/api/movies/{created_movie["id"]}/reviews')
+
+        assert pages == [review_ids]
+
+    @pytest.mark.parametrize('query', ['cursor=not-a-cursor', 'limit=0', 'limit=abc'])
+    def test_api_invalid_page_arguments(self, client, query):
+        """Test that malformed cursors and limits are rejected"""
+        response = client.get(f'/api/users?{query}')
+        assert response.status_code == 400
+
+        data = json.loads(response.data)
+        assert data['success'] is False
+
+    def test_users_page_links_next_page(self, app, client, user_service, monkeypatch):
+        """Test that the users page renders a link to the next page"""
+        monkeypatch.setattr(PaginationConfig, 'USERS_PAGE_SIZE', 1)
+        with app.app_context():
+            for i in range(2):
+                user_service.create_user({'name': f'Lobby User {i}',
+                                          'email': f'lobby{i}@example.com'})
+
+        response = client.get('/users/')
+        assert response.status_code == 200
+        assert b'NEXT PAGE' in response.data
+        assert b'Lobby User 0' in response.data
+        assert b'Lobby User 1' not in response.data
+
+        next_url = re.search(rb'href="(/users/\?cursor=[^"]+)"', response.data).group(1)
+        response = client.get(next_url.decode())
+        assert b'Lobby User 1' in response.data
+        assert b'FIRST PAGE' in response.data
+
+
+class TestSearch:
+    """Test full-text search endpoints"""
+
+    @pytest.fixture
+    def searchable(self, app, movie_service, review_service, created_user):
+        """A small collection with one matching review"""
+        with app.app_context():
+            heat = movie_service.create_movie_for_user(created_user['id'], {
+                'title': 'Heat', 'director': 'Michael Mann', 'genre': 'Crime'
+            })
+            matrix = movie_service.create_movie_for_user(created_user['id'], {
+                'title': 'The Matrix', 'director': 'Lana Wachowski', 'genre': 'Sci-Fi'
+            })
+            review = review_service.create_review(heat['id'], {
+                'content': 'A crime epic with the best heist shootout ever filmed'
+            })
+        return {'heat': heat, 'matrix': matrix, 'review': review}
+
+    def test_api_search_ranks_title_matches_first(self, client, searchable):
+        """Test that a title match outranks a match in review text"""
+        response = client.get('/api/search?q=heat')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['data'][0]['type'] == 'movie'
+        assert data['data'][0]['id'] == searchable['heat']['id']
+
+        response = client.get('/api/search?q=crime')
+        results = [(r['type'], r['id']) for r in json.loads(response.data)['data']]
+        assert results == [('movie', searchable['heat']['id']),
+                           ('review', searchable['review']['id'])]
+
+    def test_api_search_pages_follow_cursor(self, client, searchable):
+        """Test that ranked results page through every match once"""
+        first = json.loads(client.get('/api/search?q=crime&limit=1').data)
+        second = json.loads(client.get(
+            f'/api/search?q=crime&limit=1&cursor={first["next_cursor"]}').data)
+
+        assert [r['type'] for r in first['data'] + second['data']] == ['movie', 'review']
+        assert second['next_cursor'] is None
+
+    def test_api_search_prefix_and_user_filter(self, app, client, user_service, searchable):
+        """Test prefix matching and restricting results to one collection"""
+        with app.app_context():
+            other = user_service.create_user({'name': 'Other', 'email': 'other@example.com'})
+
+        data = json.loads(client.get('/api/search?q=matr').data)
+        assert [r['id'] for r in data['data']] == [searchable['matrix']['id']]
+
+        data = json.loads(client.get(f'/api/search?q=matrix&user_id={other["id"]}').data)
+        assert data['data'] == []
+
+    @pytest.mark.parametrize('query, status', [('', 400), ('q=' + 'x' * 101, 400),
+                                               ('q=heat&user_id=9999', 404)])
+    def test_api_search_rejects_bad_arguments(self, client, query, status):
+        """Test that empty or overlong queries and unknown users are rejected"""
+        response = client.get(f'/api/search?{query}')
+        assert response.status_code == status
+        assert json.loads(response.data)['success'] is False
+
+    def test_search_page_lists_results(self, client, searchable):
+        """Test that the search page renders matches with links to the movie"""
+        response = client.get('/search/?q=heist')
+        assert response.status_code == 200
+        assert b'Heat' in response.data
+        assert f'/movies/{searchable["heat"]["id"]}'.encode() in response.data
+
+
+class TestBulkImport:
+    """Test bulk movie import API"""
+
+    def test_bulk_import_per_item_results(self, client, created_user, created_movie):
+        """Test that created, duplicate and invalid items are reported in order"""
+        response = client.post(f'/api/users/{created_user["id"]}/movies/bulk', json={
+            'movies': [
+                'Bulk Movie One',
+                {'title': 'Bulk Movie Two', 'year': 2001},
+                {'title': created_movie['title'], 'year': created_movie['year']},
+                {'title': 'bulk movie one'},
+                {'title': ''},
+                {'title': 'Bulk Movie Three', 'rating': 42}
+            ]
+        })
+        assert response.status_code == 200
+
+        data = json.loads(response.data)['data']
+        assert [r['status'] for r in data['results']] == [
+            'created', 'created', 'duplicate', 'duplicate', 'invalid', 'invalid'
+        ]
+        assert [r['index'] for r in data['results']] == list(range(6))
+        assert (data['created'], data['duplicates'], data['invalid']) == (2, 2, 2)
+        assert data['results'][1]['movie']['year'] == 2001
+
+        movies = json.loads(client.get(f'/api/users/{created_user["id"]}/movies').data)['data']
+        assert {'Bulk Movie One', 'Bulk Movie Two'} <= {m['title'] for m in movies}
+
+    def test_bulk_import_single_insert_statement(self, client, created_user, query_counter):
+        """Test that all new movies are written together"""
+        titles = [f'Batch Movie {i}' for i in range(25)]
+        response = client.post(f'/api/users/{created_user["id"]}/movies/bulk',
+                               json={'movies': titles})
+        assert json.loads(response.data)['data']['created'] == 25
+
+        inserts = [q for q in query_counter if q.startswith('INSERT INTO movies')]
+        assert len(inserts) == 1
+
+    def test_bulk_import_unknown_user(self, client):
+        """Test bulk import for a missing user"""
+        response = client.post('/api/users/999/movies/bulk', json={'movies': ['Anything']})
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize('payload', [{'movies': []}, {'movies': 'Not a list'}])
+    def test_bulk_import_rejects_bad_payload(self, client, created_user, payload):
+        """Test that the movies field must be a non-empty list"""
+        response = client.post(f'/api/users/{created_user["id"]}/movies/bulk', json=payload)
+        assert response.status_code == 400
+
+    def test_bulk_import_rejects_oversized_batch(self, client, created_user, monkeypatch):
+        """Test that batches above the configured size are rejected"""
+        monkeypatch.setattr(BulkImportConfig, 'MAX_ITEMS', 2)
+        response = client.post(f'/api/users/{created_user["id"]}/movies/bulk',
+                               json={'movies': ['A', 'B', 'C']})
+        assert response.status_code == 400
+
 
 class TestErrorHandling:
     """Test error handling functionality"""
@@ -441,4 +688,52 @@ class TestTriviaRoutes:
         """Test user trivia stats page"""
         response = client.get(f'/users/{created_user["id"]}/trivia-stats')
         assert response.status_code == 200
-        assert b'Trivia Statistics' in response.data
\ No newline at end of file
+        assert b'Trivia Statistics' in response.data
+
+class TestQueryCounts:
+    """Pin the number of SQL statements issued by guarded routes"""
+
+    def test_require_user_single_primary_key_lookup(self, client, created_user, query_counter):
+        """Test that a @require_user route resolves the user with one indexed query"""
+        response = client.get(f'/users/{created_user["id"]}/edit')
+        assert response.status_code == 200
+
+        assert len(query_counter) == 1
+        assert 'FROM users' in query_counter[0]
+        assert 'WHERE users.id = ?' in query_counter[0]
+
+    def test_trivia_stats_never_scans_users(self, client, created_user, query_counter):
+        """Test that user resolution in services does not list the users table"""
+        client.get(f'/users/{created_user["id"]}/trivia-stats')
+
+        user_queries = [q for q in query_counter if 'FROM users' in q]
+        assert user_queries
+        assert all('WHERE users.id = ?' in q for q in user_queries)
+
+    def test_repeated_user_lookups_hit_identity_cache(self, app, client, created_user,
+                                                      query_counter):
+        """Test that the decorator and service share one user lookup per request"""
+        app.config['IDENTITY_CACHE_HEADER'] = True
+        response = client.get(f'/users/{created_user["id"]}/trivia-stats')
+
+        user_queries = [q for q in query_counter if 'WHERE users.id = ?' in q]
+        assert len(user_queries) == 1
+        hits, misses = re.fullmatch(r'hits=(\d+); misses=(\d+)',
+                                    response.headers['X-Identity-Cache']).groups()
+        assert int(hits) >= 1 and int(misses) == 1
+
+    def test_identity_cache_header_off_by_default(self, client, created_user):
+        """Test that the debug header is only sent when enabled"""
+        response = client.get(f'/users/{created_user["id"]}/trivia-stats')
+        assert 'X-Identity-Cache' not in response.headers
+
+    def test_api_get_movie_single_owner_lookup(self, client, created_movie, query_counter):
+        """Test that /api/movies/<id> fetches movie and owner in one query"""
+        response = client.get(f'/api/movies/{created_movie["id"]}')
+        assert response.status_code == 200
+
+        movie_queries = [q for q in query_counter if 'FROM movies' in q]
+        assert len(movie_queries) == 1
+        assert 'JOIN users' in movie_queries[0]
+        assert 'WHERE movies.id = ?' in movie_queries[0]
+        assert len(query_counter) == 2
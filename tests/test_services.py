@@ -1,7 +1,22 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
+import requests
+from config import (BulkImportConfig, EnrichmentConfig, HTTPClientConfig,
+                    MetadataIndexConfig, TriviaPrefetchConfig)
+from services.enrichment_worker import EnrichmentWorker
+from services.http_client import HTTPClient
+from services.like_buffer import LikeBuffer
+from services.movie_metadata_index import MovieMetadataIndex
+from services.omdb_cache import MISS, OMDbCache
+from services.omdb_service import OMDbService
+from services.single_flight import SingleFlight
+from services.trivia_prefetcher import TriviaPrefetcher
 from exceptions import (
     UserNotFoundError, MovieNotFoundError, ReviewNotFoundError,
-    ValidationError, DuplicateMovieError, InsufficientMoviesError
+    ValidationError, DuplicateMovieError, InsufficientMoviesError, ExternalAPIError
 )
 
 
@@ -127,6 +142,27 @@ class TestMovieService:
 
             assert 'already have' in str(exc_info.value)
 
+    def test_create_duplicate_movie_ignores_case_and_spacing(self, app, movie_service,
+                                                             created_user, created_movie):
+        """Test that titles differing only in case or spacing are duplicates"""
+        with app.app_context():
+            duplicate_data = {
+                'title': '  ' + created_movie['title'].upper().replace(' ', '   '),
+                'year': str(created_movie['year'])
+            }
+
+            with pytest.raises(DuplicateMovieError):
+                movie_service.create_movie_for_user(created_user['id'], duplicate_data)
+
+    def test_same_title_different_year_allowed(self, app, movie_service, created_user, created_movie):
+        """Test that a remake with another year is not a duplicate"""
+        with app.app_context():
+            movie = movie_service.create_movie_for_user(created_user['id'], {
+                'title': created_movie['title'].lower(),
+                'year': '1999'
+            })
+            assert movie['year'] == 1999
+
     def test_get_user_movies(self, app, movie_service, created_user, created_movie):
         """Test getting movies for a user"""
         with app.app_context():
@@ -147,6 +183,64 @@ class TestMovieService:
             with pytest.raises(MovieNotFoundError):
                 movie_service.get_movie_for_user(created_user['id'], 999)
 
+    def test_get_movie_by_id_returns_owner(self, app, movie_service, created_user, created_movie):
+        """Test resolving a movie by ID returns it together with its owner"""
+        with app.app_context():
+            movie, owner_id = movie_service.get_movie_by_id(created_movie['id'])
+            assert movie['id'] == created_movie['id']
+            assert owner_id == created_user['id']
+
+    def test_get_movie_for_other_user(self, app, movie_service, user_service, created_movie):
+        """Test that a movie is not found through a user who doesn't own it"""
+        with app.app_context():
+            other_user = user_service.create_user({
+                'name': 'Other User',
+                'email': 'other.user@example.com'
+            })
+            with pytest.raises(MovieNotFoundError):
+                movie_service.get_movie_for_user(other_user['id'], created_movie['id'])
+
+    def test_import_movies_enriches_with_bounded_parallelism(self, app, movie_service,
+                                                             created_user, monkeypatch):
+        """Test that bulk enrichment runs concurrently but within the worker limit"""
+        monkeypatch.setattr(BulkImportConfig, 'ENRICHMENT_WORKERS', 3)
+        lock = threading.Lock()
+        active = {'now': 0, 'peak': 0}
+
+        def slow_enhance(movie_data, use_index=True):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            time.sleep(0.02)
+            with lock:
+                active['now'] -= 1
+            return {**movie_data, 'genre': 'Enriched'}
+
+        monkeypatch.setattr(movie_service.omdb_service, 'enhance_movie_data', slow_enhance)
+
+        with app.app_context():
+            summary = movie_service.import_movies_for_user(
+                created_user['id'], [{'title': f'Parallel Movie {i}'} for i in range(12)]
+            )
+
+        assert summary['created'] == 12
+        assert active['peak'] == 3
+        assert all(r['movie']['genre'] == 'Enriched' for r in summary['results'])
+
+    def test_import_reports_movies_added_concurrently_as_duplicates(
+            self, app, movie_service, created_user, created_movie, monkeypatch):
+        """Test that a movie added after the duplicate snapshot does not fail the batch"""
+        monkeypatch.setattr(movie_service, 'get_user_movies', lambda user_id: [])
+
+        with app.app_context():
+            summary = movie_service.import_movies_for_user(
+                created_user['id'],
+                [{'title': 'Heat'}, {'title': created_movie['title'], 'year': created_movie['year']}]
+            )
+
+        assert (summary['created'], summary['duplicates']) == (1, 1)
+        assert [r['status'] for r in summary['results']] == ['created', 'duplicate']
+
     def test_update_movie(self, app, movie_service, created_movie):
         """Test updating movie"""
         with app.app_context():
@@ -181,6 +275,15 @@ class TestMovieService:
                     'year': '2023'
                 })
 
+    def test_update_movie_keeps_own_title(self, app, movie_service, created_movie):
+        """Test that re-saving a movie with a recased title is not a duplicate of itself"""
+        with app.app_context():
+            updated = movie_service.update_movie(created_movie['id'], {
+                'title': created_movie['title'].upper(),
+                'year': str(created_movie['year'])
+            })
+            assert updated['title'] == created_movie['title'].upper()
+
     def test_delete_movie(self, app, movie_service, created_movie):
         """Test deleting movie"""
         with app.app_context():
@@ -192,6 +295,109 @@ class TestMovieService:
                 movie_service.get_movie_by_id(created_movie['id'])
 
 
+class FakeOMDbService:
+    """OMDb stand-in answering lookups after a delay"""
+
+    api_key = 'test'
+
+    def __init__(self, answer=None, delay=0.0, error=None):
+        self.answer = answer
+        self.delay = delay
+        self.error = error
+
+    def lookup_offline(self, title, year=None):
+        return None
+
+    def search_movie(self, title, year=None):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.answer
+
+
+class TestBackgroundEnrichment:
+    """Test that movie adds return before OMDb enrichment runs"""
+
+    @pytest.fixture
+    def use_omdb(self, movie_service):
+        """Give the movie service a fake OMDb and a private enrichment worker"""
+        workers = []
+
+        def use(omdb):
+            movie_service.omdb_service = omdb
+            movie_service.enrichment_worker = EnrichmentWorker(omdb_service=omdb, workers=2)
+            workers.append(movie_service.enrichment_worker)
+            return movie_service.enrichment_worker
+
+        yield use
+        for worker in workers:
+            worker.shutdown()
+
+    def test_add_returns_before_omdb_answers(self, app, movie_service, created_user, use_omdb):
+        """Test that the movie is stored pending and enriched once OMDb answers"""
+        worker = use_omdb(FakeOMDbService(
+            {'director': 'Ridley Scott', 'genre': 'Sci-Fi', 'poster': 'alien.jpg',
+             'imdb_rating': 8.5}, delay=0.5))
+
+        with app.app_context():
+            start = time.perf_counter()
+            movie = movie_service.create_movie_for_user(created_user['id'],
+                                                        {'title': 'Alien', 'genre': 'Horror'})
+            assert time.perf_counter() - start < 0.5
+            assert (movie['enrichment_status'], movie['director']) == ('pending', None)
+
+        worker.shutdown()
+
+        with app.app_context():
+            status = movie_service.get_enrichment_status(movie['id'])
+            assert status['status'] == 'enriched'
+            assert status['movie']['director'] == 'Ridley Scott'
+            assert status['movie']['poster'] == 'alien.jpg'
+            assert status['movie']['rating'] == 8.5
+            assert status['movie']['genre'] == 'Horror'
+
+    def test_unmatched_and_failed_lookups(self, app, movie_service, created_user, use_omdb):
+        """Test the statuses recorded when OMDb has no answer or errors"""
+        worker = use_omdb(FakeOMDbService(None))
+        with app.app_context():
+            unmatched = movie_service.create_movie_for_user(created_user['id'],
+                                                            {'title': 'Obscure'})
+        worker.shutdown()
+
+        worker = use_omdb(FakeOMDbService(error=RuntimeError('OMDb down')))
+        with app.app_context():
+            failed = movie_service.create_movie_for_user(created_user['id'], {'title': 'Down'})
+        worker.shutdown()
+
+        with app.app_context():
+            assert movie_service.get_enrichment_status(unmatched['id'])['status'] == 'unmatched'
+            assert movie_service.get_enrichment_status(failed['id'])['status'] == 'failed'
+
+    def test_lost_lookups_are_requeued(self, app, movie_service, created_user, use_omdb):
+        """Test that movies left pending, e.g. by a restart, can be enriched again"""
+        with app.app_context():
+            lost = movie_service.data_manager.add_user_movie(
+                created_user['id'], {'title': 'Alien', 'enrichment_status': 'pending'}
+            )
+
+        worker = use_omdb(FakeOMDbService({'director': 'Ridley Scott'}))
+        with app.app_context():
+            futures = worker.requeue_pending(app)
+            assert [future.result(timeout=10) for future in futures] == ['enriched']
+            status = movie_service.get_enrichment_status(lost['id'])
+            assert (status['status'], status['movie']['director']) == ('enriched', 'Ridley Scott')
+            assert movie_service.data_manager.get_pending_enrichment_movies() == []
+
+    def test_no_background_enrichment_without_api_key(self, app, movie_service, created_user):
+        """Test that movies are not queued when OMDb is not configured"""
+        movie_service.omdb_service.api_key = None
+
+        with app.app_context():
+            movie = movie_service.create_movie_for_user(created_user['id'], {'title': 'Local'})
+            assert movie['enrichment_status'] is None
+            assert movie_service.get_enrichment_status(movie['id'])['status'] is None
+
+
 class TestReviewService:
     """Test review service functionality"""
 
@@ -250,6 +456,38 @@ class TestReviewService:
             liked_review = review_service.like_review(created_review['id'])
             assert liked_review['likes'] == initial_likes + 1
 
+    def test_like_review_is_atomic_under_concurrency(self, app, review_service, created_review):
+        """Test that concurrent likes are all counted"""
+        def like_many():
+            with app.app_context():
+                for _ in range(10):
+                    review_service.like_review(created_review['id'])
+
+        threads = [threading.Thread(target=like_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with app.app_context():
+            review = review_service.data_manager.get_review_by_id(created_review['id'])
+            assert review['likes'] == created_review['likes'] + 40
+
+    def test_like_review_single_update(self, app, review_service, created_review, query_counter):
+        """Test that liking updates the review and its movie without loading either"""
+        with app.app_context():
+            review_service.like_review(created_review['id'])
+
+        assert len(query_counter) == 2
+        assert query_counter[0].startswith('UPDATE reviews SET likes=')
+        assert query_counter[1].startswith('UPDATE movies SET total_likes=')
+
+    def test_like_missing_review(self, app, review_service):
+        """Test liking a non-existent review"""
+        with app.app_context():
+            with pytest.raises(ReviewNotFoundError):
+                review_service.like_review(999)
+
     def test_delete_review(self, app, review_service, created_review):
         """Test deleting review"""
         with app.app_context():
@@ -324,4 +562,727 @@ class TestTriviaService:
             assert results['score'] == 1
             assert results['total'] == 2
             assert results['percentage'] == 50
-            assert 'performance' in results
\ No newline at end of file
+            assert 'performance' in results
+
+class FakeTriviaAPI:
+    """Trivia API stand-in generating new, numbered questions on every call"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_movie_trivia(self, movie_data):
+        self.calls += 1
+        return {'questions': [
+            {'question': f"{movie_data['title']} question {self.calls}.{index}?",
+             'options': ['A', 'B', 'C', 'D'], 'correct': index % 4, 'difficulty': 'hard'}
+            for index in range(7)
+        ]}
+
+
+class TestTriviaQuestionBank:
+    """Test reuse of generated movie trivia across games and users"""
+
+    def test_games_draw_from_bank_once_warm(self, app, trivia_service, movie_service,
+                                            user_service, created_user, created_movie):
+        """Test that the LLM is only called while the movie's bank is thin"""
+        api = FakeTriviaAPI()
+        trivia_service.rapidapi_service = api
+
+        with app.app_context():
+            played = [trivia_service.generate_movie_trivia(created_user['id'], created_movie['id'])
+                      for _ in range(3)]
+            assert [game['api_used'] for game in played] == ['rapidapi', 'rapidapi', 'bank']
+            assert api.calls == 2
+
+            banked = {question['question'] for game in played[:2] for question in game['questions']}
+            assert len(played[2]['questions']) == 7
+            assert {question['question'] for question in played[2]['questions']} <= banked
+
+            other = user_service.create_user({'name': 'Other', 'email': 'other@example.com'})
+            copy = movie_service.create_movie_for_user(other['id'], {
+                'title': f"  {created_movie['title'].upper()} ", 'year': created_movie['year']
+            })
+            game = trivia_service.generate_movie_trivia(other['id'], copy['id'])
+            assert game['api_used'] == 'bank'
+            assert api.calls == 2
+
+    def test_malformed_questions_are_not_banked(self, app, trivia_service,
+                                                created_user, created_movie):
+        """Test that only complete questions with a valid answer index are banked"""
+        with app.app_context():
+            added = trivia_service._add_to_bank(created_movie, [
+                {'question': 'Valid?', 'options': ['A', 'B'], 'correct': 1},
+                {'question': 'No options?', 'options': [], 'correct': 0},
+                {'question': 'Bad answer?', 'options': ['A', 'B'], 'correct': 2},
+                {'question': ' ', 'options': ['A', 'B'], 'correct': 0},
+                'not a question',
+            ], 'openai')
+            assert added == 1
+
+
+class FakeUsageTracker:
+    """APIUsageTracker stand-in with a fixed number of calls left"""
+
+    def __init__(self, remaining):
+        self.remaining = remaining
+
+    def get_usage_stats(self):
+        return {'remaining': self.remaining}
+
+
+class TestTriviaPrefetcher:
+    """Test background pre-generation of movie trivia"""
+
+    @pytest.fixture
+    def prefetcher(self, trivia_service, movie_service):
+        """Prefetcher generating through a fake RapidAPI with 50 calls left"""
+        api = FakeTriviaAPI()
+        api.api_key = 'test'
+        api.usage_tracker = FakeUsageTracker(50)
+        trivia_service.rapidapi_service = api
+
+        prefetcher = TriviaPrefetcher(trivia_service=trivia_service, workers=2, reserve=20)
+        movie_service.trivia_prefetcher = prefetcher
+        yield prefetcher
+        prefetcher.shutdown()
+
+    def test_added_movie_is_prefetched(self, app, prefetcher, movie_service,
+                                       trivia_service, created_user):
+        """Test that adding a movie fills its bank so its first game needs no API call"""
+        with app.app_context():
+            movie = movie_service.create_movie_for_user(created_user['id'],
+                                                        {'title': 'Heat', 'year': 1995})
+            assert prefetcher.drain(timeout=10)
+            assert not trivia_service.needs_questions(movie)
+
+            status = prefetcher.status()
+            assert (status['enqueued'], status['banked'], status['queued']) == (1, 1, 0)
+            assert status['generations'] == 2
+            assert status['quota'] == {'remaining': 50, 'reserve': 20}
+
+            calls = trivia_service.rapidapi_service.calls
+            game = trivia_service.generate_movie_trivia(created_user['id'], movie['id'])
+            assert game['api_used'] == 'bank'
+            assert trivia_service.rapidapi_service.calls == calls
+
+            assert prefetcher.enqueue(app, movie) is None
+
+    def test_quota_reserve_defers_generation(self, app, prefetcher, movie_service,
+                                             created_user, monkeypatch):
+        """Test that prefetching stops once the RapidAPI quota is down to the reserve"""
+        prefetcher.trivia_service.rapidapi_service.usage_tracker.remaining = 20
+        monkeypatch.setattr(TriviaPrefetchConfig, 'ENABLED', False)  # Queue only below
+
+        with app.app_context():
+            movie = movie_service.create_movie_for_user(created_user['id'],
+                                                        {'title': 'Heat', 'year': 1995})
+            assert prefetcher.status()['enqueued'] == 0
+
+            future = prefetcher.enqueue(app, movie)
+            assert future.result(timeout=10) == 'deferred'
+            assert prefetcher.trivia_service.rapidapi_service.calls == 0
+
+    def test_backfill_queues_each_canonical_movie_once(self, app, prefetcher, movie_service,
+                                                       user_service, created_user, monkeypatch):
+        """Test that backfill covers thin movies shared by several collections once"""
+        monkeypatch.setattr(TriviaPrefetchConfig, 'ENABLED', False)  # Leave adds to the backfill
+
+        with app.app_context():
+            other = user_service.create_user({'name': 'Other', 'email': 'other@example.com'})
+            for user in (created_user, other):
+                movie_service.create_movie_for_user(user['id'], {'title': 'Alien', 'year': 1979})
+            movie_service.create_movie_for_user(created_user['id'], {'title': 'Ran'})
+
+            assert prefetcher.backfill(app) == 2
+            assert prefetcher.drain(timeout=10)
+            assert prefetcher.status()['banked'] == 2
+            assert prefetcher.trivia_service.data_manager.get_movies_needing_trivia(14) == []
+
+    def test_nothing_is_queued_without_api_keys(self, app, trivia_service, created_movie):
+        """Test that movies are not queued when no trivia API is configured"""
+        trivia_service.rapidapi_service.api_key = None
+        trivia_service.openai_service.api_key = None
+        prefetcher = TriviaPrefetcher(trivia_service=trivia_service)
+
+        with app.app_context():
+            assert prefetcher.enqueue(app, created_movie) is None
+            assert prefetcher.backfill(app) == 0
+            assert prefetcher.status()['enqueued'] == 0
+
+
+class TestLikeBuffer:
+    """Test in-process coalescing of review likes"""
+
+    def test_likes_are_pending_until_flush(self, app, review_service, created_review):
+        """Test that buffered likes are visible to reads before being written"""
+        buffer = LikeBuffer(flush_size=100)
+        review_service.like_buffer = buffer
+
+        with app.app_context():
+            for _ in range(3):
+                liked = review_service.like_review(created_review['id'])
+
+            stored = review_service.data_manager.get_review_by_id(created_review['id'])
+            listed = review_service.get_movie_reviews(created_review['movie_id'])
+
+            assert liked['likes'] == created_review['likes'] + 3
+            assert stored['likes'] == created_review['likes']
+            assert listed[0]['likes'] == created_review['likes'] + 3
+            assert buffer.pending(created_review['id']) == 3
+
+            assert buffer.flush() == 3
+            stored = review_service.data_manager.get_review_by_id(created_review['id'])
+            assert stored['likes'] == created_review['likes'] + 3
+            assert buffer.pending(created_review['id']) == 0
+
+    def test_liked_count_keeps_rising_across_flushes(self, app, review_service, created_review):
+        """Test that a like triggering a flush does not return a stale count"""
+        buffer = LikeBuffer(flush_size=3)
+        review_service.like_buffer = buffer
+
+        with app.app_context():
+            likes = [review_service.like_review(created_review['id'])['likes'] for _ in range(5)]
+            stored = review_service.data_manager.get_review_by_id(created_review['id'])
+
+        assert likes == [created_review['likes'] + n for n in range(1, 6)]
+        assert stored['likes'] == created_review['likes'] + 3
+
+    def test_flush_on_size_threshold(self, app, created_review, query_counter):
+        """Test that reaching the size threshold writes all likes in one statement"""
+        buffer = LikeBuffer(flush_size=5)
+
+        with app.app_context():
+            for _ in range(5):
+                buffer.add(created_review['id'])
+
+            updates = [q for q in query_counter if q.startswith('UPDATE reviews')]
+            assert len(updates) == 1
+            assert buffer.pending(created_review['id']) == 0
+            review = buffer.data_manager.get_review_by_id(created_review['id'])
+            assert review['likes'] == created_review['likes'] + 5
+
+    def test_likes_stay_visible_while_flush_writes(self, app, created_review, monkeypatch):
+        """Test that likes being written still count as pending until committed"""
+        buffer = LikeBuffer(flush_size=100)
+        buffer.add(created_review['id'], 2)
+        seen = []
+        write = buffer.data_manager.add_review_likes
+
+        def observe(deltas):
+            seen.append(buffer.pending(created_review['id']))
+            buffer.add(created_review['id'])
+            seen.append(buffer.pending(created_review['id']))
+            return write(deltas)
+
+        monkeypatch.setattr(buffer.data_manager, 'add_review_likes', observe)
+        with app.app_context():
+            assert buffer.flush() == 2
+
+        assert seen == [2, 3]
+        assert buffer.pending(created_review['id']) == 1
+
+    def test_failed_flush_keeps_likes(self, app, created_review, monkeypatch):
+        """Test that likes survive a failed flush and are retried"""
+        buffer = LikeBuffer(flush_size=100)
+        buffer.add(created_review['id'], 2)
+
+        def fail(deltas):
+            raise RuntimeError('database unavailable')
+
+        monkeypatch.setattr(buffer.data_manager, 'add_review_likes', fail)
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+
+        assert buffer.pending(created_review['id']) == 2
+
+    def test_exit_flush_is_registered_once(self, app, monkeypatch):
+        """Test that restarting the flush thread does not add exit hooks"""
+        registered = []
+        monkeypatch.setattr('atexit.register', lambda *args: registered.append(args))
+        buffer = LikeBuffer(flush_interval=0.05)
+
+        for _ in range(2):
+            buffer.start(app)
+            buffer.stop(app)
+
+        assert len(registered) == 1
+
+    def test_background_flush_on_interval(self, app, created_review):
+        """Test that the flush thread writes pending likes on its interval"""
+        buffer = LikeBuffer(flush_size=100, flush_interval=0.05)
+        buffer.start(app)
+        try:
+            buffer.add(created_review['id'])
+            for _ in range(40):
+                if not buffer.pending(created_review['id']):
+                    break
+                time.sleep(0.05)
+        finally:
+            buffer.stop(app)
+
+        with app.app_context():
+            review = buffer.data_manager.get_review_by_id(created_review['id'])
+            assert review['likes'] == created_review['likes'] + 1
+
+
+class FakeOMDbResponse:
+    """Minimal stand-in for a requests response from OMDb"""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class TestOMDbCache:
+    """Test the persistent OMDb lookup cache"""
+
+    @pytest.fixture
+    def omdb_client(self):
+        """Fake OMDb HTTP client recording the titles it was asked for"""
+        calls = []
+        responses = {
+            'The Matrix': {'Response': 'True', 'Title': 'The Matrix', 'Year': '1999',
+                           'Director': 'Lana Wachowski', 'Genre': 'Sci-Fi',
+                           'imdbRating': '8.7'},
+            'Unknown Film': {'Response': 'False', 'Error': 'Movie not found!'},
+            'Throttled': {'Response': 'False', 'Error': 'Request limit reached!'},
+        }
+
+        class FakeClient:
+            def get(self, url, params):
+                calls.append(params['t'])
+                return FakeOMDbResponse(responses[params['t']])
+
+        client = FakeClient()
+        client.calls = calls
+        return client
+
+    def test_repeated_lookups_use_cache(self, tmp_path, omdb_client):
+        """Test that normalized repeats of a title cost no HTTP call"""
+        cache = OMDbCache(tmp_path / 'omdb.sqlite')
+        service = OMDbService(api_key='test', cache=cache, http_client=omdb_client)
+
+        first = service.search_movie('The Matrix', 1999)
+        assert service.search_movie('  the   MATRIX ', 1999) == first
+        assert first['director'] == 'Lana Wachowski'
+        assert omdb_client.calls == ['The Matrix']
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+    def test_not_found_is_cached_but_errors_are_not(self, tmp_path, omdb_client):
+        """Test negative caching of "Movie not found" only"""
+        service = OMDbService(api_key='test', cache=OMDbCache(tmp_path / 'omdb.sqlite'),
+                              http_client=omdb_client)
+
+        for _ in range(2):
+            assert service.search_movie('Unknown Film') is None
+            assert service.search_movie('Throttled') is None
+
+        assert omdb_client.calls == ['Unknown Film', 'Throttled', 'Throttled']
+        assert service.cache.stats()['negative_hits'] == 1
+
+    def test_expired_entries_are_refetched(self, tmp_path, omdb_client):
+        """Test that entries past their TTL count as misses"""
+        service = OMDbService(api_key='test', cache=OMDbCache(tmp_path / 'omdb.sqlite', ttl=0),
+                              http_client=omdb_client)
+
+        service.search_movie('The Matrix')
+        service.search_movie('The Matrix')
+
+        assert omdb_client.calls == ['The Matrix', 'The Matrix']
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test the size bound and that the cache persists across instances"""
+        path = tmp_path / 'omdb.sqlite'
+        cache = OMDbCache(path, max_entries=2)
+        cache.put('Alien', None, {'title': 'Alien'})
+        cache.put('Heat', None, {'title': 'Heat'})
+        time.sleep(0.01)
+        cache.get('Alien')
+        cache.put('Ran', None, {'title': 'Ran'})
+
+        reopened = OMDbCache(path, max_entries=2)
+        assert reopened.get('Alien') == {'title': 'Alien'}
+        assert reopened.get('Heat') is MISS
+        assert reopened.get('Ran') == {'title': 'Ran'}
+        assert cache.stats()['evictions'] == 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers with the stub server's queued (status, headers, delay) responses"""
+
+    protocol_version = 'HTTP/1.1'   # Keep connections alive like real APIs
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._respond()
+
+    def _respond(self):
+        self.server.received.append((self.command, self.client_address[1]))
+        status, headers, delay = (self.server.responses.pop(0) if self.server.responses
+                                  else (200, {}, 0))
+        time.sleep(delay)
+        body = b'{"ok": true}'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPClient:
+    """Test the pooled, retrying HTTP client against a local stub server"""
+
+    @pytest.fixture
+    def stub_server(self):
+        """Local HTTP server answering with queued responses"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.responses = []
+        server.received = []
+        server.url = f'http://127.0.0.1:{server.server_port}/'
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        """Retry immediately so tests do not sleep"""
+        monkeypatch.setattr(HTTPClientConfig, 'BACKOFF_FACTOR', 0)
+        monkeypatch.setattr(HTTPClientConfig, 'BACKOFF_JITTER', 0)
+
+    def test_retries_server_errors(self, stub_server):
+        """Test that 5xx responses are retried until one succeeds"""
+        stub_server.responses = [(503, {}, 0), (502, {}, 0)]
+        client = HTTPClient(timeout=2, retries=3)
+
+        response = client.get(stub_server.url)
+
+        assert response.status_code == 200
+        assert len(stub_server.received) == 3
+
+    def test_retries_rate_limits_after_retry_after(self, stub_server):
+        """Test that 429 responses are retried, honouring Retry-After"""
+        stub_server.responses = [(429, {'Retry-After': '0'}, 0)]
+        client = HTTPClient(timeout=2, retries=1, retry_reads=False)
+
+        response = client.post(stub_server.url, json={'query': 'trivia'})
+
+        assert response.status_code == 200
+        assert [method for method, _ in stub_server.received] == ['POST', 'POST']
+
+    def test_status_retries_can_be_disabled(self, stub_server):
+        """Test that a client without status retries sends a metered POST once"""
+        stub_server.responses = [(429, {'Retry-After': '0'}, 0), (503, {}, 0)]
+        client = HTTPClient(timeout=2, retries=2, retry_reads=False, retry_statuses=False)
+
+        assert client.post(stub_server.url, json={'query': 'trivia'}).status_code == 429
+        assert len(stub_server.received) == 1
+
+    def test_returns_last_response_when_retries_run_out(self, stub_server):
+        """Test that exhausted retries hand the failing response back"""
+        stub_server.responses = [(503, {}, 0)] * 3
+        client = HTTPClient(timeout=2, retries=1)
+
+        assert client.get(stub_server.url).status_code == 503
+        assert len(stub_server.received) == 2
+
+    def test_connections_are_kept_alive(self, stub_server):
+        """Test that consecutive requests reuse one pooled connection"""
+        client = HTTPClient(timeout=2)
+
+        for _ in range(3):
+            assert client.get(stub_server.url).status_code == 200
+
+        assert len({port for _, port in stub_server.received}) == 1
+        client.close()
+
+    def test_timeout_applies_by_default(self, stub_server):
+        """Test that the client's read timeout bounds slow responses"""
+        stub_server.responses = [(200, {}, 1.0)]
+        client = HTTPClient(timeout=0.2, retries=0)
+
+        start = time.perf_counter()
+        with pytest.raises(requests.RequestException):
+            client.get(stub_server.url)
+        assert time.perf_counter() - start < 1.0
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical lookups"""
+
+    @staticmethod
+    def run_concurrently(flights, count, key, fn):
+        """Start callers of one key and wait until all but the leader are waiting"""
+        outcomes = [None] * count
+
+        def call(index):
+            try:
+                outcomes[index] = flights.do(key, fn)
+            except Exception as e:
+                outcomes[index] = e
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while flights.stats()['coalesced'] < count - 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return threads, outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that identical concurrent calls run once and share copies of the result"""
+        flights = SingleFlight('Test')
+        release = threading.Event()
+        calls = []
+
+        def lookup():
+            calls.append(1)
+            release.wait(5)
+            return {'title': 'The Matrix'}
+
+        threads, outcomes = self.run_concurrently(flights, 5, 'the matrix|1999', lookup)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert outcomes == [{'title': 'The Matrix'}] * 5
+        assert len({id(outcome) for outcome in outcomes}) == 5
+        assert flights.stats() == {'calls': 1, 'coalesced': 4, 'errors': 0,
+                                   'timeouts': 0, 'in_flight': 0}
+
+    def test_later_calls_are_not_coalesced(self):
+        """Test that only in-flight calls are shared, not finished ones"""
+        flights = SingleFlight('Test')
+        assert flights.do('key', lambda: 1) == 1
+        assert flights.do('key', lambda: 2) == 2
+        assert flights.do('other', lambda: 3) == 3
+        assert flights.stats()['calls'] == 3
+
+    def test_errors_propagate_to_waiters(self):
+        """Test that every caller sees the in-flight call's exception"""
+        flights = SingleFlight('Test')
+        release = threading.Event()
+
+        def lookup():
+            release.wait(5)
+            raise ValueError('upstream failed')
+
+        threads, outcomes = self.run_concurrently(flights, 3, 'key', lookup)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+        assert flights.stats()['errors'] == 1
+        assert flights.do('key', lambda: 'recovered') == 'recovered'
+
+    def test_waiters_time_out(self):
+        """Test that waiters give up after the timeout while the call continues"""
+        flights = SingleFlight('Test', timeout=0.05)
+        release = threading.Event()
+
+        def lookup():
+            release.wait(5)
+            return 'late'
+
+        threads, outcomes = self.run_concurrently(flights, 2, 'key', lookup)
+        threads[1].join()
+        release.set()
+        threads[0].join()
+
+        assert sorted(map(type, outcomes), key=str) == sorted([str, ExternalAPIError], key=str)
+        assert flights.stats()['timeouts'] == 1
+
+    def test_concurrent_omdb_searches_send_one_request(self, tmp_path):
+        """Test that concurrent adds of one title cost a single OMDb request"""
+        flights = SingleFlight('OMDb')
+        release = threading.Event()
+        calls = []
+
+        class SlowClient:
+            def get(self, url, params):
+                calls.append(params['t'])
+                release.wait(5)
+                return FakeOMDbResponse({'Response': 'True', 'Title': 'The Matrix',
+                                         'Year': '1999', 'Director': 'Lana Wachowski'})
+
+        service = OMDbService(api_key='test', cache=OMDbCache(tmp_path / 'omdb.sqlite'),
+                              http_client=SlowClient(), flights=flights)
+        titles = ['The Matrix', 'the matrix', '  THE  MATRIX ']
+        results = [None] * len(titles)
+
+        def search(index):
+            results[index] = service.search_movie(titles[index], 1999)
+
+        threads = [threading.Thread(target=search, args=(index,)) for index in range(len(titles))]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while flights.stats()['coalesced'] < len(titles) - 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result['director'] == 'Lana Wachowski' for result in results)
+
+    def test_trivia_flight_key_ignores_order_and_formatting(self, app, trivia_service):
+        """Test that the same movie set maps to one trivia flight key"""
+        movies = [{'title': 'Alien', 'year': 1979}, {'title': 'Heat', 'year': 1995}]
+        reordered = [{'title': ' heat ', 'year': 1995}, {'title': 'ALIEN', 'year': 1979}]
+
+        assert trivia_service._flight_key('collection', movies) == \
+            trivia_service._flight_key('collection', reordered)
+        assert trivia_service._flight_key('movie', movies[0]) != \
+            trivia_service._flight_key('movie', {'title': 'Alien', 'year': 1986})
+
+
+class TestMovieMetadataIndex:
+    """Test the offline movie metadata index"""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Index loaded from a small TSV dump"""
+        dump = tmp_path / 'movies.tsv'
+        dump.write_text(
+            'title\tyear\tdirector\tgenre\trating\n'
+            'The Matrix\t1999\tLana Wachowski\tAction,Sci-Fi\t8.7\n'
+            'Dune\t1984\tDavid Lynch\tSci-Fi\t6.3\n'
+            'Dune\t2021\tDenis Villeneuve\tSci-Fi\t8.0\n'
+            'Say "Cheese"\t\\N\t\\N\t\\N\t\\N\n'
+            '\t2000\tNobody\tDrama\t5.0\n',
+            encoding='utf-8'
+        )
+        index = MovieMetadataIndex(tmp_path / 'metadata.sqlite')
+        assert index.load(dump) == (4, 1)
+        return index
+
+    def test_lookup_by_normalized_title_and_year(self, index):
+        """Test lookups ignore case and spacing and use the year to disambiguate"""
+        matrix = index.lookup('  the MATRIX ')
+        assert matrix == {'title': 'The Matrix', 'director': 'Lana Wachowski', 'year': 1999,
+                          'genre': 'Action, Sci-Fi', 'imdb_rating': 8.7,
+                          'plot': '', 'poster': ''}
+        assert index.lookup('Dune', 2021)['director'] == 'Denis Villeneuve'
+        assert index.lookup('Dune') is None
+        assert index.lookup('Dune', 2000) is None
+        assert index.lookup('Say "Cheese"')['year'] is None
+
+        stats = index.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (3, 2, 4)
+
+    def test_reload_replaces_index(self, index, tmp_path):
+        """Test that a CSV load replaces the previous contents"""
+        dump = tmp_path / 'refresh.csv'
+        dump.write_text('primaryTitle,startYear,averageRating\n"Heat",1995,8.3\n',
+                        encoding='utf-8')
+
+        assert index.load(dump) == (1, 0)
+        assert index.lookup('The Matrix', 1999) is None
+        assert index.lookup('Heat', 1995)['imdb_rating'] == 8.3
+
+    def test_missing_index_is_a_miss(self, tmp_path):
+        """Test that an index that was never loaded answers nothing"""
+        index = MovieMetadataIndex(tmp_path / 'metadata.sqlite')
+        assert index.lookup('The Matrix') is None
+        assert index.stats()['entries'] == 0
+        assert not index.path.exists()
+
+    def test_imdb_director_ids_are_not_loaded(self, tmp_path):
+        """Test that title.crew 'directors' name IDs are not taken for names"""
+        dump = tmp_path / 'crew.tsv'
+        dump.write_text('primaryTitle\tstartYear\tdirectors\nHeat\t1995\tnm0000520\n',
+                        encoding='utf-8')
+        index = MovieMetadataIndex(tmp_path / 'metadata.sqlite')
+        index.load(dump)
+
+        assert index.lookup('Heat', 1995)['director'] == ''
+
+    def test_dump_without_title_column_is_rejected(self, tmp_path):
+        """Test that an unrecognised dump header fails the load"""
+        dump = tmp_path / 'movies.csv'
+        dump.write_text('name,year\nHeat,1995\n', encoding='utf-8')
+
+        with pytest.raises(ValueError):
+            MovieMetadataIndex(tmp_path / 'metadata.sqlite').load(dump)
+
+    def test_indexed_movies_need_no_network(self, index):
+        """Test that enhance_movie_data answers indexed movies offline"""
+        class FailingClient:
+            def get(self, url, params):
+                raise AssertionError('OMDb should not be called')
+
+        service = OMDbService(api_key='test', http_client=FailingClient(), metadata_index=index)
+        enhanced = service.enhance_movie_data({'title': 'the matrix', 'year': 1999})
+
+        assert enhanced['director'] == 'Lana Wachowski'
+        assert enhanced['imdb_rating'] == 8.7
+        assert enhanced['title'] == 'the matrix'
+
+    def test_indexed_movie_is_added_without_background_lookup(self, app, movie_service,
+                                                              created_user, index, monkeypatch):
+        """Test that adding an indexed movie enriches it immediately"""
+        monkeypatch.setattr(MetadataIndexConfig, 'FETCH_POSTERS', False)
+        with app.app_context():
+            movie_service.omdb_service = OMDbService(api_key='test', metadata_index=index)
+            movie_service.enrichment_worker = None  # Would fail if a lookup were queued
+
+            movie = movie_service.create_movie_for_user(
+                created_user['id'], {'title': 'Dune', 'year': 2021}
+            )
+
+            assert movie['director'] == 'Denis Villeneuve'
+            assert movie['enrichment_status'] is None
+
+    def test_indexed_movie_gets_poster_in_background(self, app, movie_service,
+                                                     created_user, index):
+        """Test that OMDb fills in the poster without replacing indexed fields"""
+        omdb = FakeOMDbService({'director': 'Someone Else', 'poster': 'dune.jpg',
+                                'imdb_rating': 1.0})
+        worker = EnrichmentWorker(omdb_service=omdb, workers=1)
+        with app.app_context():
+            movie_service.omdb_service = OMDbService(api_key='test', metadata_index=index)
+            movie_service.enrichment_worker = worker
+
+            movie = movie_service.create_movie_for_user(
+                created_user['id'], {'title': 'Dune', 'year': 2021}
+            )
+            assert movie['director'] == 'Denis Villeneuve'
+            assert movie['enrichment_status'] == 'pending'
+
+        worker.shutdown()
+
+        with app.app_context():
+            status = movie_service.get_enrichment_status(movie['id'])
+            assert status['status'] == 'enriched'
+            assert status['movie']['poster'] == 'dune.jpg'
+            assert status['movie']['director'] == 'Denis Villeneuve'
+            assert status['movie']['rating'] == 8.0
+
+    def test_unindexed_inline_add_looks_index_up_once(self, app, movie_service,
+                                                      created_user, index, monkeypatch):
+        """Test that an inline add does not repeat the index lookup before OMDb"""
+        monkeypatch.setattr(EnrichmentConfig, 'BACKGROUND', False)
+        with app.app_context():
+            movie_service.omdb_service = OMDbService(api_key=None, metadata_index=index)
+            movie_service.create_movie_for_user(created_user['id'], {'title': 'Heat'})
+
+        assert index.stats()['misses'] == 1
@@ -1,10 +1,14 @@
 from .app_helpers import (
     get_error_template_context, print_startup_info, register_error_handlers
 )
+from .cli_commands import register_cli_commands
 from .decorators import (
     handle_validation_errors, require_movie_exists, require_user,
     require_user_and_movie
 )
+from .pagination import (
+    decode_cursor, encode_cursor, fetch_page, fetch_ranked_page, parse_limit
+)
 from .template_helpers import (
     format_date, format_percentage, format_rating, format_trivia_type,
     get_difficulty_style, get_performance_badge, get_poster_url,
@@ -13,8 +17,10 @@ from .template_helpers import (
 
 __all__ = [
     'get_error_template_context', 'print_startup_info', 'register_error_handlers',
+    'register_cli_commands',
     'handle_validation_errors', 'require_movie_exists', 'require_user',
     'require_user_and_movie',
+    'decode_cursor', 'encode_cursor', 'fetch_page', 'fetch_ranked_page', 'parse_limit',
     'format_date', 'format_percentage', 'format_rating', 'format_trivia_type',
     'get_difficulty_style', 'get_performance_badge', 'get_poster_url',
     'get_rank_display', 'pluralize', 'register_template_helpers', 'truncate_text'
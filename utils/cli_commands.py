@@ -0,0 +1,77 @@
+"""
+CLI commands for MovieWeb application.
+Provides maintenance commands run through `flask <command>`.
+"""
+import click
+
+from config import TriviaHistoryConfig
+from datamanager import SQLiteDataManager
+from services.enrichment_worker import enrichment_worker
+from services.movie_metadata_index import movie_metadata_index
+from services.trivia_prefetcher import trivia_prefetcher
+
+
+def register_cli_commands(app):
+    """
+    Register maintenance commands with the Flask CLI.
+
+    :param app: Flask application instance
+    """
+    @app.cli.command('rebuild-leaderboards')
+    def rebuild_leaderboards():
+        """Regenerate the materialized leaderboards from trivia history."""
+        entry_count = SQLiteDataManager().rebuild_leaderboards()
+        click.echo(f"✅ Rebuilt leaderboards with {entry_count} entries")
+
+    @app.cli.command('reconcile-review-aggregates')
+    def reconcile_review_aggregates():
+        """Recompute per-movie review counts, average ratings and likes."""
+        corrected = SQLiteDataManager().reconcile_review_aggregates()
+        click.echo(f"✅ Reconciled review aggregates ({corrected} movies corrected)")
+
+    @app.cli.command('compact-trivia-history')
+    @click.option('--hot-days', type=int, default=TriviaHistoryConfig.HOT_WINDOW_DAYS,
+                  show_default=True, help='Days of raw trivia scores to keep.')
+    def compact_trivia_history(hot_days):
+        """Fold old trivia scores into monthly rollups."""
+        compacted = SQLiteDataManager().compact_trivia_scores(hot_days)
+        click.echo(f"✅ Compacted {compacted} trivia scores into monthly rollups")
+
+    @app.cli.command('enrich-pending-movies')
+    @click.option('--limit', type=int, default=None, help='Most movies to enrich, oldest first.')
+    def enrich_pending_movies(limit):
+        """Enrich movies whose background OMDb lookup never finished."""
+        futures = enrichment_worker.requeue_pending(app, limit)
+        statuses = [future.result() for future in futures]
+        enrichment_worker.shutdown()
+        click.echo(f"✅ Enriched {statuses.count('enriched')} of {len(statuses)} pending movies "
+                   f"({statuses.count('unmatched')} unmatched, {statuses.count('failed')} failed)")
+
+    @app.cli.command('load-movie-metadata')
+    @click.argument('dump', type=click.Path(exists=True, dir_okay=False))
+    def load_movie_metadata(dump):
+        """Replace the offline movie metadata index with a CSV/TSV dump."""
+        try:
+            count, skipped = movie_metadata_index.load(dump)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"✅ Indexed {count} movies ({skipped} rows skipped)")
+
+    @app.cli.command('trivia-prefetch')
+    @click.option('--limit', type=int, default=None,
+                  help='Most movies to queue, those in the most collections first.')
+    @click.option('--timeout', type=float, default=None,
+                  help='Seconds to wait for the queue to drain.')
+    def trivia_prefetch(limit, timeout):
+        """Backfill the trivia question bank of thinly covered movies."""
+        if not trivia_prefetcher.can_generate():
+            raise click.ClickException('No RapidAPI or OpenAI key configured')
+
+        click.echo(f"🎯 Queued {trivia_prefetcher.backfill(app, limit)} movies")
+        trivia_prefetcher.drain(timeout)
+        status = trivia_prefetcher.status()
+        trivia_prefetcher.shutdown(wait=False)
+
+        click.echo(f"✅ Trivia prefetch: {status['banked']} banked, "
+                   f"{status['deferred']} deferred to keep the quota reserve, "
+                   f"{status['failed']} failed, {status['queued']} left for the next run")
@@ -4,11 +4,11 @@ Provides reusable decorators for common route validations.
 """
 from functools import wraps
 from flask import flash, redirect, url_for
-from services.user_service import UserService
+from services.entity_resolver import EntityResolver
 from services.movie_service import MovieService
 from exceptions import UserNotFoundError, MovieNotFoundError, DatabaseError
 
-_user_service = UserService()
+_entity_resolver = EntityResolver()
 _movie_service = MovieService()
 
 
@@ -37,7 +37,7 @@ def require_user(f):
             return redirect(url_for('users.list_users'))
 
         try:
-            user = _user_service.get_user_by_id(user_id)
+            user = _entity_resolver.resolve_user(user_id)
             kwargs['user'] = user
             return f(*args, **kwargs)
 
@@ -74,7 +74,7 @@ def require_user_and_movie(f):
             return redirect(url_for('users.list_users'))
 
         try:
-            user = _user_service.get_user_by_id(user_id)
+            user = _entity_resolver.resolve_user(user_id)
             movie = _movie_service.get_movie_for_user(user_id, movie_id)
 
             kwargs['user'] = user
@@ -0,0 +1,103 @@
+"""
+Pagination Utilities - Keyset (cursor) pagination for list endpoints and pages.
+Cursors are opaque to clients and encode the last primary key of a page, so
+fetching any page is an indexed range scan regardless of table size. Ranked
+results (search) have no stable key order and encode an offset instead.
+"""
+import base64
+import binascii
+import json
+
+from config import PaginationConfig
+from exceptions import ValidationError
+
+
+def encode_cursor(last_id, key='after_id'):
+    """
+    Encode the last ID of a page into an opaque cursor.
+
+    :param last_id: Primary key of the last item on the page
+    :param key: Position the cursor holds ('after_id', or 'offset' for ranked results)
+    :return: URL-safe cursor string
+    """
+    payload = json.dumps({key: last_id}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor, key='after_id'):
+    """
+    Decode an opaque cursor back into the ID to continue after.
+
+    :param cursor: Cursor string from a previous page (or None for the first page)
+    :param key: Position the cursor holds ('after_id', or 'offset' for ranked results)
+    :return: ID to continue after, or None for the first page
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        after_id = json.loads(base64.urlsafe_b64decode(padded))[key]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValidationError('cursor', 'Invalid pagination cursor')
+
+    if not isinstance(after_id, int) or after_id < 0:
+        raise ValidationError('cursor', 'Invalid pagination cursor')
+    return after_id
+
+
+def parse_limit(value, default=PaginationConfig.API_DEFAULT_LIMIT,
+                maximum=PaginationConfig.API_MAX_LIMIT):
+    """
+    Parse a requested page size, falling back to the default.
+
+    :param value: Raw limit value from the request (or None)
+    :param default: Page size used when no limit is given
+    :param maximum: Largest page size a client may request
+    :return: Page size as an integer
+    """
+    if value in (None, ''):
+        return default
+
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError('limit', 'Limit must be a whole number')
+
+    if limit < 1 or limit > maximum:
+        raise ValidationError('limit', f'Limit must be between 1 and {maximum}')
+    return limit
+
+
+def fetch_page(fetch, cursor, limit):
+    """
+    Fetch one page of items ordered by ID and the cursor for the next page.
+
+    :param fetch: Callable taking after_id and limit keywords, returning item dicts
+    :param cursor: Cursor of the requested page (or None for the first page)
+    :param limit: Page size
+    :return: Tuple of (items, next_cursor), next_cursor is None on the last page
+    """
+    items = fetch(after_id=decode_cursor(cursor), limit=limit + 1)
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    return items, encode_cursor(items[-1]['id'])
+
+
+def fetch_ranked_page(fetch, cursor, limit):
+    """
+    Fetch one page of ranked items and the cursor for the next page.
+
+    :param fetch: Callable taking offset and limit keywords, returning item dicts
+    :param cursor: Cursor of the requested page (or None for the first page)
+    :param limit: Page size
+    :return: Tuple of (items, next_cursor), next_cursor is None on the last page
+    """
+    offset = decode_cursor(cursor, key='offset') or 0
+    items = fetch(offset=offset, limit=limit + 1)
+    if len(items) <= limit:
+        return items, None
+
+    return items[:limit], encode_cursor(offset + limit, key='offset')
@@ -3,7 +3,7 @@ Template helper functions and filters for MovieWeb application.
 Provides reusable functions for common template operations and data formatting.
 """
 from datetime import datetime
-from config import TriviaConfig
+from config import EnrichmentConfig, TriviaConfig
 
 
 def format_percentage(score, total):
@@ -187,7 +187,9 @@ def register_template_helpers(app):
         get_difficulty_style=get_difficulty_style,
         format_rating=format_rating,
         get_poster_url=get_poster_url,
-        pluralize=pluralize
+        pluralize=pluralize,
+        enrichment_poll_ms=EnrichmentConfig.POLL_INTERVAL * 1000,
+        enrichment_max_polls=EnrichmentConfig.MAX_POLLS
     )
 
     app.jinja_env.filters['truncate_text'] = truncate_text